@@ -0,0 +1,245 @@
+"""
+Drive request counts and wall time for sharing strategies, against a local fake Drive.
+
+`FakeDrive` implements the handful of Drive v3 endpoints the uploaders use
+(resumable and multipart uploads and updates, ``permissions.create``,
+``files.get`` and batch requests) on a local HTTP server, adds a fixed latency to every HTTP
+request to stand in for the round trip to Google, and counts requests by
+kind. Each strategy uploads the same files through an `UploadScheduler`:
+
+- ``per_file``: `make_public` after every upload (two round trips per file);
+- ``batched``: `PermissionBatcher`, one batch request per 100 grants;
+- ``shared_folder``: one grant on the folder, none per file.
+
+Usage::
+
+    python benchmarks/bench_drive.py --files 500 --latency-ms 50 --threads 8
+
+Requires the ``google`` extra.
+"""
+
+import argparse
+import email.parser
+import itertools
+import json
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx_meditation_form.integrations import (  # noqa: E402
+    DriveClientPool,
+    PermissionBatcher,
+    UploadScheduler,
+)
+
+_PERMISSION = re.compile(r"^/drive/v3/files/([^/?]+)/permissions")
+_FILE = re.compile(r"^/drive/v3/files/([^/?]+)")
+_UPDATE = re.compile(r"^/upload/drive/v3/files/([^/?]+)\?.*uploadType=resumable")
+
+
+class FakeDrive:
+    """
+    Minimal in-process Drive v3 server.
+
+    :param latency: Seconds added to every HTTP request.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.calls: Counter = Counter()
+        self.public = set()
+        self.contents: Dict[str, bytes] = {}
+        self._sessions: Dict[str, str] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "FakeDrive":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.calls.clear()
+            self.public.clear()
+            self.contents.clear()
+
+    def call(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """Handle one (possibly batched) API call; ``(status, headers, body)``."""
+        with self._lock:
+            match = _UPDATE.match(path)
+            if method == "PATCH" and match:
+                self.calls["update.start"] += 1
+                session = str(next(self._ids))
+                self._sessions[session] = match.group(1)
+                return 200, {"Location": f"{self.url}/upload/session/{session}"}, b""
+            if method == "POST" and path.startswith("/upload/drive/v3/files"):
+                if "uploadType=resumable" in path:
+                    self.calls["upload.start"] += 1
+                    return 200, {"Location": f"{self.url}/upload/session/{next(self._ids)}"}, b""
+                self.calls["upload"] += 1
+                file_id = f"file{next(self._ids)}"
+                self.contents[file_id] = body  # the whole multipart body
+                return 200, {}, _json({"id": file_id})
+            if method == "PUT" and path.startswith("/upload/session/"):
+                session = path.rsplit("/", 1)[1]
+                file_id = self._sessions.pop(session, f"file{session}")
+                self.calls["upload"] += 1
+                self.contents[file_id] = body
+                return 200, {}, _json({"id": file_id})
+            match = _PERMISSION.match(path)
+            if method == "POST" and match:
+                self.calls["permission"] += 1
+                self.public.add(match.group(1))
+                return 200, {}, _json({"id": "anyoneWithLink"})
+            match = _FILE.match(path)
+            if method == "GET" and match:
+                self.calls["get"] += 1
+                return 200, {}, _json({"id": match.group(1), "name": "form.docx"})
+        return 404, {}, _json({"error": {"code": 404, "message": "not found"}})
+
+    def _batch(self, content_type: str, body: bytes) -> Tuple[Dict[str, str], bytes]:
+        message = email.parser.BytesParser().parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+        )
+        boundary = "batch_response_boundary"
+        parts = []
+        for part in message.get_payload():
+            inner = part.get_payload(decode=True)
+            head, _, inner_body = inner.partition(b"\r\n\r\n")
+            if not _:
+                head, _, inner_body = inner.partition(b"\n\n")
+            method, path, _ = head.split(b"\r\n" if b"\r\n" in head else b"\n")[0].decode().split(" ")
+            status, _, data = self.call(method, path, inner_body)
+            content_id = part["Content-ID"].strip("<>")
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n\r\n".encode()
+                + data
+                + b"\r\n"
+            )
+        payload = b"".join(parts) + f"--{boundary}--\r\n".encode()
+        return {"Content-Type": f"multipart/mixed; boundary={boundary}"}, payload
+
+    def _handler(self):
+        drive = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _handle(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                time.sleep(drive.latency)
+                with drive._lock:
+                    drive.requests["batch" if self.path.startswith("/batch") else self.command] += 1
+                if self.path.startswith("/batch"):
+                    status = 200
+                    headers, data = drive._batch(self.headers["Content-Type"], body)
+                else:
+                    status, headers, data = drive.call(self.command, self.path, body)
+                self.send_response(status)
+                for name, value in {"Content-Type": "application/json", **headers}.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_PATCH = _handle
+
+        return Handler
+
+
+def _json(data) -> bytes:
+    return json.dumps(data).encode()
+
+
+def _token() -> str:
+    path = Path(tempfile.mkdtemp()) / "token.json"
+    path.write_text(
+        json.dumps(
+            {
+                "access_token": "benchmark",
+                "refresh_token": "benchmark",
+                "client_id": "benchmark",
+                "client_secret": "benchmark",
+            }
+        )
+    )
+    return str(path)
+
+
+def run(drive: FakeDrive, strategy: str, files: int, threads: int) -> Dict[str, object]:
+    """Upload `files` forms with `strategy`; request counts and wall time."""
+    drive.reset()
+    pool = DriveClientPool(_token(), max_idle=threads, base_url=drive.url)
+    scheduler = UploadScheduler(pool, rate=1e6, concurrency=threads, max_concurrency=threads)
+    data = b"PK" + b"\0" * 20000
+    permissions = PermissionBatcher(scheduler) if strategy == "batched" else None
+
+    def upload(index: int) -> str:
+        file_id = scheduler.upload(data, name=f"form_{index}.docx", drive_folder_id="folder")
+        if strategy == "per_file":
+            scheduler.make_public(file_id)
+        elif permissions is not None:
+            permissions.add(file_id)
+        return file_id
+
+    start = time.perf_counter()
+    if strategy == "shared_folder":
+        scheduler.make_public("folder")
+    with ThreadPoolExecutor(threads) as executor:
+        file_ids = list(executor.map(upload, range(files)))
+    if permissions is not None:
+        permissions.flush()
+    elapsed = time.perf_counter() - start
+
+    shared = drive.public >= set(file_ids) or drive.public == {"folder"}
+    return {
+        "seconds": round(elapsed, 3),
+        "http_requests": sum(drive.requests.values()),
+        "batch_requests": drive.requests["batch"],
+        "calls": dict(drive.calls),
+        "all_shared": shared,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 2)[1])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="added to every HTTP request")
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with FakeDrive(latency=args.latency_ms / 1000) as drive:
+        for strategy in ("per_file", "batched", "shared_folder"):
+            print(f"{strategy:<14} {json.dumps(run(drive, strategy, args.files, args.threads))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
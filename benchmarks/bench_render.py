@@ -0,0 +1,406 @@
+"""
+Per-stage benchmarks for the render pipeline.
+
+Every stage of the python-docx pipeline is timed on its own (its inputs are
+prepared outside the timed region), plus the end-to-end render, the cached
+`FormRenderer` engines, the package import and Drive client construction.
+Each stage also gets a tracemalloc pass for peak memory.
+
+Usage::
+
+    python benchmarks/bench_render.py                        # print results
+    python benchmarks/bench_render.py --save baseline.json   # store a baseline
+    python benchmarks/bench_render.py --compare baseline.json --threshold 0.25
+
+With ``--compare`` the exit status is 1 if any stage got slower (median time)
+or hungrier (peak memory) than the baseline by more than ``--threshold``,
+or if importing the package exceeds ``--import-budget-ms`` or pulls in the
+Google API client.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document  # noqa: E402
+
+import docx_meditation_form  # noqa: E402
+from docx_meditation_form.core import (  # noqa: E402
+    DocxSettings,
+    FormPatcher,
+    FormRenderer,
+    HeaderWriter,
+    TableWriter,
+)
+from docx_meditation_form.core.table_layout import TableLayout  # noqa: E402
+from docx_meditation_form.dataset import (  # noqa: E402
+    COLUMN_WIDTHS_DATASET,
+    ROW_HEIGHTS_DATASET,
+    FormValues,
+)
+
+# Realistic inputs: long multi-line addresses, Unicode names, empty fields
+SAMPLE_VALUES = [
+    FormValues(
+        APPLICANT_NAME="HARSH KUMAR",
+        APPLICANT_BRANCH_ADDRESS="2nd Floor, Orion Plaza, MG Road, Bengaluru",
+        APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS="Same as above",
+        APPLICANT_PHONE="080-12345678",
+        APPLICANT_MOBILE="+91-9876543210",
+        APPLICANT_EMAIL_ID="info@kslegal.co.in",
+        DEFENDANT_NAME="RAHUL SHARMA",
+        DEFENDANT_BRANCH_ADDRESS="Flat 504, Shanti Residency, Noida",
+        DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS="Same as above",
+        DEFENDANT_PHONE="0120-4455667",
+        DEFENDANT_MOBILE="+91-9123456789",
+        DEFENDANT_EMAIL_ID="rahul.sharma@example.com",
+    ),
+    FormValues(
+        APPLICANT_NAME="श्रीमती अनन्या देशपांडे / SMT. ANANYA DESHPANDE",
+        APPLICANT_BRANCH_ADDRESS=(
+            "Unit No. 1204-1207, 12th Floor, Tower B, Peninsula Business Park,\n"
+            "Ganpatrao Kadam Marg, Lower Parel (West), Mumbai - 400013,\n"
+            "Maharashtra, India (Landmark: opposite Kamala Mills Compound)"
+        ),
+        APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS=(
+            "C/o Deshpande & Associates, Advocates & Solicitors,\n"
+            "3rd Floor, Fort House, Dr. D. N. Road, Fort, Mumbai - 400001"
+        ),
+        APPLICANT_PHONE="022-24938811 / 022-24938812",
+        APPLICANT_MOBILE="+91-9820012345",
+        APPLICANT_EMAIL_ID="legal.notices@deshpande-associates.co.in",
+        DEFENDANT_NAME="M/s. Zoë Müller-Łukasiewicz Trading Co. (Prop. José Núñez)",
+        DEFENDANT_BRANCH_ADDRESS=(
+            "Shop No. 17, Ground Floor, Crawford Market Annexe,\n"
+            "Lokmanya Tilak Marg, Dhobi Talao, Mumbai - 400002"
+        ),
+        DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS="",
+        DEFENDANT_PHONE="",
+        DEFENDANT_MOBILE="+91-9004455667",
+        DEFENDANT_EMAIL_ID="",
+    ),
+]
+
+Benchmark = Tuple[Callable[[], object], Callable[[object], None]]
+
+
+def _values(i: int) -> FormValues:
+    return SAMPLE_VALUES[i % len(SAMPLE_VALUES)]
+
+
+def _document():
+    return Document()
+
+
+def _laid_out_table(*, widths=False, heights=False, merged=False):
+    doc = Document()
+    writer = TableWriter(doc)
+    table = writer.init_table()
+    if widths:
+        writer.set_columns_width(table, COLUMN_WIDTHS_DATASET)
+    if heights:
+        writer.set_rows_height(table, ROW_HEIGHTS_DATASET)
+    if merged:
+        writer.merge_required_rows(table)
+    return writer, table
+
+
+def _render_docx(values: FormValues):
+    doc = Document()
+    settings = DocxSettings(doc)
+    settings.set_top_margin()
+    settings.set_section()
+    HeaderWriter(doc).write()
+
+    writer = TableWriter(doc)
+    table = writer.init_table()
+    writer.set_columns_width(table, COLUMN_WIDTHS_DATASET)
+    writer.set_rows_height(table, ROW_HEIGHTS_DATASET)
+    writer.merge_required_rows(table)
+    writer.write_table(table, values)
+    return doc
+
+
+def _save(doc) -> None:
+    doc.save(BytesIO())
+
+
+def _end_to_end(i) -> None:
+    _save(_render_docx(_values(i)))
+
+
+def benchmarks() -> Dict[str, Benchmark]:
+    """Stage name -> ``(setup, run)``; only ``run(setup())`` is measured."""
+    docx_renderer = FormRenderer(engine="docx")
+    xml_renderer = FormRenderer(engine="xml")
+    pdf_renderer = FormRenderer(engine="pdf")
+    docx_renderer.render(_values(0))
+    xml_renderer.render_to_bytes(_values(0))
+    pdf_renderer.render_to_bytes(_values(0))
+    patcher = FormPatcher()
+    rendered = xml_renderer.render_to_bytes(_values(0))
+
+    counter = iter(range(10**9))
+
+    return {
+        "document": (lambda: None, lambda _: _document()),
+        "set_section": (
+            lambda: DocxSettings(Document()),
+            lambda settings: settings.set_section(),
+        ),
+        "set_top_margin": (
+            lambda: DocxSettings(Document()),
+            lambda settings: settings.set_top_margin(),
+        ),
+        "header_write": (
+            lambda: HeaderWriter(Document()),
+            lambda writer: writer.write(),
+        ),
+        "init_table": (
+            lambda: TableWriter(Document()),
+            lambda writer: writer.init_table(),
+        ),
+        "set_columns_width": (
+            _laid_out_table,
+            lambda state: state[0].set_columns_width(state[1], COLUMN_WIDTHS_DATASET),
+        ),
+        "set_rows_height": (
+            lambda: _laid_out_table(widths=True),
+            lambda state: state[0].set_rows_height(state[1], ROW_HEIGHTS_DATASET),
+        ),
+        "merge_required_rows": (
+            lambda: _laid_out_table(widths=True, heights=True),
+            lambda state: state[0].merge_required_rows(state[1]),
+        ),
+        "table_layout": (
+            lambda: (TableWriter(Document()), TableLayout()),
+            lambda state: state[0].create_table(state[1]),
+        ),
+        "write_table": (
+            lambda: (_laid_out_table(widths=True, heights=True, merged=True), next(counter)),
+            lambda state: state[0][0].write_table(state[0][1], _values(state[1])),
+        ),
+        "save": (
+            lambda: _render_docx(_values(next(counter))),
+            _save,
+        ),
+        "end_to_end": (lambda: next(counter), _end_to_end),
+        "template_render_save": (
+            lambda: _values(next(counter)),
+            lambda values: docx_renderer.render_to_bytes(values),
+        ),
+        "xml_render_save": (
+            lambda: _values(next(counter)),
+            lambda values: xml_renderer.render_to_bytes(values),
+        ),
+        "xml_document_xml": (
+            lambda: _values(next(counter)),
+            lambda values: xml_renderer.writer.document_xml(values),
+        ),
+        "pdf_render_save": (
+            lambda: _values(next(counter)),
+            lambda values: pdf_renderer.render_to_bytes(values),
+        ),
+        "form_patch": (
+            lambda: {"APPLICANT_PHONE": f"022-{next(counter):08d}"},
+            lambda changes: patcher.patch_bytes(rendered, changes),
+        ),
+    }
+
+
+def drive_benchmarks() -> Dict[str, Benchmark]:
+    """Drive client construction, fresh vs. pooled; skipped without the Google extra."""
+    try:
+        from docx_meditation_form.integrations import (
+            DriveClientPool,
+            GoogleDriveUploader,
+        )
+    except ImportError:
+        return {}
+
+    token = Path(tempfile.mkdtemp()) / "token.json"
+    token.write_text(
+        json.dumps(
+            {
+                "access_token": "benchmark",
+                "refresh_token": "benchmark",
+                "client_id": "benchmark",
+                "client_secret": "benchmark",
+            }
+        )
+    )
+    pool = DriveClientPool(str(token))
+
+    def pooled(_):
+        with pool.client():
+            pass
+
+    return {
+        "drive_client_fresh": (lambda: None, lambda _: GoogleDriveUploader(str(token))),
+        "drive_client_pooled": (lambda: None, pooled),
+    }
+
+
+def measure(setup, run, *, repeat: int) -> Dict[str, float]:
+    """Median/min/mean wall time (ms) and tracemalloc peak (KiB) of `run`."""
+    run(setup())  # warm-up
+
+    times: List[float] = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        times.append((time.perf_counter() - start) * 1000)
+
+    state = setup()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(times), 4),
+        "min_ms": round(min(times), 4),
+        "mean_ms": round(statistics.fmean(times), 4),
+        "peak_kib": round((peak - base) / 1024, 2),
+    }
+
+
+def measure_import(*, repeat: int) -> Dict[str, float]:
+    """Time ``import docx_meditation_form`` in fresh interpreters."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import docx_meditation_form\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        "heavy = sorted(m for m in ('googleapiclient', 'google.oauth2', 'aiohttp')"
+        " if m in sys.modules)\n"
+        "print(elapsed, ','.join(heavy))\n"
+    )
+    root = Path(__file__).resolve().parent.parent
+
+    times = []
+    heavy = ""
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+        heavy = out[1] if len(out) > 1 else ""
+
+    return {
+        "median_ms": round(statistics.median(times), 4),
+        "min_ms": round(min(times), 4),
+        "mean_ms": round(statistics.fmean(times), 4),
+        "heavy_modules": heavy,
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every regression beyond `threshold`."""
+    regressions = []
+    for stage, current in results.items():
+        previous = baseline.get(stage)
+        if previous is None:
+            continue
+        for metric in ("median_ms", "peak_kib"):
+            if metric not in current or metric not in previous:
+                continue
+            if previous[metric] > 0 and current[metric] > previous[metric] * (1 + threshold):
+                change = current[metric] / previous[metric] - 1
+                regressions.append(
+                    f"{stage}.{metric}: {previous[metric]} -> {current[metric]} "
+                    f"(+{change:.0%})"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=30, help="timed runs per stage")
+    parser.add_argument("--stages", nargs="*", help="only run these stages")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown before flagging a regression",
+    )
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        default=300.0,
+        help="maximum median time for `import docx_meditation_form` (tests/test_import.py uses the same)",
+    )
+    args = parser.parse_args(argv)
+
+    stages = {**benchmarks(), **drive_benchmarks()}
+    if args.stages:
+        stages = {name: stages[name] for name in args.stages if name in stages}
+
+    results: Dict[str, Dict] = {}
+    for name, (setup, run) in stages.items():
+        results[name] = measure(setup, run, repeat=args.repeat)
+        r = results[name]
+        print(
+            f"{name:24} median {r['median_ms']:9.3f} ms   "
+            f"min {r['min_ms']:9.3f} ms   peak {r['peak_kib']:9.1f} KiB"
+        )
+
+    if not args.stages or "import" in args.stages:
+        results["import"] = measure_import(repeat=min(args.repeat, 10))
+        r = results["import"]
+        print(f"{'import':24} median {r['median_ms']:9.3f} ms   heavy: {r['heavy_modules'] or '-'}")
+
+    if args.save:
+        payload = {
+            "meta": {
+                "version": docx_meditation_form.__version__,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        Path(args.save).write_text(json.dumps(payload, indent=2) + "\n")
+        print(f"saved baseline to {args.save}")
+
+    failures = []
+    if "import" in results:
+        if results["import"]["median_ms"] > args.import_budget_ms:
+            failures.append(
+                f"import: {results['import']['median_ms']} ms exceeds the "
+                f"{args.import_budget_ms} ms budget"
+            )
+        if results["import"]["heavy_modules"]:
+            failures.append(f"import: loads {results['import']['heavy_modules']}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+        failures += compare(results, baseline, args.threshold)
+
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
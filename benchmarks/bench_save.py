@@ -0,0 +1,125 @@
+"""
+Time and size of every `SaveBackend` mode.
+
+For each mode, reports the median time and the output size of:
+
+- ``package``: zipping one form's parts (``document.xml`` already rendered),
+  i.e. the cost of the save backend alone;
+- ``form``: a complete ``"xml"`` engine render of one form;
+- ``combined``: one document holding ``--forms`` forms (`save_combined`),
+  where ``document.xml`` is large enough for parallel deflate to matter.
+
+Usage::
+
+    python benchmarks/bench_save.py
+    python benchmarks/bench_save.py --forms 5000 --repeat 50
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx_meditation_form import FormRenderer, FormValues  # noqa: E402
+from docx_meditation_form.core.ooxml_writer import DOCUMENT_PART  # noqa: E402
+from docx_meditation_form.core.package import SaveBackend  # noqa: E402
+
+MODES = {
+    "zipfile-6": SaveBackend(),
+    "zipfile-store": SaveBackend(level=0),
+    "fast-6": SaveBackend("fast"),
+    "fast-6-no-precompress": SaveBackend("fast", precompress=False),
+    "fast-1": SaveBackend("fast", level=1),
+    "fast-9": SaveBackend("fast", level=9),
+    "fast-store": SaveBackend("fast", level=0),
+    "fast-6-4-threads": SaveBackend("fast", threads=4),
+    "fast-1-4-threads": SaveBackend("fast", level=1, threads=4),
+}
+
+
+def _values(n: int) -> FormValues:
+    return FormValues(
+        APPLICANT_NAME=f"Applicant {n}",
+        APPLICANT_BRANCH_ADDRESS=f"{n} Long Street, Mumbai 4000{n % 100:02d}",
+        APPLICANT_EMAIL_ID=f"applicant{n}@example.com",
+        DEFENDANT_NAME=f"Defendant {n}",
+        DEFENDANT_PHONE=f"022-{n:08d}",
+    )
+
+
+def _measure(run: Callable[[], int], repeat: int) -> Dict[str, float]:
+    run()  # warm up (template, caches, thread pools)
+    times: List[float] = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = run()
+        times.append(time.perf_counter() - start)
+    return {"median_ms": round(statistics.median(times) * 1000, 3), "bytes": size}
+
+
+def bench(backend: SaveBackend, *, forms: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    renderer = FormRenderer(engine="xml", backend=backend)
+    writer = renderer.writer
+    document = writer.document_xml(_values(0))
+    combined = [_values(n) for n in range(forms)]
+
+    def package() -> int:
+        buffer = BytesIO()
+        with backend.open(buffer) as zf:
+            for name, blob in writer.parts:
+                zf.write(name, document if name == DOCUMENT_PART else blob)
+        return len(buffer.getvalue())
+
+    def form() -> int:
+        return len(renderer.render_to_bytes(_values(1)))
+
+    def many() -> int:
+        buffer = BytesIO()
+        renderer.save_combined(combined, buffer)
+        return len(buffer.getvalue())
+
+    return {
+        "package": _measure(package, repeat),
+        "form": _measure(form, repeat),
+        "combined": _measure(many, max(3, repeat // 10)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SaveBackend time and size benchmarks")
+    parser.add_argument("--forms", type=int, default=2000, help="forms in the combined document")
+    parser.add_argument("--repeat", type=int, default=30, help="timed runs per measurement")
+    parser.add_argument("--modes", nargs="*", choices=sorted(MODES), help="only run these modes")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    results = {
+        name: bench(MODES[name], forms=args.forms, repeat=args.repeat)
+        for name in (args.modes or MODES)
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'mode':<24}{'package ms':>12}{'form ms':>10}{'form KiB':>10}{'combined ms':>13}{'combined KiB':>14}")
+    for name, result in results.items():
+        print(
+            f"{name:<24}"
+            f"{result['package']['median_ms']:>12.3f}"
+            f"{result['form']['median_ms']:>10.3f}"
+            f"{result['form']['bytes'] / 1024:>10.1f}"
+            f"{result['combined']['median_ms']:>13.1f}"
+            f"{result['combined']['bytes'] / 1024:>14.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Time and memory of loading form values from a CSV file, row by row versus by columns.
+
+Generates a CSV of ``--rows`` synthetic cases (a share of them with empty
+addresses, so the placeholder logic runs) and compares:
+
+- ``rows``: `csv.DictReader` + `FormValues.from_dict` per row, i.e. what
+  `read_records` and `render_many` do with mappings;
+- ``batch``: `FormValuesBatch.from_csv`;
+- ``batch_dedupe``: the same with ``dedupe=True`` (the defendant columns
+  repeat 50 banks);
+- ``split_ms``: splitting the batch into one chunk per worker;
+- ``pickle_bytes``: the bytes sent to a worker process for one chunk, as
+  `FormValues` rows versus a `FormValuesBatch` slice.
+
+Memory is the size retained by the loaded values, measured with tracemalloc.
+
+Usage::
+
+    python benchmarks/bench_values.py --rows 50000 --workers 8
+"""
+
+import argparse
+import csv
+import json
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx_meditation_form.dataset import FORM_FIELDS, FormValues, FormValuesBatch  # noqa: E402
+
+
+def write_csv(path: Path, rows: int) -> None:
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(FORM_FIELDS)
+        for n in range(rows):
+            address = "" if n % 4 == 0 else f"{n} Long Street, Mumbai 4000{n % 100:02d}"
+            writer.writerow(
+                [
+                    f"Applicant {n}",
+                    address,
+                    address,
+                    f"022-{n:08d}",
+                    f"98{n:08d}",
+                    f"applicant{n}@example.com",
+                    f"Defendant Bank {n % 50}",
+                    f"Branch {n % 50}, Fort, Mumbai",
+                    "",
+                    "022-22000000",
+                    "",
+                    f"branch{n % 50}@bank.example",
+                ]
+            )
+
+
+def _load_rows(path: Path) -> list:
+    with path.open(newline="", encoding="utf-8") as fh:
+        return [FormValues.from_dict(record) for record in csv.DictReader(fh)]
+
+
+def _measure(load: Callable[[], object]) -> Tuple[object, Dict[str, float]]:
+    start = time.perf_counter()
+    load()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = load()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"ms": round(seconds * 1000, 1), "retained_mib": round(retained / 2**20, 2)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 2)[1])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cases.csv"
+        write_csv(path, args.rows)
+
+        rows, rows_stats = _measure(lambda: _load_rows(path))
+        batch, batch_stats = _measure(lambda: FormValuesBatch.from_csv(path))
+        _, dedupe_stats = _measure(lambda: FormValuesBatch.from_csv(path, dedupe=True))
+
+    start = time.perf_counter()
+    chunks = batch.split(args.workers)
+    split_ms = (time.perf_counter() - start) * 1000
+
+    chunk = len(chunks[0])
+    results = {
+        "rows": rows_stats,
+        "batch": batch_stats,
+        "batch_dedupe": dedupe_stats,
+        "split_ms": round(split_ms, 3),
+        "pickle_bytes": {
+            "rows": len(pickle.dumps(rows[:chunk])),
+            "batch": len(pickle.dumps(chunks[0])),
+        },
+        "same_values": batch.to_values() == rows,
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
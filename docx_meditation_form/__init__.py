@@ -2,25 +2,68 @@
 Public API:
 - `HeaderWriter`: writes the document header
 - `TableWriter`: renders table based form layouts
+- `TableLayout`: widths, heights, merges and borders of the form table, applied in one pass
 - `DocxSettings`: applies global document styling
+- `FormTemplate`: cached static skeleton of the form (layout + labels)
+- `FormRenderer`: renders `FormValues` by filling a cached `FormTemplate`
+- `FormPatcher`: changes field values of an already generated form in place
+- `render_many`: renders many `FormValues` to files in parallel
 - `ROW_HEIGHTS_DATASET`: declarative table layout definition
 - `FormValues`: represents one complete form submission
+- `FormValuesBatch`: column-oriented form submissions for bulk tabular input
 - `COLUMN_WIDTHS_DATASET`: declarative column-width definitions (in inches)
-- `GoogleDriveUploader`: uploads generated files to Google Drive
+- `GoogleDriveUploader`: uploads generated files to Google Drive (loaded lazily,
+  requires the ``google`` extra)
 """
 
-from .core import DocxSettings, HeaderWriter, TableWriter
-from .dataset import ROW_HEIGHTS_DATASET, COLUMN_WIDTHS_DATASET, FormValues
-from .integrations import GoogleDriveUploader
+import importlib
+
+from .core import (
+    DocxSettings,
+    FormPatcher,
+    FormRenderer,
+    FormTemplate,
+    HeaderWriter,
+    RenderResult,
+    TableLayout,
+    TableWriter,
+    render_many,
+)
+from .dataset import ROW_HEIGHTS_DATASET, COLUMN_WIDTHS_DATASET, FormValues, FormValuesBatch
+
+# heavy optional dependencies, imported on first access
+_LAZY_EXPORTS = {
+    "GoogleDriveUploader": ".integrations",
+}
 
 __version__ = "0.1.0"
 
 __all__ = [
     "HeaderWriter",
     "TableWriter",
+    "TableLayout",
     "DocxSettings",
+    "FormTemplate",
+    "FormRenderer",
+    "FormPatcher",
+    "RenderResult",
+    "render_many",
     "ROW_HEIGHTS_DATASET",
     "COLUMN_WIDTHS_DATASET",
     "GoogleDriveUploader",
-    "FormValues"
+    "FormValues",
+    "FormValuesBatch",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,277 @@
+"""
+Command line interface.
+
+.. code-block:: console
+
+    $ python -m docx_meditation_form batch submissions.jsonl --out-dir forms/
+    $ python -m docx_meditation_form batch submissions.csv --out-dir forms/ \\
+          --credentials token.json --drive-folder <folder-id> --make-public
+
+Re-running the same command after an interruption resumes from the
+checkpoint file (``<input>.checkpoint`` by default).
+
+.. code-block:: console
+
+    $ python -m docx_meditation_form worker jobs.db --credentials token.json --workers 4
+
+runs worker processes draining the job queue filled by the server's
+``POST /jobs`` endpoint, until interrupted.
+
+.. code-block:: console
+
+    $ python -m docx_meditation_form patch form.docx --set APPLICANT_PHONE=022-1234 \\
+          --credentials token.json --drive-file-id <file-id>
+
+changes field values of an already generated form in place and, with
+``--drive-file-id``, replaces the content of its Drive copy.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from docx_meditation_form.core.package import DEFAULT_LEVEL, SaveBackend
+from docx_meditation_form.core.pipeline import (
+    RECORD_FORMATS,
+    Checkpoint,
+    PipelineStats,
+    read_records,
+    run_pipeline,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m docx_meditation_form",
+        description="Generate DOCX (or PDF) mediation application forms.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch",
+        help="render (and upload) one form per record of a JSONL or CSV file",
+    )
+    batch.add_argument("input", type=Path, help="JSON Lines or CSV file of form values")
+    batch.add_argument("--format", choices=RECORD_FORMATS, help="input format (default: from extension)")
+    batch.add_argument("--out-dir", type=Path, default=Path("forms"), help="output directory (default: forms/)")
+    batch.add_argument("--checkpoint", type=Path, help="checkpoint file (default: <input>.checkpoint)")
+    batch.add_argument("--workers", type=int, help="render workers (default: CPU count)")
+    batch.add_argument("--executor", choices=("process", "thread"), default="process")
+    batch.add_argument("--engine", choices=("xml", "docx", "pdf"), default="xml", help="pdf writes PDF files instead of DOCX")
+    batch.add_argument("--zip-writer", choices=SaveBackend.WRITERS, default="zipfile", help="DOCX zip writer (default: zipfile)")
+    batch.add_argument("--compression", type=int, choices=range(10), default=DEFAULT_LEVEL, metavar="0-9", help="deflate level, 0 stores (default: 6)")
+    batch.add_argument("--zip-threads", type=int, default=1, help="parallel deflate threads for large parts, fast writer (default: 1)")
+    batch.add_argument("--credentials", help="Google credentials JSON; enables uploading")
+    batch.add_argument("--drive-folder", help="Drive folder ID to upload into")
+    batch.add_argument("--make-public", action="store_true", help="share uploads with anyone with the link, in batches of 100")
+    batch.add_argument(
+        "--share-folder",
+        action="store_true",
+        help="share --drive-folder with anyone with the link once; uploads inherit it, no per-file permission calls",
+    )
+    batch.add_argument("--drive-url", help="Drive API root, e.g. a local fake Drive")
+    batch.add_argument("--upload-workers", type=int, default=4, help="upload threads, the most uploads in flight (default: 4)")
+    batch.add_argument("--upload-rate", type=float, default=10.0, help="Drive requests per second (default: 10)")
+    batch.add_argument("--chunk-size", type=int, default=8, help="resumable upload chunk size in MiB (default: 8)")
+    batch.add_argument("--queue-size", type=int, default=64, help="render -> upload queue capacity (default: 64)")
+    batch.add_argument("--progress-interval", type=float, default=1.0, help="seconds between progress lines; 0 disables")
+
+    worker = commands.add_parser(
+        "worker",
+        help="render and upload the jobs of a job queue database",
+    )
+    worker.add_argument("database", type=Path, help="SQLite job database")
+    worker.add_argument("--credentials", required=True, help="Google credentials JSON")
+    worker.add_argument("--drive-folder", help="Drive folder ID to upload into")
+    worker.add_argument("--private", action="store_true", help="do not share uploads publicly (e.g. the folder is already shared)")
+    worker.add_argument("--workers", type=int, default=2, help="worker processes (default: 2)")
+    worker.add_argument("--engine", choices=("xml", "docx"), default="xml")
+    worker.add_argument("--poll-interval", type=float, default=0.5, help="seconds between polls of an empty queue")
+
+    patch = commands.add_parser(
+        "patch",
+        help="change field values of a generated form in place (and of its Drive copy)",
+    )
+    patch.add_argument("form", type=Path, help="DOCX form generated by this package")
+    patch.add_argument("--set", dest="changes", action="append", default=[], metavar="FIELD=VALUE", help="new field value, \\n for a line break; repeatable")
+    patch.add_argument("--output", type=Path, help="write the patched form here (default: overwrite FORM)")
+    patch.add_argument("--credentials", help="Google credentials JSON; required with --drive-file-id")
+    patch.add_argument("--drive-file-id", help="Drive file to replace with the patched form")
+    patch.add_argument("--drive-url", help="Drive API root, e.g. a local fake Drive")
+    return parser
+
+
+def batch(args: argparse.Namespace) -> int:
+    if args.engine == "pdf" and args.credentials:
+        print("error: --credentials uploads DOCX documents; not supported with --engine pdf", file=sys.stderr)
+        return 2
+
+    if args.share_folder and not args.drive_folder:
+        print("error: --share-folder requires --drive-folder", file=sys.stderr)
+        return 2
+
+    checkpoint_path = args.checkpoint or args.input.with_name(args.input.name + ".checkpoint")
+    try:
+        checkpoint = Checkpoint(checkpoint_path, input_path=args.input)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    upload = None
+    share = None
+    scheduler = None
+    permissions = None
+    if args.credentials:
+        from docx_meditation_form.integrations import (
+            DriveClientPool,
+            PermissionBatcher,
+            UploadScheduler,
+        )
+
+        scheduler = UploadScheduler(
+            DriveClientPool(args.credentials, max_idle=args.upload_workers, base_url=args.drive_url),
+            rate=args.upload_rate,
+            concurrency=min(4, args.upload_workers),
+            max_concurrency=args.upload_workers,
+            chunksize=args.chunk_size * 1024 * 1024,
+        )
+        if args.share_folder:
+            # files inherit the folder's link sharing
+            scheduler.make_public(args.drive_folder)
+        elif args.make_public:
+            # a record is only done once its file is shared
+            permissions = PermissionBatcher(scheduler, on_shared=checkpoint.record_shared)
+            share = permissions.add
+
+        def upload(path: Path) -> str:
+            return scheduler.upload(path, drive_folder_id=args.drive_folder)
+
+    stats = PipelineStats()
+    stopped = threading.Event()
+    reporter = None
+    if args.progress_interval > 0:
+
+        def report() -> None:
+            while not stopped.wait(args.progress_interval):
+                print(stats.summary(), file=sys.stderr, flush=True)
+                if scheduler is not None:
+                    print(scheduler.summary(), file=sys.stderr, flush=True)
+
+        reporter = threading.Thread(target=report, name="progress", daemon=True)
+        reporter.start()
+
+    with checkpoint:
+        if checkpoint.done:
+            print(f"resuming: {len(checkpoint.done)} records already done", file=sys.stderr)
+        if checkpoint.unshared and share is not None:
+            print(f"sharing {len(checkpoint.unshared)} records uploaded but not shared", file=sys.stderr)
+        try:
+            run_pipeline(
+                read_records(args.input, format=args.format),
+                args.out_dir,
+                checkpoint=checkpoint,
+                upload=upload,
+                share=share,
+                workers=args.workers,
+                executor=args.executor,
+                engine=args.engine,
+                backend=SaveBackend(args.zip_writer, level=args.compression, threads=args.zip_threads),
+                upload_workers=args.upload_workers,
+                queue_size=args.queue_size,
+                stats=stats,
+            )
+        except KeyboardInterrupt:
+            print(f"\ninterrupted; re-run to resume from {checkpoint_path}", file=sys.stderr)
+            return 130
+        finally:
+            stopped.set()
+            if reporter is not None:
+                reporter.join()
+            if permissions is not None:
+                permissions.flush()
+
+    if permissions is not None and permissions.failed:
+        print(f"{len(permissions.failed)} uploads could not be shared; re-run to retry:", file=sys.stderr)
+        for file_id, exc in sorted(permissions.failed.items()):
+            print(f"  {file_id}: {exc}", file=sys.stderr)
+
+    print(stats.summary(), file=sys.stderr)
+    if scheduler is not None:
+        print(scheduler.summary(), file=sys.stderr)
+    return 1 if stats.failed or (permissions is not None and permissions.failed) else 0
+
+
+def run_workers(args: argparse.Namespace) -> int:
+    from docx_meditation_form.jobs import DriveUpload, JobQueue, JobWorkers
+
+    upload = DriveUpload(
+        args.credentials,
+        drive_folder_id=args.drive_folder,
+        make_public=not args.private,
+    )
+    queue = JobQueue(args.database)
+    with JobWorkers(
+        args.database,
+        upload,
+        workers=args.workers,
+        engine=args.engine,
+        poll_interval=args.poll_interval,
+    ):
+        print(f"{args.workers} workers draining {args.database}; Ctrl+C to stop", file=sys.stderr)
+        try:
+            while True:
+                time.sleep(10)
+                print(queue.stats(), file=sys.stderr, flush=True)
+        except KeyboardInterrupt:
+            print("\nstopping after the current jobs...", file=sys.stderr)
+    return 0
+
+
+def patch(args: argparse.Namespace) -> int:
+    from docx_meditation_form.core.form_patch import FormPatcher
+
+    if args.drive_file_id and not args.credentials:
+        print("error: --drive-file-id requires --credentials", file=sys.stderr)
+        return 2
+
+    changes = {}
+    for change in args.changes:
+        name, sep, value = change.partition("=")
+        if not sep:
+            print(f"error: --set expects FIELD=VALUE, got {change!r}", file=sys.stderr)
+            return 2
+        changes[name] = value.replace("\\n", "\n")
+
+    target = args.output or args.form
+    try:
+        changed = FormPatcher().patch(args.form, changes, target)
+    except (TypeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(f"{target}: {', '.join(changed) or 'no changes'}", file=sys.stderr)
+
+    if args.drive_file_id and changed:
+        from docx_meditation_form.integrations import DriveClientPool
+
+        with DriveClientPool(args.credentials, base_url=args.drive_url).client() as uploader:
+            uploader.update_file(args.drive_file_id, target)
+        print(f"updated Drive file {args.drive_file_id}", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "batch":
+        return batch(args)
+    if args.command == "worker":
+        return run_workers(args)
+    if args.command == "patch":
+        return patch(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
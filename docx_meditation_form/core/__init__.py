@@ -1,5 +1,36 @@
+from .batch import RenderResult, render_many
+from .form_patch import FormPatcher
+from .form_template import FormRenderer, FormTemplate
 from .header_writer import HeaderWriter
+from .ooxml_writer import OoxmlWriter
+from .package import SaveBackend
+from .pdf_writer import PdfWriter
+from .pipeline import Checkpoint, PipelineStats, read_records, run_pipeline
+from .render_cache import CacheEntry, RenderCache
+from .render_plan import FORM_PLAN, RenderPlan
 from .settings import DocxSettings
+from .table_layout import TableLayout
 from .table_writer import TableWriter
 
-__all__ = ["HeaderWriter", "TableWriter", "DocxSettings"]
+__all__ = [
+    "HeaderWriter",
+    "TableWriter",
+    "TableLayout",
+    "DocxSettings",
+    "FormTemplate",
+    "FormRenderer",
+    "FormPatcher",
+    "OoxmlWriter",
+    "PdfWriter",
+    "SaveBackend",
+    "RenderCache",
+    "CacheEntry",
+    "RenderPlan",
+    "FORM_PLAN",
+    "RenderResult",
+    "render_many",
+    "Checkpoint",
+    "PipelineStats",
+    "read_records",
+    "run_pipeline",
+]
@@ -0,0 +1,190 @@
+import os
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.core.package import DEFAULT_BACKEND, SaveBackend
+from docx_meditation_form.dataset.form_values import FormValues
+from docx_meditation_form.dataset.form_values_batch import FormValuesRow
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+# Renderers are built lazily, once per worker process (or thread pool)
+_renderers: Dict[Tuple[str, SaveBackend], FormRenderer] = {}
+
+
+class RenderResult:
+    """
+    Outcome of rendering one item of a `render_many` batch.
+
+    :param index: Position of the item in the input iterable.
+    :param path: Output file path, ``None`` if the item could not be read.
+    :param error: Exception raised while rendering, or ``None`` on success.
+    """
+
+    __slots__ = ("index", "path", "error")
+
+    def __init__(
+        self,
+        index: int,
+        path: Optional[Path],
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.index = index
+        self.path = path
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """``True`` if the form was written successfully."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"RenderResult(index={self.index}, path={self.path!r}, {status})"
+
+
+def default_filename(index: int, values: FormValues, *, extension: str = ".docx") -> str:
+    """Default output file name for item `index` of a batch."""
+    return f"form_{index:06d}{extension}"
+
+
+def render_many(
+    values_iter: Iterable[Union[FormValues, FormValuesRow, Mapping[str, str]]],
+    out_dir: Union[str, Path],
+    *,
+    workers: Optional[int] = None,
+    executor: str = "process",
+    engine: str = "xml",
+    backend: SaveBackend = DEFAULT_BACKEND,
+    ordered: bool = True,
+    max_pending: Optional[int] = None,
+    filename: Optional[Callable[[int, FormValues], str]] = None,
+    indexed: bool = False,
+) -> Iterator[RenderResult]:
+    """
+    Render many form submissions to DOCX (or PDF) files in parallel.
+
+    The input is consumed lazily and at most `max_pending` items are in
+    flight at any time, so memory stays bounded however long the input is.
+    Failures are reported per item through `RenderResult.error` and never
+    abort the batch.
+
+    This is a generator: work only progresses while results are consumed.
+
+    .. code-block:: python
+
+        for result in render_many(records, "out/", workers=8):
+            if not result.ok:
+                print(result.index, result.error)
+
+    :param values_iter: `FormValues` (or mappings of form fields, see
+        `FormValues.from_dict`) to render. A `FormValuesBatch` (or a slice of
+        one) can be passed directly; its row views are rendered as they are
+        and pickled as `FormValues` for process workers.
+    :param out_dir: Directory to write the documents into; created if missing.
+    :param workers: Number of workers, defaults to the number of CPUs.
+    :param executor: ``"process"`` or ``"thread"``.
+    :param engine: `FormRenderer` engine, ``"xml"``, ``"docx"`` or ``"pdf"``.
+    :param backend: `SaveBackend` of the DOCX engines.
+    :param ordered: Yield results in input order; otherwise as they complete.
+    :param max_pending: Maximum number of submitted, unfinished items.
+        Defaults to twice the number of workers.
+    :param filename: ``(index, values) -> str`` naming each output file.
+        Defaults to `default_filename` with the engine's extension.
+    :param indexed: `values_iter` yields ``(index, values)`` pairs; the given
+        index is used for `RenderResult.index` and file names instead of the
+        position in the iterable (e.g. when resuming a partial batch).
+
+    :raises ValueError: If `executor` or `engine` is not supported, or
+        `max_pending` is less than 1.
+    """
+    if executor not in ("process", "thread"):
+        raise ValueError(f"Unsupported executor {executor!r}, expected 'process' or 'thread'")
+    if engine not in FormRenderer.ENGINES:
+        raise ValueError(f"Unsupported engine {engine!r}, expected one of {FormRenderer.ENGINES}")
+    if max_pending is not None and max_pending < 1:
+        raise ValueError(f"max_pending must be at least 1, got {max_pending}")
+    if filename is None:
+        extension = FormRenderer.EXTENSIONS[engine]
+
+        def filename(index: int, values: FormValues) -> str:
+            return default_filename(index, values, extension=extension)
+
+    workers = workers or os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * workers
+
+    # imported here: concurrent.futures.process costs ~20 ms at package import
+    from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+    if executor == "process":
+        pool: "Executor" = ProcessPoolExecutor(max_workers=workers)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    pending: deque = deque()
+    try:
+        items = values_iter if indexed else enumerate(values_iter)
+        for index, item in items:
+            try:
+                if isinstance(item, (FormValues, FormValuesRow)):
+                    values = item
+                else:
+                    values = FormValues.from_dict(item)
+                path = out_dir / filename(index, values)
+            except Exception as exc:
+                failed: "Future" = Future()
+                failed.set_exception(exc)
+                pending.append((index, None, failed))
+            else:
+                future = pool.submit(_render_one, engine, backend, values, str(path))
+                pending.append((index, path, future))
+
+            while len(pending) >= max_pending:
+                yield from _drain(pending, ordered)
+
+        while pending:
+            yield from _drain(pending, ordered)
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def _drain(pending: deque, ordered: bool) -> Iterator[RenderResult]:
+    """Yield at least one finished result, removing it from `pending`."""
+    if ordered:
+        index, path, future = pending.popleft()
+        yield _result(index, path, future)
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    wait([future for _, _, future in pending], return_when=FIRST_COMPLETED)
+    for entry in list(pending):
+        index, path, future = entry
+        if future.done():
+            pending.remove(entry)
+            yield _result(index, path, future)
+
+
+def _result(index: int, path: Optional[Path], future: "Future") -> RenderResult:
+    try:
+        future.result()
+    except Exception as exc:
+        return RenderResult(index, path, exc)
+    return RenderResult(index, path)
+
+
+def _render_one(engine: str, backend: SaveBackend, values: FormValues, path: str) -> None:
+    """Worker entry point: render `values` to `path`."""
+    renderer = _renderers.get((engine, backend))
+    if renderer is None:
+        renderer = _renderers[engine, backend] = FormRenderer(engine=engine, backend=backend)
+    renderer.save(values, path)
@@ -1,8 +1,15 @@
+import copy
+from typing import Collection
+
 from docx.enum.table import WD_CELL_VERTICAL_ALIGNMENT
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from lxml import etree
 from docx.shared import Length
 from docx.text.paragraph import Paragraph
+from docx.text.run import Run
 
+from docx_meditation_form.core.instrumentation import count, timed
 from docx_meditation_form.core.settings import DocxSettings
 
 
@@ -12,6 +19,8 @@ class CellFormatter:
     def __init__(self, settings: DocxSettings):
         """Create formatter with shared document settings."""
         self.settings = settings
+        # (bold, underline) -> w:rPr produced by `DocxSettings.style_run`
+        self._run_properties = {}
 
     def center_label_cell(
         self,
@@ -27,6 +36,7 @@ class CellFormatter:
         :param cell: `docx.table._Cell`
         :param text: Cell text `str`
         """
+        count("cells")
         cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
         p = cell.paragraphs[0]
         self.apply_paragraph(
@@ -47,6 +57,7 @@ class CellFormatter:
         :param cell: docx.table._Cell
         :param text: Cell text
         """
+        count("cells")
         cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.TOP
         p = cell.paragraphs[0]
         self.apply_paragraph(
@@ -66,6 +77,7 @@ class CellFormatter:
         :param cell: docx.table._Cell
         :param text: Cell text
         """
+        count("cells")
         cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
         p = cell.paragraphs[0]
         self.apply_paragraph(
@@ -92,14 +104,121 @@ class CellFormatter:
         :param p: docx.text.paragraph.Paragraph
         :param text: Paragraph text
         """
+        self.format_paragraph(
+            p, align=align, space_before=space_before, space_after=space_after
+        )
+        self.add_run(p, text, bold=bold, underline=underline)
+
+    def format_paragraph(
+        self,
+        p: Paragraph,
+        *,
+        align: WD_ALIGN_PARAGRAPH | None = None,
+        space_before: Length | int = 0,
+        space_after: Length | int = 0,
+    ) -> None:
+        """
+        Apply alignment, spacing and the paragraph style to a paragraph.
+
+        :param p: docx.text.paragraph.Paragraph
+        """
         if align is not None:
             p.alignment = align
-        p.paragraph_format.space_before = space_before
-        p.paragraph_format.space_after = space_after
-
-        run = p.add_run(text)
-        self.settings.apply_run_style(
-            run,
-            bold=bold,
-            underline=underline,
+        self.settings.style_paragraph(
+            p, space_before=space_before, space_after=space_after
         )
+
+    @timed("cell.format")
+    def add_run(
+        self,
+        p: Paragraph,
+        text: str,
+        *,
+        bold: bool = False,
+        underline: bool = False,
+    ) -> None:
+        """
+        Append a styled run to a paragraph.
+
+        The run properties for each (bold, underline) combination are built
+        through `DocxSettings.style_run` once; later runs get a copy.
+
+        :param p: docx.text.paragraph.Paragraph
+        :param text: Run text
+        """
+        count("runs")
+        key = (bold, underline)
+        if key not in self._run_properties:
+            run = p.add_run(text)
+            self.settings.style_run(run, bold=bold, underline=underline)
+            rpr = run._r.rPr
+            self._run_properties[key] = None if rpr is None else copy.deepcopy(rpr)
+            return
+
+        r = p._p.add_r()
+        rpr = self._run_properties[key]
+        if rpr is not None:
+            r.append(copy.deepcopy(rpr))
+        if text:
+            Run(r, p).text = text
+
+
+# Run children that can be moved into a neighbouring run when coalescing
+_TEXT_TAGS = frozenset((qn("w:t"), qn("w:br"), qn("w:tab")))
+
+
+def coalesce_runs(element, *, exclude: Collection = ()) -> int:
+    """
+    Merge neighbouring runs with identical formatting.
+
+    Within every paragraph below `element`, a run that only holds text,
+    breaks and tabs and has the same ``w:rPr`` as the run before it is folded
+    into that run, and adjacent ``w:t`` elements are joined. The rendered text
+    is unchanged.
+
+    :param element: Any oxml element (document body, table, cell, paragraph).
+    :param exclude: ``w:r`` elements that must be kept as separate runs.
+    :return: Number of runs removed.
+    """
+    removed = 0
+    for p in element.iter(qn("w:p")):
+        previous, previous_key = None, None
+        for r in list(p):
+            key = _coalesce_key(r) if r not in exclude else None
+            if key is not None and key == previous_key:
+                for child in list(r):
+                    if child.tag != qn("w:rPr"):
+                        previous.append(child)
+                p.remove(r)
+                removed += 1
+                _join_text(previous)
+            else:
+                previous, previous_key = (r, key) if key is not None else (None, None)
+    return removed
+
+
+def _coalesce_key(r):
+    """Formatting key of a text-only run, or ``None`` if it cannot be merged."""
+    if r.tag != qn("w:r"):
+        return None
+    rpr = None
+    for child in r:
+        if child.tag == qn("w:rPr"):
+            rpr = child
+        elif child.tag not in _TEXT_TAGS:
+            return None
+    return b"" if rpr is None else etree.tostring(rpr)
+
+
+def _join_text(r) -> None:
+    """Join adjacent ``w:t`` children of run `r`."""
+    previous = None
+    for child in list(r):
+        if child.tag == qn("w:t") and previous is not None:
+            text = (previous.text or "") + (child.text or "")
+            previous.text = text
+            if text.strip() != text:
+                previous.set(qn("xml:space"), "preserve")
+            r.remove(child)
+        else:
+            previous = child if child.tag == qn("w:t") else None
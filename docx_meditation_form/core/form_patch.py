@@ -0,0 +1,239 @@
+import os
+import re
+import zlib
+from io import BytesIO
+from typing import IO, Dict, List, Mapping, Optional, Tuple, Union
+
+from docx_meditation_form.core.form_template import FormRenderer, FormTemplate
+from docx_meditation_form.core.ooxml_writer import _run, _run_content, _unescape
+from docx_meditation_form.core.package import (
+    DEFAULT_LEVEL,
+    DOCUMENT_PART,
+    FastPackageZip,
+    read_members,
+)
+from docx_meditation_form.dataset.form_values import FormValues
+
+Source = Union[str, os.PathLike, bytes, IO[bytes]]
+
+# Start and end tags of the elements that hold a slot; ``w:tblPr``, ``w:rPr``
+# and other property elements do not match because of the word boundary
+_TAG = re.compile(r"<(/?)w:(tbl|tr|tc|p|r)\b[^>]*?(/?)>")
+
+# Leading ``w:rPr`` of a run, kept as-is when the run is rewritten
+_RUN_PROPERTIES = re.compile(r"<w:r>(<w:rPr>.*?</w:rPr>|<w:rPr/>)?")
+
+# Run content written by `_run_content` (and python-docx's ``Run.text``)
+_RUN_CONTENT = re.compile(r"<w:t(?:\s[^>]*)?>(.*?)</w:t>|<w:t(?:\s[^>]*)?/>|<w:(tab|br|cr)/>", re.S)
+
+
+class FormPatcher:
+    """
+    Changes field values of a form DOCX generated by this library, in place.
+
+    The value slots written by `TableWriter.write_table` are located in
+    ``word/document.xml`` from the template's slot indices (row, cell,
+    paragraph and run of each field), and only the runs whose value changed
+    are rewritten; the rest of ``document.xml`` is copied as text and every
+    other package part is copied as its compressed bytes, so those parts
+    are byte-identical to the source.
+
+    Patching a form rendered with the default backend gives the same bytes
+    as rendering the new values from scratch, at a fraction of the cost.
+
+    :param template: `FormTemplate` the forms were rendered from. Defaults to
+        the shared default template of `FormRenderer`.
+    :param level: zlib compression level of the rewritten ``document.xml``.
+    """
+
+    def __init__(self, template: Optional[FormTemplate] = None, *, level: int = DEFAULT_LEVEL) -> None:
+        self.template = template or FormRenderer().template
+        self.level = level
+
+    def read(self, source: Source, *, form: int = 0) -> FormValues:
+        """
+        Read the values currently written in a form.
+
+        :param source: DOCX path, content or readable binary stream.
+        :param form: Index of the form in a combined document.
+
+        :raises ValueError: If the document does not have the template's slots.
+        """
+        members = dict(read_members(source))
+        document = _document(members)
+        return FormValues.from_dict(
+            {
+                name: _run_text(document[start:end])
+                for name, (start, end) in self._locate(document, form).items()
+            }
+        )
+
+    def patch(
+        self,
+        source: Source,
+        changes: Union[FormValues, Mapping[str, str]],
+        target: Union[str, os.PathLike, IO[bytes]],
+        *,
+        form: int = 0,
+    ) -> List[str]:
+        """
+        Write a copy of `source` with some field values changed to `target`.
+
+        `target` may be the same path as `source`; the source is read in full
+        before anything is written.
+
+        :param source: DOCX path, content or readable binary stream.
+        :param changes: New values, either complete `FormValues` or a mapping
+            of the fields to change.
+        :param target: File path or writable binary stream.
+        :param form: Index of the form in a combined document.
+
+        :return: Names of the fields whose value changed, in document order.
+
+        :raises TypeError: If `changes` has keys that are not form fields.
+        :raises ValueError: If the document does not have the template's slots.
+        """
+        data, changed = self.patch_bytes(source, changes, form=form)
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "wb") as fh:
+                fh.write(data)
+        else:
+            target.write(data)
+        return changed
+
+    def patch_bytes(
+        self,
+        source: Source,
+        changes: Union[FormValues, Mapping[str, str]],
+        *,
+        form: int = 0,
+    ) -> Tuple[bytes, List[str]]:
+        """
+        Like `patch`, returning the patched package instead of writing it.
+
+        :return: ``(package bytes, names of the changed fields)``.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as fh:
+                source = fh.read()
+        elif not isinstance(source, bytes):
+            source = source.read()
+
+        members = read_members(source)
+        document = _document(dict(members))
+        slots = self._locate(document, form)
+        current = FormValues.from_dict(
+            {name: _run_text(document[start:end]) for name, (start, end) in slots.items()}
+        )
+        if isinstance(changes, FormValues):
+            values = changes
+        else:
+            values = current.replace(**changes)
+
+        edits = [
+            (name, start, end)
+            for name, (start, end) in slots.items()
+            if getattr(values, name) != getattr(current, name)
+        ]
+        if not edits:
+            return source, []
+
+        out = []
+        position = 0
+        for name, start, end in sorted(edits, key=lambda edit: edit[1]):
+            properties = _RUN_PROPERTIES.match(document, start)
+            properties = properties.group(1) or "" if properties else ""
+            out.append(document[position:start])
+            out.append(_run(properties, _run_content(getattr(values, name))))
+            position = end
+        out.append(document[position:])
+
+        buffer = BytesIO()
+        with FastPackageZip(buffer, level=self.level) as zf:
+            for name, member in members:
+                if name == DOCUMENT_PART:
+                    zf.write(name, "".join(out).encode("utf-8"))
+                else:
+                    zf.copy(name, member)
+        return buffer.getvalue(), [name for name, _, _ in edits]
+
+    def _locate(self, document: str, form: int) -> Dict[str, Tuple[int, int]]:
+        """Field name -> ``(start, end)`` offsets of its run in `document`."""
+        wanted: Dict[Tuple[int, int, int], list] = {}
+        for name, (row, cell, paragraph, run) in self.template.slots.items():
+            wanted.setdefault((row, cell, paragraph), []).append((name, run))
+        spans = {}
+
+        tables = -1
+        depth = 0  # w:tbl nesting
+        row = cell = paragraph = -1
+        runs: List[Tuple[int, int]] = []
+        run_start = None
+
+        for match in _TAG.finditer(document):
+            closing, tag, empty = match.group(1), match.group(2), match.group(3)
+            if tag == "tbl":
+                if closing:
+                    depth -= 1
+                    if depth == 0 and tables == form:
+                        break
+                else:
+                    depth += 1
+                    if depth == 1:
+                        tables += 1
+                        row = -1
+                continue
+            if depth != 1 or tables != form:
+                continue
+
+            if tag == "tr" and not closing:
+                row += 1
+                cell = -1
+            elif tag == "tc" and not closing:
+                cell += 1
+                paragraph = -1
+            elif tag == "p":
+                if not closing:
+                    paragraph += 1
+                    runs = []
+                if closing or empty:
+                    for name, run in wanted.get((row, cell, paragraph), ()):
+                        if run < len(runs):
+                            spans[name] = runs[run]
+            elif tag == "r":
+                if empty:
+                    runs.append((match.start(), match.end()))
+                elif closing:
+                    runs.append((run_start, match.end()))
+                else:
+                    run_start = match.start()
+
+        missing = set(self.template.slots) - set(spans)
+        if missing:
+            raise ValueError(
+                f"Form {form} has no slot for {sorted(missing)}; "
+                "was it generated from this template?"
+            )
+        return spans
+
+
+def _document(members: Mapping) -> str:
+    """Decompressed ``word/document.xml`` of `read_members` output."""
+    member = members.get(DOCUMENT_PART)
+    if member is None:
+        raise ValueError(f"Not a DOCX package: {DOCUMENT_PART} is missing")
+    data = member.data if member.method == 0 else zlib.decompress(member.data, -15)
+    return data.decode("utf-8")
+
+
+def _run_text(run: str) -> str:
+    """Text of one ``w:r`` element, the reverse of `_run_content`."""
+    out = []
+    for match in _RUN_CONTENT.finditer(run):
+        if match.group(2) == "tab":
+            out.append("\t")
+        elif match.group(2):
+            out.append("\n")
+        elif match.group(1):
+            out.append(_unescape(match.group(1)))
+    return "".join(out)
@@ -0,0 +1,508 @@
+import copy
+import hashlib
+import os
+import threading
+import zipfile
+from io import BytesIO
+from typing import IO, Iterable, Mapping, Optional, Sequence, Union
+
+from docx import Document
+from docx.document import Document as DocumentObject
+from docx.oxml.ns import qn
+from docx.shared import Length
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+from docx_meditation_form.core import instrumentation
+from docx_meditation_form.core.cell_formatter import coalesce_runs
+from docx_meditation_form.core.header_writer import HeaderWriter
+from docx_meditation_form.core.instrumentation import timed
+from docx_meditation_form.core.ooxml_writer import OoxmlWriter
+from docx_meditation_form.core.package import (
+    DEFAULT_BACKEND,
+    SaveBackend,
+    normalize_core_properties,
+    save_document,
+)
+from docx_meditation_form.core.pdf_writer import PdfWriter
+from docx_meditation_form.core.render_plan import FORM_PLAN, RenderPlan
+from docx_meditation_form.core.settings import DOCUMENT_AUTHOR, DOCUMENT_TITLE, DocxSettings
+from docx_meditation_form.core.table_layout import TableLayout
+from docx_meditation_form.core.table_writer import TableWriter
+from docx_meditation_form.dataset.dataset import (
+    COLUMN_WIDTHS_DATASET,
+    ROW_HEIGHTS_DATASET,
+)
+from docx_meditation_form.dataset.form_values import FORM_FIELDS, FormValues
+
+# guards the lazily built, process-wide `FormRenderer` default template
+_default_template_lock = threading.Lock()
+
+
+class FormTemplate:
+    """
+    Pre-built static skeleton of the mediation application form.
+
+    The skeleton contains everything that does not depend on a submission:
+    margins, header, table borders, column widths, row heights, merged cells
+    and every label. Core properties are normalized (fixed title, author and
+    timestamps) so they do not depend on when or where the template was
+    built. It is built once with the regular writers and kept as
+    serialized DOCX bytes (parsed back once, so `new_document` only has to
+    copy the element trees); the location of each `FormValues` field is
+    recorded as a *slot* so that a render only has to fill those runs.
+
+    :param column_widths: Column widths, defaults to `COLUMN_WIDTHS_DATASET`.
+    :param row_heights: Row heights, defaults to `ROW_HEIGHTS_DATASET`.
+    :param use_styles: Format paragraphs and runs through named styles
+        defined once in ``styles.xml`` (see `DocxSettings`).
+    :param coalesce: Merge neighbouring label runs with identical formatting.
+    :param plan: `RenderPlan` of the table content, defaults to `FORM_PLAN`.
+    """
+
+    def __init__(
+        self,
+        column_widths: Sequence[Length] = COLUMN_WIDTHS_DATASET,
+        row_heights: Mapping[str, Length] = ROW_HEIGHTS_DATASET,
+        *,
+        use_styles: bool = False,
+        coalesce: bool = False,
+        plan: Optional[RenderPlan] = None,
+    ) -> None:
+        self.column_widths = list(column_widths)
+        self.row_heights = dict(row_heights)
+        self.layout = TableLayout(self.column_widths, self.row_heights)
+        self.use_styles = use_styles
+        self.coalesce = coalesce
+        self.plan = plan or FORM_PLAN
+
+        doc = Document()
+        settings = DocxSettings(doc, use_styles=use_styles)
+        settings.set_top_margin()
+        settings.set_section()
+
+        HeaderWriter(doc, settings).write()
+
+        table_writer = TableWriter(doc, use_styles=use_styles, plan=self.plan)
+        table = table_writer.create_table(self.layout)
+        table_writer.write_table(table, _sentinel_values())
+
+        if coalesce:
+            coalesce_runs(doc.element.body, exclude=_sentinel_runs(doc))
+
+        self.slots = _collect_slots(doc, self.plan.fields)
+        normalize_core_properties(doc, title=DOCUMENT_TITLE, author=DOCUMENT_AUTHOR)
+
+        buffer = BytesIO()
+        save_document(doc, buffer)
+        self.skeleton = buffer.getvalue()
+        self._fingerprint: Optional[str] = None
+
+        # parsed from the skeleton bytes, so copies match what a reader of
+        # the saved package would see; never handed out or modified
+        self._document = Document(BytesIO(self.skeleton))
+
+        # body content of one form (header paragraphs + table), without sectPr
+        self.form_elements = [
+            el for el in doc.element.body.iterchildren() if el.tag != qn("w:sectPr")
+        ]
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        SHA-256 of the skeleton's package parts.
+
+        Changes whenever anything static about the rendered form changes
+        (layout datasets, labels, styles), and is stable across processes.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            with zipfile.ZipFile(BytesIO(self.skeleton)) as zf:
+                for name in sorted(zf.namelist()):
+                    digest.update(name.encode("utf-8") + b"\0")
+                    digest.update(zf.read(name))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def new_document(self) -> DocumentObject:
+        """
+        Return a fresh, unfilled copy of the skeleton document.
+
+        The copy is a `copy.deepcopy` of the parsed skeleton (package, parts
+        and element trees), about three times cheaper than parsing the
+        skeleton bytes again.
+        """
+        return copy.deepcopy(self._document)
+
+    def append_form(self, doc: DocumentObject, values: FormValues) -> None:
+        """
+        Append another filled form to a document created by `new_document`.
+
+        The copy starts on a new page and is inserted before the final section
+        properties, so it shares the document's section, styles and numbering.
+
+        :param doc: `docx.document.Document` copy of the skeleton.
+        :param values: `FormValues` to write.
+        """
+        body = doc.element.body
+        sect_pr = body.sectPr
+        elements = [copy.deepcopy(el) for el in self.form_elements]
+
+        Paragraph(elements[0], None).paragraph_format.page_break_before = True
+        for el in elements:
+            if sect_pr is not None:
+                sect_pr.addprevious(el)
+            else:
+                body.append(el)
+            if el.tag == qn("w:tbl"):
+                self.fill_table(el, values)
+
+    def fill(self, doc: DocumentObject, values: FormValues) -> None:
+        """
+        Write `values` into the slots of a document created by `new_document`.
+
+        :param doc: `docx.document.Document` copy of the skeleton.
+        :param values: `FormValues` to write.
+        """
+        tbl = doc.element.body.tbl_lst[0]
+        self.fill_table(tbl, values)
+
+    def fill_table(self, tbl, values: FormValues) -> None:
+        """
+        Write `values` into the slots of one skeleton `w:tbl` element.
+
+        :param tbl: `w:tbl` element copied from the skeleton.
+        :param values: `FormValues` to write.
+        """
+        rows = tbl.tr_lst
+        for name, (row_idx, cell_idx, p_idx, r_idx) in self.slots.items():
+            tc = rows[row_idx].tc_lst[cell_idx]
+            r = tc.p_lst[p_idx].r_lst[r_idx]
+            Run(r, None).text = getattr(values, name)
+
+
+class FormRenderer:
+    """
+    Renders `FormValues` into documents using a cached `FormTemplate`.
+
+    The static layout is built once per renderer (or once per process when the
+    shared default template is used); each call to `render` only copies the
+    skeleton and fills the per-submission values.
+
+    :param template: `FormTemplate` to render from. Defaults to a lazily built,
+        process-wide template using the default layout datasets.
+    :param engine: How packages are produced: ``"docx"`` fills a python-docx
+        copy of the skeleton, ``"xml"`` uses `OoxmlWriter` to emit
+        ``document.xml`` directly, which is much cheaper per form, and
+        ``"pdf"`` draws the form into a PDF with `PdfWriter` (no DOCX is
+        involved, so `render` and `render_combined` are not available).
+    :param deterministic: Saved packages use fixed zip entry metadata, so the
+        same values always produce the same bytes. Documents returned by
+        `render` and saved by the caller are not affected.
+    :param backend: `SaveBackend` choosing the zip writer, compression level
+        and parallelism of saved packages (DOCX engines only).
+
+    :raises ValueError: If `engine` is not supported.
+    """
+
+    ENGINES = ("docx", "xml", "pdf")
+
+    # output file extension and media type of each engine
+    EXTENSIONS = {"docx": ".docx", "xml": ".docx", "pdf": ".pdf"}
+    MIMETYPES = {
+        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "xml": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "pdf": "application/pdf",
+    }
+
+    _default_template: Optional[FormTemplate] = None
+
+    def __init__(
+        self,
+        template: Optional[FormTemplate] = None,
+        *,
+        engine: str = "docx",
+        deterministic: bool = True,
+        backend: SaveBackend = DEFAULT_BACKEND,
+    ) -> None:
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unsupported engine {engine!r}, expected one of {self.ENGINES}")
+        self._template = template
+        self._writer: Optional[OoxmlWriter] = None
+        self._pdf_writer: Optional[PdfWriter] = None
+        self.engine = engine
+        self.deterministic = deterministic
+        self.backend = backend
+
+    @property
+    def template(self) -> FormTemplate:
+        """The `FormTemplate` used by this renderer."""
+        if self._template is None:
+            with _default_template_lock:
+                if FormRenderer._default_template is None:
+                    FormRenderer._default_template = FormTemplate()
+                self._template = FormRenderer._default_template
+        return self._template
+
+    @property
+    def extension(self) -> str:
+        """File extension of the documents this renderer saves, e.g. ``".docx"``."""
+        return self.EXTENSIONS[self.engine]
+
+    @property
+    def mimetype(self) -> str:
+        """Media type of the documents this renderer saves."""
+        return self.MIMETYPES[self.engine]
+
+    @timed("render")
+    def render(self, values: FormValues) -> DocumentObject:
+        """
+        Render one form submission.
+
+        :param values: `FormValues` for the submission.
+        :return: A new `docx.document.Document`, ready to be saved.
+
+        :raises ValueError: With the ``"pdf"`` engine.
+        """
+        self._require_docx("render")
+        if self.engine == "xml":
+            buffer = BytesIO()
+            self.writer.save(values, buffer)
+            return Document(buffer)
+
+        doc = self.template.new_document()
+        self.template.fill(doc, values)
+        return doc
+
+    def render_combined(self, values_iter: Iterable[FormValues]) -> DocumentObject:
+        """
+        Render many form submissions into a single document.
+
+        Each form after the first starts on a new page; section settings,
+        styles and numbering are shared by all forms.
+
+        :param values_iter: `FormValues` to render, in document order.
+        :return: A new `docx.document.Document`.
+
+        :raises ValueError: With the ``"pdf"`` engine.
+        """
+        self._require_docx("render_combined")
+        doc = self.template.new_document()
+        first = True
+        for values in values_iter:
+            if first:
+                self.template.fill(doc, values)
+                first = False
+            else:
+                self.template.append_form(doc, values)
+
+        if first:
+            body = doc.element.body
+            for el in list(body.iterchildren()):
+                if el.tag != qn("w:sectPr"):
+                    body.remove(el)
+        return doc
+
+    @timed("save_combined")
+    def save_combined(
+        self,
+        values_iter: Iterable[FormValues],
+        target: Union[str, IO[bytes]],
+    ) -> None:
+        """
+        Render many form submissions into a single DOCX (or PDF) file or stream.
+
+        With the ``"xml"`` and ``"pdf"`` engines the forms are streamed into
+        the output one at a time, so memory stays bounded for any number of
+        forms; the ``"docx"`` engine builds the whole document tree first.
+
+        :param values_iter: `FormValues` to render, in document order.
+        :param target: File path or writable binary stream.
+        """
+        if self.engine == "xml":
+            self.writer.save_many(values_iter, target)
+        elif self.engine == "pdf":
+            self.pdf_writer.save_many(values_iter, target)
+        else:
+            save_document(
+                self.render_combined(values_iter),
+                target,
+                deterministic=self.deterministic,
+                backend=self.backend,
+            )
+
+    @timed("save")
+    def save(self, values: FormValues, target: Union[str, IO[bytes]]) -> None:
+        """
+        Render one form submission straight to a DOCX (or PDF) file or stream.
+
+        :param values: `FormValues` for the submission.
+        :param target: File path or writable binary stream.
+        """
+        if not instrumentation.is_enabled():
+            self._save(values, target)
+            return
+
+        # count what is written instead of asking the target, which may be
+        # an existing file or a stream without tell()
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "wb") as fh:
+                output = _CountingWriter(fh)
+                self._save(values, output)
+        else:
+            output = _CountingWriter(target)
+            self._save(values, output)
+        instrumentation.count("forms")
+        instrumentation.count("output_bytes", output.count)
+
+    def _save(self, values: FormValues, target: Union[str, IO[bytes]]) -> None:
+        if self.engine == "xml":
+            self.writer.save(values, target)
+        elif self.engine == "pdf":
+            self.pdf_writer.save(values, target)
+        else:
+            doc = self.render(values)
+            with instrumentation.stage("document.save"):
+                save_document(
+                    doc, target, deterministic=self.deterministic, backend=self.backend
+                )
+
+    def render_to_bytes(self, values: FormValues) -> bytes:
+        """
+        Render one form submission into DOCX (or PDF) bytes, without touching the disk.
+
+        :param values: `FormValues` for the submission.
+        :return: The complete DOCX package (or PDF file).
+        """
+        buffer = BytesIO()
+        self.save(values, buffer)
+        return buffer.getvalue()
+
+    def render_to_stream(self, values: FormValues, fileobj: IO[bytes]) -> None:
+        """
+        Render one form submission into a writable binary stream.
+
+        The stream is left positioned at the end of the written package.
+
+        :param values: `FormValues` for the submission.
+        :param fileobj: Writable (and seekable) binary stream, e.g. `io.BytesIO`.
+        """
+        self.save(values, fileobj)
+
+    @property
+    def writer(self) -> OoxmlWriter:
+        """The `OoxmlWriter` used by the ``"xml"`` engine."""
+        if self._writer is None:
+            self._writer = OoxmlWriter(
+                self.template, deterministic=self.deterministic, backend=self.backend
+            )
+        return self._writer
+
+    @property
+    def pdf_writer(self) -> PdfWriter:
+        """The `PdfWriter` used by the ``"pdf"`` engine."""
+        if self._pdf_writer is None:
+            # the default layout does not need the DOCX skeleton to be built
+            if self._template is None:
+                self._pdf_writer = PdfWriter()
+            else:
+                self._pdf_writer = PdfWriter(self._template.layout, self._template.plan)
+        return self._pdf_writer
+
+    def _require_docx(self, method: str) -> None:
+        if self.engine == "pdf":
+            raise ValueError(f"{method}() returns a DOCX document, not available with the 'pdf' engine")
+
+
+class _CountingWriter:
+    """
+    Binary stream wrapper counting the bytes written through it.
+
+    `count` is the furthest offset written, relative to where the output
+    started, so data rewritten after seeking back (e.g. zip local headers)
+    is not counted twice. The wrapped stream is only asked for its position
+    when the writer itself calls `tell` or `seek`.
+    """
+
+    def __init__(self, raw: IO[bytes]) -> None:
+        self.raw = raw
+        self.count = 0
+        self._position = 0  # relative to the start of the output
+        self._base: Optional[int] = None  # absolute position of the start
+
+    def write(self, data) -> int:
+        written = self.raw.write(data)
+        if written is None:
+            written = memoryview(data).nbytes
+        self._position += written
+        if self._position > self.count:
+            self.count = self._position
+        return written
+
+    def tell(self) -> int:
+        position = self.raw.tell()
+        if self._base is None:
+            self._base = position - self._position
+        return position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if self._base is None:
+            self.tell()
+        position = self.raw.seek(offset, whence)
+        self._position = position - self._base
+        return position
+
+    def seekable(self) -> bool:
+        try:
+            return self.raw.seekable()
+        except AttributeError:
+            return False
+
+    def flush(self) -> None:
+        flush = getattr(self.raw, "flush", None)
+        if flush is not None:
+            flush()
+
+
+def _sentinel_values() -> FormValues:
+    """Build `FormValues` whose fields hold unique, searchable markers."""
+    return FormValues(**{name: _sentinel(name) for name in FORM_FIELDS})
+
+
+def _sentinel(name: str) -> str:
+    return f"{{{{{name}}}}}"
+
+
+def _sentinel_runs(doc: DocumentObject) -> list:
+    """``w:r`` elements holding a sentinel value."""
+    markers = {_sentinel(name) for name in FORM_FIELDS}
+    return [r for r in doc.element.body.iter(qn("w:r")) if r.text in markers]
+
+
+def _collect_slots(doc: DocumentObject, fields: Sequence[str]) -> dict:
+    """
+    Locate and clear the sentinel runs written by `_sentinel_values`.
+
+    :param fields: Fields the render plan binds; each must have a slot.
+
+    :return: mapping of field name to ``(row, cell, paragraph, run)`` indices
+        inside the form table.
+    """
+    markers = {_sentinel(name): name for name in FORM_FIELDS}
+    slots = {}
+
+    tbl = doc.element.body.tbl_lst[0]
+    for row_idx, tr in enumerate(tbl.tr_lst):
+        for cell_idx, tc in enumerate(tr.tc_lst):
+            for p_idx, p in enumerate(tc.p_lst):
+                for r_idx, r in enumerate(p.r_lst):
+                    name = markers.get(r.text)
+                    if name is not None:
+                        slots[name] = (row_idx, cell_idx, p_idx, r_idx)
+                        Run(r, None).text = ""
+
+    missing = set(fields) - set(slots)
+    if missing:
+        raise ValueError(f"Form fields not written by TableWriter: {sorted(missing)}")
+
+    return slots
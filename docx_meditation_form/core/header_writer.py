@@ -1,7 +1,10 @@
+from typing import Optional
+
 from docx.document import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.shared import Inches
 
+from docx_meditation_form.core.instrumentation import timed
 from docx_meditation_form.core.settings import DocxSettings
 
 APPLICATION_FORM_HEADER = """FORM ‘A’
@@ -17,6 +20,7 @@ class HeaderWriter:
     Parameters
     ----------
     :param doc: `docx.document.Document` active python-docx Document instance to write into.
+    :param settings: `DocxSettings` to style with; defaults to direct formatting.
 
     Writes the fixed header section of the mediation application form.
 
@@ -25,9 +29,11 @@ class HeaderWriter:
     - The sub-header identifying the authority and court
     """
 
-    def __init__(self, doc: Document):
+    def __init__(self, doc: Document, settings: Optional[DocxSettings] = None):
         self.doc = doc
+        self.settings = settings or DocxSettings(doc)
 
+    @timed("header.write")
     def write(self):
         """
         Write the complete header to the document.
@@ -42,12 +48,12 @@ class HeaderWriter:
         p = self.doc.add_paragraph()
         p.alignment = WD_ALIGN_PARAGRAPH.CENTER
         run = p.add_run(APPLICATION_FORM_HEADER)
-        DocxSettings.apply_run_style(run, bold=True)
-        p.paragraph_format.space_after = 0
+        self.settings.style_run(run, bold=True)
+        self.settings.style_paragraph(p, space_after=0)
 
     def _write_sub_header(self):
         p = self.doc.add_paragraph()
         p.alignment = WD_ALIGN_PARAGRAPH.CENTER
         run = p.add_run(APPLICATION_FORM_SUB_HEADER)
-        DocxSettings.apply_run_style(run)
-        p.paragraph_format.space_after = Inches(0.34)
+        self.settings.style_run(run)
+        self.settings.style_paragraph(p, space_after=Inches(0.34))
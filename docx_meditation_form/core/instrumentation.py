@@ -0,0 +1,353 @@
+"""
+Render and upload instrumentation.
+
+Stages of the pipeline (layout, cell formatting, serialization, Drive calls)
+are wrapped with `timed`, and work done is recorded with `count`. Nothing is
+measured until at least one sink is registered with `enable`; while disabled
+a wrapped call costs one extra function call and a truthiness check.
+
+.. code-block:: python
+
+    from docx_meditation_form.core import instrumentation
+
+    registry = instrumentation.HistogramRegistry()
+    instrumentation.enable(registry)
+
+    ...  # render and upload forms
+
+    print(instrumentation.PrometheusExporter(registry).render())
+"""
+
+import bisect
+import functools
+import inspect
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+# Registered sinks; an empty list means instrumentation is disabled
+_sinks: List["Sink"] = []
+
+# Upper bounds (seconds) of the default histogram buckets
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Sink:
+    """Receives stage timings and counter increments."""
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record that `stage` took `seconds`."""
+
+    def increment(self, counter: str, amount: float = 1) -> None:
+        """Add `amount` to `counter`."""
+
+
+def enable(*sinks: Sink) -> None:
+    """Register `sinks` and start measuring."""
+    for sink in sinks:
+        if sink not in _sinks:
+            _sinks.append(sink)
+
+
+def disable(*sinks: Sink) -> None:
+    """Unregister `sinks`, or every sink if none are given."""
+    if not sinks:
+        _sinks.clear()
+    for sink in sinks:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def is_enabled() -> bool:
+    """``True`` if at least one sink is registered."""
+    return bool(_sinks)
+
+
+def observe(stage: str, seconds: float) -> None:
+    """Send one timing to every sink."""
+    for sink in _sinks:
+        sink.observe(stage, seconds)
+
+
+def count(counter: str, amount: float = 1, **labels: str) -> None:
+    """
+    Increment `counter` on every sink; no-op while disabled.
+
+    Labels are appended to the counter name the way Prometheus writes them,
+    e.g. ``count("drive_retries", kind="throttled")`` increments
+    ``drive_retries{kind="throttled"}``.
+    """
+    if _sinks:
+        if labels:
+            pairs = ",".join(f'{name}="{_label_value(str(labels[name]))}"' for name in sorted(labels))
+            counter = f"{counter}{{{pairs}}}"
+        for sink in _sinks:
+            sink.increment(counter, amount)
+
+
+@contextmanager
+def _measure(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+def stage(name: str):
+    """Context manager timing the enclosed block as stage `name`."""
+    if not _sinks:
+        return _NULL_CONTEXT
+    return _measure(name)
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of a function or coroutine function as stage `name`."""
+
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not _sinks:
+                    return await fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    observe(name, time.perf_counter() - start)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class HistogramRegistry(Sink):
+    """
+    In-process, thread-safe histograms of stage timings plus counters.
+
+    :param buckets: Histogram bucket upper bounds, in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # stage -> [bucket counts..., +Inf count], total seconds
+        self._histograms: Dict[str, Tuple[List[int], List[float]]] = {}
+        self._counters: Dict[str, float] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        idx = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            entry = self._histograms.get(stage)
+            if entry is None:
+                entry = self._histograms[stage] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][idx] += 1
+            entry[1][0] += seconds
+
+    def increment(self, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Return a copy of the collected data.
+
+        :return: ``{"stages": {stage: {"count", "sum", "buckets"}}, "counters": {...}}``
+            where ``buckets`` holds cumulative counts per upper bound.
+        """
+        with self._lock:
+            stages = {}
+            for name, (counts, total) in self._histograms.items():
+                cumulative = []
+                running = 0
+                for c in counts:
+                    running += c
+                    cumulative.append(running)
+                bounds = list(self.buckets) + [float("inf")]
+                stages[name] = {
+                    "count": running,
+                    "sum": total[0],
+                    "buckets": list(zip(bounds, cumulative)),
+                }
+            return {"stages": stages, "counters": dict(self._counters)}
+
+    def reset(self) -> None:
+        """Drop all collected data."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+# Characters Prometheus does not allow in metric names
+_INVALID_METRIC_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _metric_name(name: str) -> str:
+    """`name` with invalid characters (e.g. the dots of ``drive.upload``) replaced by ``_``."""
+    name = _INVALID_METRIC_CHARS.sub("_", name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusExporter:
+    """
+    Renders a `HistogramRegistry` in the Prometheus text exposition format.
+
+    Stage and counter names may use the dotted names of `timed` (e.g.
+    ``drive.upload``); characters not allowed in metric names become ``_``.
+
+    :param registry: Registry to export.
+    :param prefix: Metric name prefix.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, registry: HistogramRegistry, *, prefix: str = "docx_form") -> None:
+        self.registry = registry
+        self.prefix = prefix
+
+    def render(self) -> str:
+        """Return the current metrics as Prometheus text."""
+        data = self.registry.snapshot()
+        metric = _metric_name(f"{self.prefix}_stage_seconds")
+        lines = [
+            f"# HELP {metric} Time spent in each render/upload stage.",
+            f"# TYPE {metric} histogram",
+        ]
+        for name in sorted(data["stages"]):
+            hist = data["stages"][name]
+            stage = _label_value(name)
+            for bound, cumulative in hist["buckets"]:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {hist["sum"]}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {hist["count"]}')
+
+        # labelled counters (see `count`) are series of one metric
+        series: Dict[str, List[Tuple[str, float]]] = {}
+        for name, value in data["counters"].items():
+            base, brace, labels = name.partition("{")
+            counter = _metric_name(f"{self.prefix}_{base}_total")
+            series.setdefault(counter, []).append((brace + labels, value))
+        for counter in sorted(series):
+            lines.append(f"# TYPE {counter} counter")
+            for labels, value in sorted(series[counter]):
+                lines.append(f"{counter}{labels} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class ProfileReport:
+    """Result of `capture_profile`: cProfile stats and tracemalloc peak."""
+
+    def __init__(self) -> None:
+        self.profile: Optional["cProfile.Profile"] = None
+        self.peak_bytes: Optional[int] = None
+        self.top_allocations: List["tracemalloc.Statistic"] = []
+
+    def stats_text(self, *, sort: str = "cumulative", limit: int = 30) -> str:
+        """Formatted cProfile statistics, or an empty string if not captured."""
+        if self.profile is None:
+            return ""
+        import io
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+@contextmanager
+def capture_profile(*, cpu: bool = True, memory: bool = True) -> Iterator[ProfileReport]:
+    """
+    Opt-in profiling of one request or render.
+
+    .. code-block:: python
+
+        with capture_profile() as report:
+            renderer.render_to_bytes(values)
+        print(report.peak_bytes)
+        print(report.stats_text(limit=10))
+
+    :param cpu: Run the block under `cProfile`.
+    :param memory: Trace allocations with `tracemalloc` (peak and top sites).
+    """
+    # profilers are only imported by the code that uses them
+    import cProfile
+    import tracemalloc
+
+    report = ProfileReport()
+    started_tracing = False
+
+    if memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+
+    if cpu:
+        report.profile = cProfile.Profile()
+        report.profile.enable()
+
+    try:
+        yield report
+    finally:
+        if cpu:
+            report.profile.disable()
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+            report.peak_bytes = peak - base
+            report.top_allocations = tracemalloc.take_snapshot().statistics("lineno")[:10]
+            if started_tracing:
+                tracemalloc.stop()
@@ -0,0 +1,407 @@
+import re
+import zipfile
+from io import BytesIO
+from typing import IO, TYPE_CHECKING, Iterable, Union
+
+from docx.shared import Inches
+
+from docx_meditation_form.core.header_writer import (
+    APPLICATION_FORM_HEADER,
+    APPLICATION_FORM_SUB_HEADER,
+)
+from docx_meditation_form.core.settings import (
+    FONT_NAME,
+    FONT_SIZE,
+    PARAGRAPH_STYLE,
+    RUN_STYLES,
+    style_id,
+)
+from docx_meditation_form.core.instrumentation import timed
+from docx_meditation_form.core.package import DEFAULT_BACKEND, DOCUMENT_PART, SaveBackend
+from docx_meditation_form.core.table_layout import BORDER_EDGES
+from docx_meditation_form.dataset.form_values import FormValues
+
+if TYPE_CHECKING:
+    from docx_meditation_form.core.form_template import FormTemplate
+    from docx_meditation_form.core.render_plan import RenderPlan
+
+# Characters not allowed in XML 1.0 (tab, CR and LF are turned into markup)
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+class _Slot:
+    """Marks a run whose text is taken from a `FormValues` field."""
+
+    __slots__ = ("name", "properties")
+
+    def __init__(self, name: str, properties: str = "") -> None:
+        self.name = name
+        self.properties = properties
+
+
+class OoxmlWriter:
+    """
+    Render engine that writes the form package without the python-docx object model.
+
+    ``word/document.xml`` is emitted as text straight from the template's
+    `TableLayout`, its `RenderPlan` and the header constants. The static markup is compiled once into
+    a list of string chunks; a render only escapes and joins the 12 values.
+    Every other package part (styles, settings, relationships, ...) is copied
+    from the `FormTemplate` skeleton, and the package is written through a
+    `SaveBackend` (with the ``"fast"`` writer, those parts are compressed
+    once and their compressed bytes reused for every package).
+
+    The output is equivalent to the `TableWriter` path, including the
+    template's ``use_styles`` and ``coalesce`` options.
+
+    :param template: `FormTemplate` providing the layout and the package parts.
+    :param deterministic: Write fixed zip entry metadata, so equal values
+        always produce identical bytes (see `core.package`).
+    :param backend: Zip writer and compression settings.
+    """
+
+    def __init__(
+        self,
+        template: "FormTemplate",
+        *,
+        deterministic: bool = True,
+        backend: SaveBackend = DEFAULT_BACKEND,
+    ) -> None:
+        self.template = template
+        self.deterministic = deterministic
+        self.backend = backend
+
+        with zipfile.ZipFile(BytesIO(template.skeleton)) as zf:
+            self.parts = [(info.filename, zf.read(info)) for info in zf.infolist()]
+
+        skeleton_xml = dict(self.parts)[DOCUMENT_PART].decode("utf-8")
+        head, _, rest = skeleton_xml.partition("<w:body>")
+
+        self._head = head + "<w:body>"
+        self._tail = rest[rest.index("<w:sectPr") :]
+        self._form = _compile(self._body())
+        self._next_form = _compile(self._body(page_break=True))
+
+    @timed("xml.document")
+    def document_xml(self, values: FormValues) -> bytes:
+        """
+        Return the serialized ``word/document.xml`` for `values`.
+
+        :param values: `FormValues` to render.
+        """
+        return (self._head + self._form_xml(self._form, values) + self._tail).encode(
+            "utf-8"
+        )
+
+    def _form_xml(self, chunks: list, values: FormValues) -> str:
+        out = []
+        for chunk in chunks:
+            if chunk.__class__ is str:
+                out.append(chunk)
+            else:
+                out.append(_run(chunk.properties, _run_content(getattr(values, chunk.name))))
+        return "".join(out)
+
+    @timed("xml.package")
+    def save(self, values: FormValues, target: Union[str, IO[bytes]]) -> None:
+        """
+        Write a complete DOCX package for `values`.
+
+        :param values: `FormValues` to render.
+        :param target: File path or writable binary stream.
+        """
+        document = self.document_xml(values)
+        with self.backend.open(target, deterministic=self.deterministic) as zf:
+            for name, blob in self.parts:
+                zf.write(name, document if name == DOCUMENT_PART else blob)
+
+    def save_many(
+        self,
+        values_iter: Iterable[FormValues],
+        target: Union[str, IO[bytes]],
+    ) -> int:
+        """
+        Write one DOCX package holding a form for each item of `values_iter`.
+
+        Every form after the first starts on a new page; section settings,
+        styles and numbering are shared. ``document.xml`` is streamed into the
+        zip one form at a time, so memory stays constant and time grows
+        linearly with the number of forms.
+
+        :param values_iter: `FormValues` to render, consumed lazily.
+        :param target: File path or writable binary stream.
+        :return: Number of forms written.
+        """
+        count = 0
+        with self.backend.open(target, deterministic=self.deterministic) as zf:
+            for name, blob in self.parts:
+                if name != DOCUMENT_PART:
+                    zf.write(name, blob)
+                    continue
+
+                with zf.open(name) as part:
+                    part.write(self._head.encode("utf-8"))
+                    for values in values_iter:
+                        chunks = self._next_form if count else self._form
+                        part.write(self._form_xml(chunks, values).encode("utf-8"))
+                        count += 1
+                    part.write(self._tail.encode("utf-8"))
+        return count
+
+    # -- markup builders -----------------------------------------------------
+
+    def _body(self, *, page_break: bool = False) -> list:
+        return (
+            self._paragraph(
+                [(APPLICATION_FORM_HEADER, True, False)],
+                align="center",
+                space_after=0,
+                page_break_before=page_break,
+            )
+            + self._paragraph(
+                [(APPLICATION_FORM_SUB_HEADER, False, False)],
+                align="center",
+                space_after=Inches(0.34).twips,
+            )
+            + self._table()
+        )
+
+    def _paragraph(self, runs, **options) -> list:
+        return _paragraph(
+            runs,
+            styled=self.template.use_styles,
+            coalesce=self.template.coalesce,
+            **options,
+        )
+
+    def _table(self) -> list:
+        layout = self.template.layout
+        border = (
+            f'w:val="single" w:sz="4" w:space="0" w:color="{layout.border_color}"/>'
+        )
+
+        out = [
+            "<w:tbl><w:tblPr>"
+            '<w:tblW w:type="auto" w:w="0"/>'
+            '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+            'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+            "<w:tblBorders>"
+            + "".join(f"<w:{edge} {border}" for edge in BORDER_EDGES)
+            + "</w:tblBorders></w:tblPr><w:tblGrid>"
+            + "".join(f'<w:gridCol w:w="{w}"/>' for w in layout.column_twips)
+            + "</w:tblGrid>"
+        ]
+
+        contents = _cell_contents(self.template.plan)
+
+        for idx, (height, spans) in enumerate(zip(layout.row_heights, layout.spans)):
+            out.append(
+                "<w:tr><w:trPr>"
+                f'<w:trHeight w:val="{height.twips}" w:hRule="atLeast"/>'
+                "</w:trPr>"
+            )
+
+            for col, span in spans:
+                width = layout.cell_width(col, span)
+                valign, paragraphs = contents.get((idx, col), (None, None))
+                out.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/>')
+                if span > 1:
+                    out.append(f'<w:gridSpan w:val="{span}"/>')
+                if valign is not None:
+                    out.append(f'<w:vAlign w:val="{valign}"/>')
+                out.append("</w:tcPr>")
+                if paragraphs is None:
+                    out.append("<w:p/>")
+                else:
+                    for runs, options in paragraphs:
+                        out.extend(self._paragraph(runs, **options))
+                out.append("</w:tc>")
+
+            out.append("</w:tr>")
+
+        out.append("</w:tbl>")
+        return out
+
+
+def _cell_contents(plan: "RenderPlan") -> dict:
+    """
+    Cell content of a `RenderPlan` keyed by ``(row, first grid column)``.
+
+    Each value is ``(vertical alignment, [(runs, paragraph options), ...])``
+    and each run is ``(text, bold, underline)`` where text may be a `_Slot`.
+    """
+    contents = {}
+    for row, cell in plan.cells():
+        paragraphs = []
+        for paragraph in cell.paragraphs:
+            runs = [
+                (_Slot(run.field) if run.field else run.text, run.bold, run.underline)
+                for run in paragraph.runs
+            ]
+            options = {
+                "align": paragraph.align,
+                "space_before": paragraph.space_before.twips,
+                "space_after": paragraph.space_after.twips,
+            }
+            paragraphs.append((runs, options))
+        contents[(row, cell.col)] = (cell.valign, paragraphs)
+    return contents
+
+
+def _paragraph(
+    runs,
+    *,
+    align=None,
+    space_before=None,
+    space_after=None,
+    page_break_before=False,
+    styled=False,
+    coalesce=False,
+) -> list:
+    """
+    Markup chunks for one paragraph; runs with a `_Slot` text become `_Slot`
+    chunks carrying their run properties.
+
+    With `styled`, the paragraph refers to `PARAGRAPH_STYLE` and zero spacing
+    is left to the style. With `coalesce`, neighbouring static runs with the
+    same formatting are merged, like `coalesce_runs`.
+    """
+    if styled:
+        space_before = space_before or None
+        space_after = space_after or None
+
+    spacing = ""
+    if space_before is not None:
+        spacing += f' w:before="{space_before}"'
+    if space_after is not None:
+        spacing += f' w:after="{space_after}"'
+
+    if coalesce:
+        runs = _coalesce(runs)
+
+    out = ["<w:p><w:pPr>"]
+    if styled:
+        out.append(f'<w:pStyle w:val="{style_id(PARAGRAPH_STYLE)}"/>')
+    if page_break_before:
+        out.append("<w:pageBreakBefore/>")
+    if spacing:
+        out.append(f"<w:spacing{spacing}/>")
+    if align is not None:
+        out.append(f'<w:jc w:val="{align}"/>')
+    out.append("</w:pPr>")
+
+    for text, bold, underline in runs:
+        properties = _run_properties(bold, underline, styled)
+        if isinstance(text, _Slot):
+            out.append(_Slot(text.name, properties))
+        else:
+            out.append(_run(properties, _run_content(text)))
+
+    out.append("</w:p>")
+    return out
+
+
+def _coalesce(runs) -> list:
+    """Join the texts of neighbouring static runs with the same formatting."""
+    merged = []
+    for text, bold, underline in runs:
+        if (
+            merged
+            and not isinstance(text, _Slot)
+            and not isinstance(merged[-1][0], _Slot)
+            and merged[-1][1:] == (bold, underline)
+        ):
+            merged[-1] = (merged[-1][0] + text, bold, underline)
+        else:
+            merged.append((text, bold, underline))
+    return merged
+
+
+def _run(properties: str, content: str) -> str:
+    """One ``w:r`` element."""
+    if not properties and not content:
+        return "<w:r/>"
+    return f"<w:r>{properties}{content}</w:r>"
+
+
+def _run_properties(bold: bool, underline: bool, styled: bool = False) -> str:
+    """
+    ``w:rPr`` equivalent to `DocxSettings.style_run`: a character style
+    reference when `styled`, otherwise `DocxSettings.apply_run_style`.
+    """
+    if styled:
+        if not (bold or underline):
+            return ""
+        return f'<w:rPr><w:rStyle w:val="{style_id(RUN_STYLES[(bold, underline)])}"/></w:rPr>'
+    return (
+        "<w:rPr>"
+        f'<w:rFonts w:ascii="{FONT_NAME}" w:hAnsi="{FONT_NAME}"/>'
+        + ("<w:b/>" if bold else '<w:b w:val="0"/>')
+        + '<w:color w:val="000000"/>'
+        + f'<w:sz w:val="{int(FONT_SIZE.pt * 2)}"/>'
+        + ('<w:u w:val="single"/>' if underline else '<w:u w:val="none"/>')
+        + "</w:rPr>"
+    )
+
+
+def _escape(text: str) -> str:
+    """Escape ``&``, ``<`` and ``>`` in XML text, like ``xml.sax.saxutils.escape``."""
+    # saxutils would import urllib.request and http.client with it
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _unescape(text: str) -> str:
+    """Reverse of `_escape`."""
+    return text.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
+
+
+def _run_content(text: str) -> str:
+    """
+    Run content markup for `text`.
+
+    Follows python-docx's ``Run.text`` setter: tabs become ``w:tab``, line
+    breaks become ``w:br`` and text with surrounding whitespace is preserved.
+
+    :raises ValueError: If `text` contains characters not allowed in XML.
+    """
+    if _INVALID_XML_CHARS.search(text):
+        raise ValueError(
+            "All strings must be XML compatible: Unicode or ASCII, "
+            "no NULL bytes or control characters"
+        )
+
+    out = []
+    buffer = []
+
+    def flush():
+        if buffer:
+            t = "".join(buffer)
+            buffer.clear()
+            if t.strip() != t:
+                out.append(f'<w:t xml:space="preserve">{_escape(t)}</w:t>')
+            else:
+                out.append(f"<w:t>{_escape(t)}</w:t>")
+
+    for char in text:
+        if char == "\t":
+            flush()
+            out.append("<w:tab/>")
+        elif char in "\r\n":
+            flush()
+            out.append("<w:br/>")
+        else:
+            buffer.append(char)
+    flush()
+
+    return "".join(out)
+
+
+def _compile(chunks: list) -> list:
+    """Merge adjacent static strings so a render only joins a few chunks."""
+    compiled = []
+    for chunk in chunks:
+        if compiled and isinstance(chunk, str) and isinstance(compiled[-1], str):
+            compiled[-1] += chunk
+        else:
+            compiled.append(chunk)
+    return compiled
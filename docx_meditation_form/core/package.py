@@ -0,0 +1,687 @@
+"""
+Zip-level writing of DOCX packages.
+
+Both render engines write their packages through a `SaveBackend`, which opens
+either `PackageZip` (the standard library's `zipfile`) or `FastPackageZip`.
+In deterministic mode both stamp every entry with the same metadata
+(timestamp, permissions, creating system), so a given document always
+serializes to the same bytes. Part order is the one python-docx derives from
+the relationship graph, which is stable. Together with the normalized core
+properties of the `FormTemplate` skeleton, two renders of the same
+`FormValues` with the same backend are byte-identical (for a given zlib
+build), and a hash of the output can be used for deduplication and HTTP ETags.
+
+`FastPackageZip` trades generality (no Zip64, no reading) for speed: parts that
+are identical from one package to the next (styles, theme, settings, font
+table, ...) are deflated once and their compressed bytes reused, and large
+parts can be deflated in parallel blocks, the way ``pigz`` does.
+"""
+
+import os
+import struct
+import threading
+import zipfile
+import zlib
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import IO, TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
+
+from docx.document import Document as DocumentObject
+from docx.opc.constants import CONTENT_TYPE as CT
+from docx.opc.constants import NAMESPACE as NS
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from docx.opc.part import Part
+from docx.opc.spec import default_content_types
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# Every timestamp in a deterministic package: the earliest date zip can store
+PACKAGE_TIMESTAMP = datetime(1980, 1, 1, tzinfo=timezone.utc)
+
+# rw-r--r-- regular file
+_EXTERNAL_ATTR = 0o100644 << 16
+
+# "Unix"; the zipfile default depends on the platform
+_CREATE_SYSTEM = 3
+
+# zlib's default level, which is also what `zipfile` uses for ZIP_DEFLATED
+DEFAULT_LEVEL = 6
+
+# The one part that changes from form to form; everything else is static
+DOCUMENT_PART = "word/document.xml"
+
+
+class PackageZip:
+    """
+    Minimal zip writer for OPC packages.
+
+    Usable as a context manager; also implements the ``write(pack_uri, blob)``
+    interface python-docx uses for its physical package writers.
+
+    :param target: File path or writable binary stream.
+    :param deterministic: Write fixed entry metadata instead of the current time.
+    :param level: Deflate level 1-9, or 0 to store parts uncompressed.
+    """
+
+    def __init__(
+        self,
+        target: Union[str, IO[bytes]],
+        *,
+        deterministic: bool = True,
+        level: int = DEFAULT_LEVEL,
+    ) -> None:
+        self.deterministic = deterministic
+        self.compress_type = zipfile.ZIP_DEFLATED if level else zipfile.ZIP_STORED
+        self.compresslevel = level if level and level != DEFAULT_LEVEL else None
+        self.zipf = zipfile.ZipFile(
+            target,
+            "w",
+            compression=self.compress_type,
+            compresslevel=self.compresslevel,
+        )
+
+    def entry(self, name: str) -> Union[str, zipfile.ZipInfo]:
+        """Zip entry for member `name`: a fixed `ZipInfo`, or the name itself."""
+        if not self.deterministic:
+            return name
+        info = zipfile.ZipInfo(name, date_time=PACKAGE_TIMESTAMP.timetuple()[:6])
+        info.compress_type = self.compress_type
+        # a ZipInfo does not inherit the archive's level
+        info._compresslevel = self.compresslevel
+        info.external_attr = _EXTERNAL_ATTR
+        info.create_system = _CREATE_SYSTEM
+        return info
+
+    def write(self, name: Union[str, PackURI], blob: bytes) -> None:
+        """Add member `name` (a zip member name or a python-docx `PackURI`)."""
+        if isinstance(name, PackURI):
+            name = name.membername
+        self.zipf.writestr(self.entry(name), blob)
+
+    def open(self, name: str) -> IO[bytes]:
+        """Open member `name` for streaming writes."""
+        return self.zipf.open(self.entry(name), "w")
+
+    def close(self) -> None:
+        self.zipf.close()
+
+    def __enter__(self) -> "PackageZip":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _Member:
+    """A compressed part, ready to be copied into any number of packages."""
+
+    __slots__ = ("method", "crc", "size", "data")
+
+    def __init__(self, method: int, crc: int, size: int, data: bytes) -> None:
+        self.method = method
+        self.crc = crc
+        self.size = size
+        self.data = data
+
+
+class PartCache:
+    """
+    Compressed bytes of static parts, shared by `FastPackageZip` instances.
+
+    Entries are keyed by part name and level, and only returned for a blob
+    equal to the one that was compressed, so a changed part is never served
+    stale. Thread-safe.
+
+    :param max_entries: Entries kept; the cache is cleared when it is full.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, int], Tuple[bytes, _Member]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, blob: bytes, level: int) -> Optional[_Member]:
+        entry = self._entries.get((name, level))
+        if entry is not None and (entry[0] is blob or entry[0] == blob):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, name: str, blob: bytes, level: int, member: _Member) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[(name, level)] = (blob, member)
+
+
+# Block size for parallel deflate; each block is primed with the 32 KiB window
+# before it, so the ratio stays within a fraction of a percent of serial deflate
+BLOCK_SIZE = 1 << 20
+_WINDOW = 32 * 1024
+
+_executors: Dict[int, "Executor"] = {}
+_executors_lock = threading.Lock()
+
+
+def _executor(threads: int) -> "Executor":
+    """Process-wide thread pool of `threads` workers (zlib releases the GIL)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    with _executors_lock:
+        executor = _executors.get(threads)
+        if executor is None:
+            executor = _executors[threads] = ThreadPoolExecutor(
+                threads, thread_name_prefix="deflate"
+            )
+        return executor
+
+
+def _deflate_block(data: bytes, start: int, end: int, level: int, final: bool) -> bytes:
+    """Raw deflate of ``data[start:end]``, primed with the preceding window."""
+    if start:
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -15, zdict=data[max(0, start - _WINDOW) : start]
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    out = compressor.compress(data[start:end])
+    return out + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _compress(blob: bytes, level: int, threads: int) -> _Member:
+    crc = zlib.crc32(blob)
+    if not level:
+        return _Member(zipfile.ZIP_STORED, crc, len(blob), blob)
+    if threads > 1 and len(blob) > BLOCK_SIZE:
+        starts = range(0, len(blob), BLOCK_SIZE)
+        blocks = _executor(threads).map(
+            lambda start: _deflate_block(
+                blob, start, start + BLOCK_SIZE, level, start + BLOCK_SIZE >= len(blob)
+            ),
+            starts,
+        )
+        return _Member(zipfile.ZIP_DEFLATED, crc, len(blob), b"".join(blocks))
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    data = compressor.compress(blob) + compressor.flush()
+    return _Member(zipfile.ZIP_DEFLATED, crc, len(blob), data)
+
+
+# Parts above this size are never cached
+_MAX_CACHED_PART = 4 * BLOCK_SIZE
+
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+
+class FastPackageZip:
+    """
+    Zip writer for OPC packages, with reusable compressed parts and parallel deflate.
+
+    Same interface as `PackageZip`. Entries use the same metadata, so with the
+    default level and ``threads=1`` the output matches `PackageZip` byte for
+    byte. Members are limited to 4 GiB (no Zip64).
+
+    :param target: File path or writable binary stream.
+    :param deterministic: Write fixed entry metadata instead of the current time.
+    :param level: Deflate level 1-9, or 0 to store parts uncompressed.
+    :param threads: Deflate parts larger than `BLOCK_SIZE` in parallel blocks
+        on this many threads; 1 compresses serially.
+    :param cache: `PartCache` for static parts (every part but
+        ``word/document.xml``); ``None`` compresses every part every time.
+    """
+
+    def __init__(
+        self,
+        target: Union[str, IO[bytes]],
+        *,
+        deterministic: bool = True,
+        level: int = DEFAULT_LEVEL,
+        threads: int = 1,
+        cache: Optional[PartCache] = None,
+    ) -> None:
+        if isinstance(target, (str, os.PathLike)):
+            self.fp: IO[bytes] = open(target, "wb")
+            self._owns_fp = True
+        else:
+            self.fp = target
+            self._owns_fp = False
+        self.level = level
+        self.threads = threads
+        self.cache = cache
+        self._seekable = _is_seekable(self.fp)
+        self._base = self.fp.tell() if self._seekable else 0
+        self._offset = 0
+        self._central: List[bytes] = []
+
+        timestamp = PACKAGE_TIMESTAMP if deterministic else datetime.now()
+        self._dos_time = 0
+        self._dos_date = (timestamp.year - 1980) << 9 | timestamp.month << 5 | timestamp.day
+        if not deterministic:
+            self._dos_time = timestamp.hour << 11 | timestamp.minute << 5 | timestamp.second // 2
+
+    def write(self, name: Union[str, PackURI], blob: bytes) -> None:
+        """Add member `name` (a zip member name or a python-docx `PackURI`)."""
+        if isinstance(name, PackURI):
+            name = name.membername
+        member = None
+        cacheable = (
+            self.cache is not None and name != DOCUMENT_PART and len(blob) <= _MAX_CACHED_PART
+        )
+        if cacheable:
+            member = self.cache.get(name, blob, self.level)
+        if member is None:
+            member = _compress(blob, self.level, self.threads)
+            if cacheable:
+                self.cache.put(name, blob, self.level, member)
+        self._add(name, member)
+
+    def copy(self, name: str, member: "_Member") -> None:
+        """Add member `name` from compressed bytes, e.g. from `read_members`."""
+        self._add(name, member)
+
+    def _add(self, name: str, member: _Member) -> None:
+        if len(member.data) > _ZIP32_LIMIT or member.size > _ZIP32_LIMIT:
+            raise ValueError(f"{name} is larger than 4 GiB; use the 'zipfile' writer")
+        encoded = name.encode("ascii")
+        offset = self._offset
+        self._write(self._local_header(encoded, member.method, 0, member.crc, len(member.data), member.size))
+        self._write(member.data)
+        self._central_entry(encoded, member.method, 0, member.crc, len(member.data), member.size, offset)
+
+    def open(self, name: str) -> IO[bytes]:
+        """Open member `name` for streaming writes."""
+        return _MemberWriter(self, name)
+
+    def _local_header(self, name: bytes, method: int, flags: int, crc: int, csize: int, size: int) -> bytes:
+        return struct.pack(
+            "<4s2B4HL2L2H",
+            b"PK\x03\x04",
+            20,
+            0,
+            flags,
+            method,
+            self._dos_time,
+            self._dos_date,
+            crc,
+            csize,
+            size,
+            len(name),
+            0,
+        ) + name
+
+    def _central_entry(
+        self, name: bytes, method: int, flags: int, crc: int, csize: int, size: int, offset: int
+    ) -> None:
+        self._central.append(
+            struct.pack(
+                "<4s4B4HL2L5HLL",
+                b"PK\x01\x02",
+                20,
+                _CREATE_SYSTEM,
+                20,
+                0,
+                flags,
+                method,
+                self._dos_time,
+                self._dos_date,
+                crc,
+                csize,
+                size,
+                len(name),
+                0,
+                0,
+                0,
+                0,
+                _EXTERNAL_ATTR,
+                offset,
+            )
+            + name
+        )
+
+    def _write(self, data: bytes) -> None:
+        self.fp.write(data)
+        self._offset += len(data)
+
+    def close(self) -> None:
+        if self.fp is None:
+            return
+        start = self._offset
+        for entry in self._central:
+            self._write(entry)
+        self._write(
+            struct.pack(
+                "<4s4H2LH",
+                b"PK\x05\x06",
+                0,
+                0,
+                len(self._central),
+                len(self._central),
+                self._offset - start,
+                start,
+                0,
+            )
+        )
+        self.fp.flush()
+        if self._owns_fp:
+            self.fp.close()
+        self.fp = None
+
+    def __enter__(self) -> "FastPackageZip":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _MemberWriter:
+    """
+    Streaming writer for one `FastPackageZip` member.
+
+    With several threads, data is cut into `BLOCK_SIZE` blocks deflated in
+    parallel and written in order, with a bounded number in flight. The local
+    header is patched with the final sizes if the target is seekable;
+    otherwise they follow the data in a data descriptor.
+    """
+
+    def __init__(self, zf: FastPackageZip, name: str) -> None:
+        self.zf = zf
+        self.name = name.encode("ascii")
+        self.level = zf.level
+        self.method = zipfile.ZIP_DEFLATED if zf.level else zipfile.ZIP_STORED
+        self.flags = 0 if zf._seekable else 0x08
+        self.offset = zf._offset
+        self.crc = 0
+        self.size = 0
+        self.csize = 0
+        self._buffer = bytearray()
+        self._previous = b""
+        self._pending: list = []
+        self._compressor = None
+        if self.level and zf.threads <= 1:
+            self._compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        zf._write(zf._local_header(self.name, self.method, self.flags, 0, 0, 0))
+
+    def write(self, data: bytes) -> int:
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        if not self.level:
+            self._emit(bytes(data))
+        elif self._compressor is not None:
+            self._emit(self._compressor.compress(data))
+        else:
+            self._buffer += data
+            while len(self._buffer) >= BLOCK_SIZE:
+                self._submit(bytes(self._buffer[:BLOCK_SIZE]), final=False)
+                del self._buffer[:BLOCK_SIZE]
+        return len(data)
+
+    def _submit(self, block: bytes, *, final: bool) -> None:
+        data = self._previous + block
+        start = len(self._previous)
+        self._previous = block[-_WINDOW:]
+        self._pending.append(
+            _executor(self.zf.threads).submit(_deflate_block, data, start, len(data), self.level, final)
+        )
+        while len(self._pending) > 2 * self.zf.threads:
+            self._emit(self._pending.pop(0).result())
+
+    def _emit(self, data: bytes) -> None:
+        if data:
+            self.zf._write(data)
+            self.csize += len(data)
+
+    def close(self) -> None:
+        zf = self.zf
+        if self._compressor is not None:
+            self._emit(self._compressor.flush())
+        elif self.level:
+            self._submit(bytes(self._buffer), final=True)
+            for future in self._pending:
+                self._emit(future.result())
+            self._pending = []
+        if self.csize > _ZIP32_LIMIT or self.size > _ZIP32_LIMIT:
+            raise ValueError(f"{self.name.decode()} is larger than 4 GiB; use the 'zipfile' writer")
+
+        if zf._seekable:
+            end = zf.fp.tell()
+            zf.fp.seek(zf._base + self.offset)
+            zf.fp.write(zf._local_header(self.name, self.method, self.flags, self.crc, self.csize, self.size))
+            zf.fp.seek(end)
+        else:
+            zf._write(struct.pack("<4s3L", b"PK\x07\x08", self.crc, self.csize, self.size))
+        zf._central_entry(self.name, self.method, self.flags, self.crc, self.csize, self.size, self.offset)
+
+    def __enter__(self) -> "_MemberWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_members(source: Union[str, os.PathLike, bytes, IO[bytes]]) -> List[Tuple[str, _Member]]:
+    """
+    Read every member of a zip file without decompressing it.
+
+    The compressed bytes can be written to a new package with
+    `FastPackageZip.copy`, so unchanged parts are carried over byte for byte
+    and without deflating them again.
+
+    :param source: Zip file path, content or readable binary stream.
+    :return: ``(name, member)`` pairs in archive order.
+    :raises zipfile.BadZipFile: If `source` is not a zip file.
+    :raises ValueError: If a member uses a method other than store or deflate.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            return read_members(fh.read())
+    data = source if isinstance(source, bytes) else source.read()
+
+    members = []
+    with zipfile.ZipFile(BytesIO(data)) as zf:
+        for info in zf.infolist():
+            if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                raise ValueError(f"{info.filename}: unsupported compression method {info.compress_type}")
+            name_length, extra_length = struct.unpack_from("<2H", data, info.header_offset + 26)
+            start = info.header_offset + 30 + name_length + extra_length
+            raw = data[start : start + info.compress_size]
+            members.append((info.filename, _Member(info.compress_type, info.CRC, info.file_size, raw)))
+    return members
+
+
+def _is_seekable(fp) -> bool:
+    try:
+        return fp.seekable()
+    except AttributeError:
+        return False
+
+
+# Compressed static parts shared by every `FastPackageZip` of a process
+_static_parts = PartCache()
+
+
+class SaveBackend:
+    """
+    How packages are zipped: writer, compression level, parallelism.
+
+    Render engines open every package through a backend, so the trade-off
+    between CPU time and output size can be chosen per renderer:
+
+    - ``SaveBackend()``: the standard library `zipfile` at zlib's default
+      level, as python-docx does;
+    - ``SaveBackend("fast", level=1)``: `FastPackageZip`, reusing the
+      compressed static parts and deflating with the fastest level, for CPU
+      bound batch jobs;
+    - ``SaveBackend("fast", level=9, threads=4)``: smallest files, with large
+      parts (e.g. combined documents) deflated on 4 threads;
+    - ``SaveBackend(level=0)``: parts stored uncompressed.
+
+    A backend is a small picklable value, safe to share between threads and
+    to send to worker processes.
+
+    :param writer: ``"zipfile"`` (`PackageZip`) or ``"fast"`` (`FastPackageZip`).
+    :param level: Deflate level 1-9, or 0 to store parts uncompressed.
+    :param threads: Parallel deflate threads (``"fast"`` writer only).
+    :param precompress: Reuse compressed static parts (``"fast"`` writer only).
+
+    :raises ValueError: If `writer` or `level` is not supported.
+    """
+
+    WRITERS = ("zipfile", "fast")
+
+    __slots__ = ("writer", "level", "threads", "precompress")
+
+    def __init__(
+        self,
+        writer: str = "zipfile",
+        *,
+        level: int = DEFAULT_LEVEL,
+        threads: int = 1,
+        precompress: bool = True,
+    ) -> None:
+        if writer not in self.WRITERS:
+            raise ValueError(f"Unsupported writer {writer!r}, expected one of {self.WRITERS}")
+        if not 0 <= level <= 9:
+            raise ValueError(f"Unsupported compression level {level!r}, expected 0-9")
+        self.writer = writer
+        self.level = level
+        self.threads = max(1, threads)
+        self.precompress = precompress
+
+    def open(
+        self, target: Union[str, IO[bytes]], *, deterministic: bool = True
+    ) -> Union[PackageZip, FastPackageZip]:
+        """Open a package writer on `target`."""
+        if self.writer == "zipfile":
+            return PackageZip(target, deterministic=deterministic, level=self.level)
+        return FastPackageZip(
+            target,
+            deterministic=deterministic,
+            level=self.level,
+            threads=self.threads,
+            cache=_static_parts if self.precompress else None,
+        )
+
+    @property
+    def key(self) -> str:
+        """Short string identifying the bytes this backend produces, for cache keys."""
+        parallel = "p" if self.writer == "fast" and self.threads > 1 else ""
+        return f"{self.writer}{self.level}{parallel}"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SaveBackend) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        return (
+            f"SaveBackend({self.writer!r}, level={self.level}, threads={self.threads}, "
+            f"precompress={self.precompress})"
+        )
+
+
+DEFAULT_BACKEND = SaveBackend()
+
+
+def save_document(
+    doc: DocumentObject,
+    target: Union[str, IO[bytes]],
+    *,
+    deterministic: bool = True,
+    backend: SaveBackend = DEFAULT_BACKEND,
+) -> None:
+    """
+    Save a python-docx document like `Document.save`, through a `SaveBackend`.
+
+    Writes the same entries as python-docx, in the same order, using only
+    its public part and relationship API.
+
+    :param doc: Document to save.
+    :param target: File path or writable binary stream.
+    :param deterministic: See `PackageZip`.
+    :param backend: Zip writer and compression settings.
+    """
+    package = doc.part.package
+    parts = list(package.parts)
+    for part in parts:
+        part.before_marshal()
+
+    with backend.open(target, deterministic=deterministic) as zf:
+        zf.write(CONTENT_TYPES_URI, _content_types_xml(parts))
+        zf.write(PACKAGE_URI.rels_uri, package.rels.xml)
+        for part in parts:
+            zf.write(part.partname, part.blob)
+            if len(part.rels):
+                zf.write(part.partname.rels_uri, part.rels.xml)
+
+
+def _content_types_xml(parts: Iterable[Part]) -> bytes:
+    """
+    ``[Content_Types].xml`` of a package with `parts`, as python-docx writes it.
+
+    Extensions with a standard content type get a ``Default`` entry, other
+    parts an ``Override``; both are sorted.
+    """
+    defaults = {"rels": CT.OPC_RELATIONSHIPS, "xml": CT.XML}
+    overrides = {}
+    for part in parts:
+        ext = part.partname.ext.lower()
+        if (ext, part.content_type) in default_content_types:
+            defaults[ext] = part.content_type
+        else:
+            overrides[str(part.partname)] = part.content_type
+
+    entries = [
+        f'<Default Extension="{_attr(ext)}" ContentType="{_attr(defaults[ext])}"/>'
+        for ext in sorted(defaults)
+    ]
+    entries += [
+        f'<Override PartName="{_attr(name)}" ContentType="{_attr(overrides[name])}"/>'
+        for name in sorted(overrides)
+    ]
+    xml = (
+        "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+        f'<Types xmlns="{NS.OPC_CONTENT_TYPES}">{"".join(entries)}</Types>'
+    )
+    return xml.encode("utf-8")
+
+
+def _attr(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def normalize_core_properties(
+    doc: DocumentObject,
+    *,
+    title: str = "",
+    author: str = "",
+    modified: Optional[datetime] = None,
+) -> None:
+    """
+    Replace the core properties python-docx inherits from its default template
+    (author "python-docx", a 2013 timestamp, ...) with fixed values.
+
+    :param doc: Document to update.
+    :param title: Document title.
+    :param author: Document author.
+    :param modified: Created and modified time, defaults to `PACKAGE_TIMESTAMP`.
+    """
+    modified = modified or PACKAGE_TIMESTAMP
+    props = doc.core_properties
+    props.title = title
+    props.author = author
+    props.comments = ""
+    props.last_modified_by = author
+    props.revision = 1
+    # python-docx writes naive datetimes as UTC
+    props.created = props.modified = modified.astimezone(timezone.utc).replace(tzinfo=None)
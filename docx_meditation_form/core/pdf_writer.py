@@ -0,0 +1,458 @@
+import re
+import zlib
+from io import BytesIO
+from operator import attrgetter
+from typing import IO, Iterable, List, Optional, Sequence, Tuple, Union
+
+from docx.shared import Inches, Twips
+
+from docx_meditation_form.core.font_metrics import (
+    ENCODING,
+    TIMES_BOLD_WIDTHS,
+    TIMES_ROMAN_WIDTHS,
+    UNDERLINE_POSITION,
+    UNDERLINE_THICKNESS,
+)
+from docx_meditation_form.core.header_writer import (
+    APPLICATION_FORM_HEADER,
+    APPLICATION_FORM_SUB_HEADER,
+)
+from docx_meditation_form.core.instrumentation import timed
+from docx_meditation_form.core.render_plan import FORM_PLAN, RenderPlan
+from docx_meditation_form.core.settings import (
+    DOCUMENT_AUTHOR,
+    DOCUMENT_TITLE,
+    FONT_SIZE,
+    SIDE_MARGIN,
+    TOP_MARGIN,
+)
+from docx_meditation_form.core.table_layout import TableLayout
+from docx_meditation_form.dataset.form_values import FormValues
+
+# US Letter, the page size of the DOCX skeleton, in points
+PAGE_WIDTH = 612.0
+PAGE_HEIGHT = 792.0
+
+# Word stores font sizes in half points, so FONT_SIZE is rendered rounded
+FONT_POINTS = round(FONT_SIZE.pt * 2) / 2
+
+# Default paragraph spacing of the skeleton's styles (``w:line="276"``,
+# ``w:after="200"``) and Word's default left/right cell margin
+LINE_SPACING = 276 / 240
+DEFAULT_SPACE_AFTER = Twips(200).pt
+CELL_PADDING = Twips(108).pt
+
+# Height of a single-spaced Times New Roman line (ascent + descent + line gap),
+# and its ascent, in em. These are the TrueType metrics Word lays lines out
+# with, not the (smaller) Type 1 ascender of the standard PDF font.
+_NATURAL_LINE_HEIGHT = 2355 / 2048
+_LINE_ASCENT = 1825 / 2048
+
+LINE_HEIGHT = FONT_POINTS * _NATURAL_LINE_HEIGHT * LINE_SPACING
+
+BORDER_WIDTH = 0.5
+
+# Characters not representable in a PDF text string are dropped or replaced
+_CONTROL_CHARS = re.compile("[\x00-\x08\x0b-\x1f\x7f]")
+_WORDS = re.compile(r"\S+ *| +")
+
+_FONTS = {False: (b"/F1", TIMES_ROMAN_WIDTHS), True: (b"/F2", TIMES_BOLD_WIDTHS)}
+
+_ALIGN = {"left": 0.0, "center": 0.5, "right": 1.0}
+
+# A run of text: (text, bold, underline)
+Run = Tuple[str, bool, bool]
+
+# A paragraph: (runs, align, space_before, space_after), spacing in points
+Paragraph = Tuple[Sequence[Run], str, float, float]
+
+
+class PdfWriter:
+    """
+    Render engine that draws the form straight into a PDF, without Word.
+
+    The page is built from the same sources as the DOCX engines: the header
+    constants, the `TableLayout` (column widths, minimum row heights, merged
+    cells, borders) and the `RenderPlan` (labels, value bindings, alignment,
+    spacing). Text is set in the standard PDF Times fonts, which share Times
+    New Roman's metrics, at `FONT_SIZE`; lines wrap at cell width like in Word
+    and rows grow to fit their content. No fonts are embedded and no external
+    process is involved.
+
+    Everything that does not depend on a submission (the header and every
+    label cell) is laid out once and kept as content-stream bytes; a render
+    only wraps the value cells, resolves row heights and concatenates. Output
+    is deterministic: the same values always give the same bytes.
+
+    Text is encoded as WinAnsi (cp1252); characters outside it are written as
+    ``?``. Each form is one page; content overflowing the page is not split.
+
+    :param layout: Table geometry, defaults to `TableLayout()`.
+    :param plan: Table content, defaults to `FORM_PLAN`.
+    """
+
+    def __init__(
+        self,
+        layout: Optional[TableLayout] = None,
+        plan: Optional[RenderPlan] = None,
+    ) -> None:
+        self.layout = layout or TableLayout()
+        self.plan = plan or FORM_PLAN
+
+        header = [
+            ([(APPLICATION_FORM_HEADER, True, False)], "center", 0.0, 0.0),
+            ([(APPLICATION_FORM_SUB_HEADER, False, False)], "center", 0.0, Inches(0.34).pt),
+        ]
+        content_width = PAGE_WIDTH - 2 * SIDE_MARGIN.pt
+        header_ops, header_height = _layout(header, content_width)
+        self._header = _place(header_ops, SIDE_MARGIN.pt, PAGE_HEIGHT - TOP_MARGIN.pt)
+
+        # the table's left edge sits one cell margin left of the page margin,
+        # so cell text lines up with the header, as in Word
+        self._table_left = SIDE_MARGIN.pt - CELL_PADDING
+        self._table_top = PAGE_HEIGHT - TOP_MARGIN.pt - header_height
+        self._min_heights = [height.pt for height in self.layout.row_heights]
+
+        contents = {(row, cell.col): cell for row, cell in self.plan.cells()}
+        self._cells: List[_Cell] = []
+        for row, spans in enumerate(self.layout.spans):
+            for col, span in spans:
+                x = self._table_left + Twips(self.layout.cell_width(0, col)).pt
+                width = Twips(self.layout.cell_width(col, span)).pt
+                self._cells.append(_Cell(row, x, width, contents.get((row, col))))
+
+    @timed("pdf.page")
+    def page_content(self, values: FormValues) -> bytes:
+        """
+        Return the (uncompressed) content stream of one form page.
+
+        :param values: `FormValues` to render.
+        """
+        heights = list(self._min_heights)
+        blocks = []
+        for cell in self._cells:
+            ops, height = cell.content(values)
+            if height > heights[cell.row]:
+                heights[cell.row] = height
+            blocks.append((cell, ops, height))
+
+        tops = []
+        y = self._table_top
+        for height in heights:
+            tops.append(y)
+            y -= height
+
+        out = [self._header, b"%.2f w\n" % BORDER_WIDTH]
+        for cell, ops, height in blocks:
+            top = tops[cell.row]
+            row_height = heights[cell.row]
+            out.append(
+                b"%.2f %.2f %.2f %.2f re S\n"
+                % (cell.x, top - row_height, cell.width, row_height)
+            )
+            offset = (row_height - height) * cell.valign
+            out.append(_place(ops, cell.x + CELL_PADDING, top - offset))
+        return b"".join(out)
+
+    @timed("pdf.document")
+    def save(self, values: FormValues, target: Union[str, IO[bytes]]) -> None:
+        """
+        Write a one-page PDF for `values`.
+
+        :param values: `FormValues` to render.
+        :param target: File path or writable binary stream.
+        """
+        self.save_many([values], target)
+
+    def save_many(
+        self,
+        values_iter: Iterable[FormValues],
+        target: Union[str, IO[bytes]],
+    ) -> int:
+        """
+        Write one PDF with a page per item of `values_iter`.
+
+        Pages are streamed to `target` as they are rendered, so memory stays
+        constant for any number of forms.
+
+        :param values_iter: `FormValues` to render, consumed lazily.
+        :param target: File path or writable binary stream.
+        :return: Number of pages written.
+        """
+        if isinstance(target, (str, bytes)) or hasattr(target, "__fspath__"):
+            with open(target, "wb") as fh:
+                return self.save_many(values_iter, fh)
+
+        pdf = _PdfFile(target)
+        pdf.add(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Times-Roman /Encoding /WinAnsiEncoding >>")
+        pdf.add(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Times-Bold /Encoding /WinAnsiEncoding >>")
+
+        kids = []
+        for values in values_iter:
+            page = 6 + 2 * len(kids)
+            pdf.stream(page + 1, self.page_content(values))
+            pdf.add(
+                page,
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+                % (PAGE_WIDTH, PAGE_HEIGHT, page + 1),
+            )
+            kids.append(page)
+
+        pdf.add(
+            2,
+            b"<< /Type /Pages /Kids [%s] /Count %d >>"
+            % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)),
+        )
+        pdf.add(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        pdf.add(
+            5,
+            b"<< /Title %s /Author %s /Producer %s >>"
+            % (_string(DOCUMENT_TITLE), _string(DOCUMENT_AUTHOR), _string(DOCUMENT_AUTHOR)),
+        )
+        pdf.close(root=1, info=5)
+        return len(kids)
+
+    def render_bytes(self, values: FormValues) -> bytes:
+        """Return the PDF for `values` as bytes."""
+        buffer = BytesIO()
+        self.save(values, buffer)
+        return buffer.getvalue()
+
+
+class _Cell:
+    """One table cell: position, and its content laid out once if static."""
+
+    __slots__ = ("row", "x", "width", "valign", "paragraphs", "static")
+
+    def __init__(self, row: int, x: float, width: float, spec) -> None:
+        self.row = row
+        self.x = x
+        self.width = width
+        self.valign = _VALIGN[spec.valign if spec is not None else None]
+
+        if spec is None:
+            # an empty cell still holds one paragraph with default spacing
+            self.paragraphs = [([("", False, False)], "left", 0.0, DEFAULT_SPACE_AFTER)]
+        else:
+            self.paragraphs = [
+                (
+                    [
+                        (attrgetter(run.field) if run.field else run.text, run.bold, run.underline)
+                        for run in paragraph.runs
+                    ],
+                    paragraph.align,
+                    paragraph.space_before.pt,
+                    paragraph.space_after.pt,
+                )
+                for paragraph in spec.paragraphs
+            ]
+
+        self.static = None
+        if all(isinstance(text, str) for runs, *_ in self.paragraphs for text, _, _ in runs):
+            self.static = _layout(self.paragraphs, self.text_width)
+
+    @property
+    def text_width(self) -> float:
+        return self.width - 2 * CELL_PADDING
+
+    def content(self, values: FormValues) -> Tuple[bytes, float]:
+        """Content-stream ops (relative to the text area's top left) and height."""
+        if self.static is not None:
+            return self.static
+        paragraphs = [
+            (
+                [(text if text.__class__ is str else _field(text, values), bold, underline)
+                 for text, bold, underline in runs],
+                align,
+                before,
+                after,
+            )
+            for runs, align, before, after in self.paragraphs
+        ]
+        return _layout(paragraphs, self.text_width)
+
+
+def _field(getter, values: FormValues) -> str:
+    value = getter(values)
+    return "" if value is None else str(value)
+
+
+# fraction of the free height placed above the content
+_VALIGN = {None: 0.0, "top": 0.0, "center": 0.5, "bottom": 1.0}
+
+
+def _layout(paragraphs: Sequence[Paragraph], width: float) -> Tuple[bytes, float]:
+    """
+    Lay out paragraphs in a box `width` points wide.
+
+    :return: Content-stream ops drawing them, with the origin at the box's
+        top left corner (so y is negative), and the total height.
+    """
+    out = []
+    y = 0.0
+    for runs, align, space_before, space_after in paragraphs:
+        y += space_before
+        shift = _ALIGN[align]
+        for line, line_width in _wrap(runs, width):
+            baseline = -(y + FONT_POINTS * _LINE_ASCENT)
+            x = (width - line_width) * shift
+            for text, bold, underline, offset, text_width in line:
+                out.append(_text(text, bold, x + offset, baseline))
+                if underline:
+                    out.append(_underline(x + offset, baseline, text_width))
+            y += LINE_HEIGHT
+        y += space_after
+    return b"".join(out), y
+
+
+def _wrap(runs: Sequence[Run], width: float):
+    """
+    Break runs into lines no wider than `width`, at spaces and ``\\n``.
+
+    Words longer than a line are broken between characters.
+
+    :return: ``(pieces, width)`` per line, each piece being
+        ``(text, bold, underline, x offset, trimmed width)``; the line width
+        excludes trailing spaces.
+    """
+    lines: List[list] = [[]]
+    x = 0.0
+    for text, bold, underline in runs:
+        text = _CONTROL_CHARS.sub("", text.replace("\t", " ").replace("\r", ""))
+        for idx, segment in enumerate(text.split("\n")):
+            if idx:
+                lines.append([])
+                x = 0.0
+            for word in _WORDS.findall(segment):
+                trimmed = word.rstrip(" ")
+                if lines[-1] and x + _measure(trimmed, bold) > width:
+                    lines.append([])
+                    x = 0.0
+                    if not trimmed:
+                        continue
+                for part in _split_long(word, bold, width - x):
+                    if lines[-1] and x + _measure(part.rstrip(" "), bold) > width:
+                        lines.append([])
+                        x = 0.0
+                    advance = _measure(part, bold)
+                    lines[-1].append([part, bold, underline, x, _measure(part.rstrip(" "), bold)])
+                    x += advance
+
+    result = []
+    for line in lines:
+        line = _merge(line)
+        line_width = line[-1][3] + line[-1][4] if line else 0.0
+        result.append((line, line_width))
+    return result
+
+
+def _split_long(word: str, bold: bool, room: float) -> List[str]:
+    """Split `word` into chunks fitting a line when it does not fit at all."""
+    widths = _FONTS[bold][1]
+    limit = max(room, 0) * 1000 / FONT_POINTS
+    if sum(widths[b] for b in _encode(word.rstrip(" "))) <= limit:
+        return [word]
+    parts, current, used = [], "", 0
+    for char in word:
+        w = widths[_encode(char)[0]] if char != " " else widths[32]
+        if current and used + w > limit and char != " ":
+            parts.append(current)
+            current, used = "", 0
+        current += char
+        used += w
+    parts.append(current)
+    return parts
+
+
+def _merge(line: list) -> list:
+    """Join neighbouring pieces with the same formatting."""
+    merged: list = []
+    for piece in line:
+        if merged and merged[-1][1:3] == piece[1:3]:
+            last = merged[-1]
+            last[0] += piece[0]
+            last[4] = piece[3] + piece[4] - last[3]
+        else:
+            merged.append(list(piece))
+    return merged
+
+
+def _encode(text: str) -> bytes:
+    return text.encode(ENCODING, "replace")
+
+
+def _measure(text: str, bold: bool) -> float:
+    widths = _FONTS[bold][1]
+    return sum(widths[b] for b in _encode(text)) * FONT_POINTS / 1000
+
+
+def _text(text: str, bold: bool, x: float, y: float) -> bytes:
+    return b"BT %s %.1f Tf %.2f %.2f Td %s Tj ET\n" % (
+        _FONTS[bold][0],
+        FONT_POINTS,
+        x,
+        y,
+        _string(text),
+    )
+
+
+def _underline(x: float, baseline: float, width: float) -> bytes:
+    thickness = UNDERLINE_THICKNESS * FONT_POINTS / 1000
+    y = baseline + UNDERLINE_POSITION * FONT_POINTS / 1000 - thickness / 2
+    return b"%.2f %.2f %.2f %.2f re f\n" % (x, y, width, thickness)
+
+
+def _place(ops: bytes, x: float, y: float) -> bytes:
+    """Draw `ops` (laid out around the origin) with the origin moved to (x, y)."""
+    if not ops:
+        return b""
+    return b"q 1 0 0 1 %.2f %.2f cm\n%sQ\n" % (x, y, ops)
+
+
+def _string(text: str) -> bytes:
+    """PDF literal string of `text`."""
+    data = _encode(text)
+    data = data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"(" + data + b")"
+
+
+class _PdfFile:
+    """Streams numbered objects to a binary file and writes the xref table."""
+
+    def __init__(self, out: IO[bytes]) -> None:
+        self.out = out
+        self.offsets = {}
+        self.position = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes) -> None:
+        self.out.write(data)
+        self.position += len(data)
+
+    def add(self, number: int, body: bytes) -> None:
+        self.offsets[number] = self.position
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+    def stream(self, number: int, data: bytes) -> None:
+        data = zlib.compress(data, 6)
+        self.add(
+            number,
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(data), data),
+        )
+
+    def close(self, *, root: int, info: int) -> None:
+        size = max(self.offsets) + 1
+        xref = self.position
+        entries = [b"0000000000 65535 f \n"]
+        for number in range(1, size):
+            offset = self.offsets.get(number)
+            if offset is None:
+                entries.append(b"0000000000 65535 f \n")
+            else:
+                entries.append(b"%010d 00000 n \n" % offset)
+        self._write(b"xref\n0 %d\n%s" % (size, b"".join(entries)))
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (size, root, info, xref)
+        )
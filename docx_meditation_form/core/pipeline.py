@@ -0,0 +1,362 @@
+"""
+Streaming batch pipeline: read records, render them, upload the results.
+
+Rendering (CPU bound, process pool via `render_many`) and uploading (I/O
+bound, a pool of threads) run as separate stages connected by bounded
+queues, so uploads overlap with rendering and memory stays flat for any
+input size. Progress is appended to a `Checkpoint` file so an interrupted
+run can resume without redoing finished records.
+"""
+
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+from docx_meditation_form.core.batch import render_many
+from docx_meditation_form.core.package import DEFAULT_BACKEND, SaveBackend
+from docx_meditation_form.dataset.form_values import FormValues
+
+# A parsed input record, or the error raised while parsing it
+Record = Union[Dict[str, str], Exception]
+
+RECORD_FORMATS = ("jsonl", "csv")
+
+# Marks the end of the upload queue
+_DONE = object()
+
+
+def read_records(
+    path: Union[str, os.PathLike],
+    *,
+    format: Optional[str] = None,
+) -> Iterator[Tuple[int, Record]]:
+    """
+    Stream ``(index, record)`` pairs from a JSON Lines or CSV file.
+
+    Records are read lazily, one line at a time. A line that cannot be parsed
+    is yielded as the exception instead of a mapping, so one bad record does
+    not stop the batch. Blank JSONL lines are skipped but still counted, so
+    indexes always match line numbers (0-based); for CSV the header row is
+    not counted.
+
+    :param path: Input file.
+    :param format: ``"jsonl"`` or ``"csv"``; guessed from the file extension
+        when omitted (``.csv`` is CSV, anything else JSON Lines).
+
+    :raises ValueError: If `format` is not supported.
+    """
+    path = Path(path)
+    if format is None:
+        format = "csv" if path.suffix.lower() == ".csv" else "jsonl"
+    if format not in RECORD_FORMATS:
+        raise ValueError(f"Unsupported format {format!r}, expected one of {RECORD_FORMATS}")
+
+    with path.open(newline="" if format == "csv" else None, encoding="utf-8") as fh:
+        if format == "csv":
+            yield from enumerate(csv.DictReader(fh))
+            return
+
+        for index, line in enumerate(fh):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield index, exc
+                continue
+            if not isinstance(record, dict):
+                yield index, ValueError("Record is not a JSON object")
+            else:
+                yield index, record
+
+
+class Checkpoint:
+    """
+    Append-only JSON Lines log of finished records.
+
+    The first line identifies the input (path and size); resuming against a
+    different input is refused. Every finished record appends one line
+    ``{"index", "status", "path", "file_id", "error"}`` and the file is
+    flushed, so at most the records in flight are redone after a crash.
+    Records that failed are retried on resume.
+
+    When uploads are shared after the fact (in permission batches), an
+    upload is logged as ``"uploaded"`` and only becomes ``"ok"`` once
+    `record_shared` confirms its grant; such records are listed in
+    `unshared` on resume, to be shared again without uploading again.
+
+    :param path: Checkpoint file; created if missing.
+    :param input_path: Input file the checkpoint belongs to.
+
+    :raises ValueError: If the checkpoint was written for a different input.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        *,
+        input_path: Optional[Union[str, os.PathLike]] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.done: Set[int] = set()
+        # index -> Drive file ID of records uploaded but not shared yet
+        self.unshared: Dict[int, str] = {}
+        # file ID -> (index, path) of the same records
+        self._uploaded: Dict[str, Tuple[int, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+        header = None
+        if input_path is not None:
+            stat = Path(input_path).stat()
+            header = {"input": str(Path(input_path).resolve()), "size": stat.st_size}
+
+        if self.path.exists():
+            self._load(header)
+            self._fh = self.path.open("a", encoding="utf-8")
+        else:
+            self._fh = self.path.open("w", encoding="utf-8")
+            self._write(header or {})
+
+    def _load(self, header: Optional[dict]) -> None:
+        with self.path.open(encoding="utf-8") as fh:
+            lines = iter(fh)
+            first = next(lines, "")
+            if header is not None and first.strip():
+                saved = json.loads(first)
+                if saved and saved != header:
+                    raise ValueError(
+                        f"Checkpoint {self.path} was written for {saved.get('input')} "
+                        f"({saved.get('size')} bytes), not this input"
+                    )
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # torn last line after a crash
+                    continue
+                self._track(entry)
+
+    def record(
+        self,
+        index: int,
+        *,
+        status: str,
+        path: Optional[Path] = None,
+        file_id: Optional[str] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Log the outcome of record `index`.
+
+        :param status: ``"ok"``, ``"uploaded"`` (in Drive, not shared yet)
+            or ``"error"``.
+        """
+        entry = {
+            "index": index,
+            "status": status,
+            "path": str(path) if path is not None else None,
+            "file_id": file_id,
+            "error": repr(error) if error is not None else None,
+        }
+        with self._lock:
+            self._write(entry)
+            self._track(entry)
+
+    def record_shared(self, file_ids: Iterable[str]) -> None:
+        """
+        Mark the ``"uploaded"`` records of `file_ids` as shared, i.e. done.
+
+        Meant as the callback of a `PermissionBatcher`; unknown IDs are ignored.
+        """
+        with self._lock:
+            for file_id in file_ids:
+                found = self._uploaded.get(file_id)
+                if found is None:
+                    continue
+                index, path = found
+                entry = {"index": index, "status": "ok", "path": path, "file_id": file_id, "error": None}
+                self._write(entry)
+                self._track(entry)
+
+    def _track(self, entry: dict) -> None:
+        index = entry["index"]
+        status = entry.get("status")
+        if status == "ok":
+            self.done.add(index)
+        elif status == "uploaded":
+            self.unshared[index] = entry["file_id"]
+            self._uploaded[entry["file_id"]] = (index, entry.get("path"))
+            return
+        file_id = self.unshared.pop(index, None)
+        if file_id is not None:
+            self._uploaded.pop(file_id, None)
+
+    def _write(self, entry: dict) -> None:
+        self._fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        """Close the checkpoint file."""
+        with self._lock:
+            self._fh.close()
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class PipelineStats:
+    """Thread-safe counters of a running pipeline."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.skipped = 0
+        self.rendered = 0
+        self.uploaded = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        """One-line progress summary with throughput."""
+        elapsed = max(self.elapsed, 1e-9)
+        return (
+            f"rendered {self.rendered} ({self.rendered / elapsed:.1f}/s), "
+            f"uploaded {self.uploaded} ({self.uploaded / elapsed:.1f}/s), "
+            f"failed {self.failed}, skipped {self.skipped}, "
+            f"{elapsed:.0f}s elapsed"
+        )
+
+
+def run_pipeline(
+    records: Iterable[Tuple[int, Record]],
+    out_dir: Union[str, os.PathLike],
+    *,
+    checkpoint: Optional[Checkpoint] = None,
+    upload: Optional[Callable[[Path], str]] = None,
+    share: Optional[Callable[[str], None]] = None,
+    workers: Optional[int] = None,
+    executor: str = "process",
+    engine: str = "xml",
+    backend: SaveBackend = DEFAULT_BACKEND,
+    upload_workers: int = 4,
+    queue_size: int = 64,
+    stats: Optional[PipelineStats] = None,
+) -> PipelineStats:
+    """
+    Render (and optionally upload) every record.
+
+    :param records: ``(index, record)`` pairs, e.g. from `read_records`.
+    :param out_dir: Directory the DOCX files are written to.
+    :param checkpoint: Records already done in it are skipped, and every
+        outcome is logged to it.
+    :param upload: ``path -> file_id`` callable run by the upload stage; when
+        omitted the pipeline only renders. Called from several threads.
+    :param share: Queues an uploaded file ID for sharing, e.g.
+        `PermissionBatcher.add`. Uploads are then logged as ``"uploaded"``
+        until the checkpoint's `Checkpoint.record_shared` is called for them;
+        records a previous run uploaded but did not share are passed to it
+        again instead of being uploaded again.
+    :param workers: Render workers, see `render_many`.
+    :param executor: ``"process"`` or ``"thread"`` render workers.
+    :param engine: `FormRenderer` engine.
+    :param backend: `SaveBackend` of the DOCX engines.
+    :param upload_workers: Number of upload threads.
+    :param queue_size: Capacity of the render -> upload queue; rendering
+        pauses while it is full.
+    :param stats: Counters to update, e.g. read by a progress printer.
+    :return: The final counters.
+    """
+    stats = stats or PipelineStats()
+    done = checkpoint.done if checkpoint is not None else set()
+    unshared = dict(checkpoint.unshared) if checkpoint is not None else {}
+
+    def finish(index, *, status, path=None, file_id=None, error=None):
+        if status != "ok":
+            stats.add("failed")
+        if checkpoint is not None:
+            checkpoint.record(index, status=status, path=path, file_id=file_id, error=error)
+
+    def pending() -> Iterator[Tuple[int, FormValues]]:
+        for index, record in records:
+            if index in done or index in unshared:
+                stats.add("skipped")
+            elif isinstance(record, Exception):
+                finish(index, status="error", error=record)
+            else:
+                yield index, record
+
+    uploads: "queue.Queue" = queue.Queue(maxsize=queue_size)
+
+    def upload_worker() -> None:
+        while True:
+            item = uploads.get()
+            if item is _DONE:
+                return
+            index, path = item
+            try:
+                file_id = upload(path)
+            except Exception as exc:
+                finish(index, status="error", path=path, error=exc)
+            else:
+                stats.add("uploaded")
+                if share is None:
+                    finish(index, status="ok", path=path, file_id=file_id)
+                else:
+                    finish(index, status="uploaded", path=path, file_id=file_id)
+                    share(file_id)
+
+    threads = []
+    if upload is not None:
+        threads = [
+            threading.Thread(target=upload_worker, name=f"upload-{n}", daemon=True)
+            for n in range(upload_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+    if share is not None:
+        # uploaded by an earlier run, but never shared
+        for _, file_id in sorted(unshared.items()):
+            share(file_id)
+
+    try:
+        for result in render_many(
+            pending(),
+            out_dir,
+            workers=workers,
+            executor=executor,
+            engine=engine,
+            backend=backend,
+            indexed=True,
+        ):
+            if not result.ok:
+                finish(result.index, status="error", path=result.path, error=result.error)
+                continue
+            stats.add("rendered")
+            if upload is None:
+                finish(result.index, status="ok", path=result.path)
+            else:
+                # blocks while the upload stage is behind
+                uploads.put((result.index, result.path))
+    finally:
+        for _ in threads:
+            uploads.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    return stats
@@ -0,0 +1,358 @@
+"""
+Content-addressed cache of rendered forms.
+
+Entries are keyed by a hash of the `FormValues`, the template layout, the
+render engine and the library version, so an exact resubmission is served
+without rendering and, once its upload is recorded, without uploading again.
+
+.. code-block:: python
+
+    cache = RenderCache("render-cache/")
+
+    entry = cache.render(renderer, values)  # renders only on a miss
+    if entry.drive_file_id is None:
+        file_id = uploader.upload_file(entry.data, name="form.docx")
+        cache.set_drive_file_id(entry.key, file_id)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from docx_meditation_form.core import instrumentation
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.dataset.form_values import FormValues
+
+# Share of `max_disk_bytes` a full disk tier is trimmed down to, so the
+# directory is scanned once per 10% of turnover rather than on every put
+DISK_LOW_WATER = 0.9
+
+
+class CacheEntry:
+    """
+    A cached render.
+
+    :param key: Cache key, see `RenderCache.key`.
+    :param data: DOCX package bytes.
+    :param drive_file_id: Google Drive file ID of an earlier upload, if known.
+    """
+
+    __slots__ = ("key", "data", "drive_file_id")
+
+    def __init__(self, key: str, data: bytes, drive_file_id: Optional[str] = None) -> None:
+        self.key = key
+        self.data = data
+        self.drive_file_id = drive_file_id
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheEntry(key={self.key[:12]!r}, size={len(self.data)}, "
+            f"drive_file_id={self.drive_file_id!r})"
+        )
+
+
+class RenderCache:
+    """
+    Two-tier render cache: a size-bounded in-memory LRU in front of an
+    optional on-disk store.
+
+    Lookups try memory first, then disk (a disk hit is promoted to memory).
+    The disk tier keeps one ``<key>.docx`` file per entry plus a
+    ``<key>.json`` sidecar with the Drive file ID, and evicts the least
+    recently used entries once it grows past `max_disk_bytes`, down to
+    `DISK_LOW_WATER` of it. Writes are atomic, so several processes may share
+    one directory; each one re-reads the directory's size when it evicts.
+
+    The cache is thread-safe.
+
+    :param directory: Directory of the disk tier; ``None`` keeps the cache in
+        memory only. Created if missing.
+    :param max_items: Maximum number of entries kept in memory.
+    :param max_memory_bytes: Maximum total DOCX bytes kept in memory.
+    :param max_disk_bytes: Maximum total size of the disk tier.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, os.PathLike]] = None,
+        *,
+        max_items: int = 1024,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        self.max_items = max_items
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+        self._disk_bytes = 0
+        self._evicting = False
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(path.stat().st_size for path in self._disk_files())
+
+    # -- keys ------------------------------------------------------------------
+
+    @staticmethod
+    def key(values: FormValues, renderer: FormRenderer) -> str:
+        """
+        Cache key of `values` rendered by `renderer`.
+
+        Combines `FormValues.content_hash`, the template fingerprint (layout
+        datasets, labels, styles), the engine, the save backend (compression
+        changes the bytes) and the library version, so a layout change or
+        upgrade never serves a stale document.
+        """
+        from docx_meditation_form import __version__
+
+        parts = (
+            __version__,
+            renderer.engine,
+            renderer.backend.key,
+            renderer.template.fingerprint,
+            values.content_hash,
+        )
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    # -- lookups ---------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for `key`, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                instrumentation.count("cache_hits")
+                return entry
+
+        entry = self._disk_get(key)
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                instrumentation.count("cache_misses")
+                return None
+            self._stats["disk_hits"] += 1
+            instrumentation.count("cache_hits")
+            self._memory_put(entry)
+        return entry
+
+    def put(self, key: str, data: bytes, *, drive_file_id: Optional[str] = None) -> CacheEntry:
+        """Store rendered DOCX bytes under `key`."""
+        entry = CacheEntry(key, data, drive_file_id)
+        with self._lock:
+            self._memory_put(entry)
+        self._disk_put(entry)
+        return entry
+
+    def set_drive_file_id(self, key: str, drive_file_id: str) -> None:
+        """Record the Drive file ID an entry was uploaded as."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                entry.drive_file_id = drive_file_id
+        if self.directory is not None and self._path(key, ".docx").exists():
+            meta = self._path(key, ".json")
+            freed = _size(meta)
+            written = _atomic_write(meta, json.dumps({"drive_file_id": drive_file_id}).encode("utf-8"))
+            self._disk_grow(written - freed)
+
+    def render(self, renderer: FormRenderer, values: FormValues) -> CacheEntry:
+        """
+        Return the cached render of `values`, rendering and storing it on a miss.
+
+        :param renderer: `FormRenderer` used on a miss; also part of the key.
+        :param values: `FormValues` to render.
+        """
+        key = self.key(values, renderer)
+        entry = self.get(key)
+        if entry is None:
+            entry = self.put(key, renderer.render_to_bytes(values))
+        return entry
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current tier sizes."""
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for path in self._disk_files():
+                _unlink(path)
+            self._disk_bytes = 0
+
+    # -- memory tier -----------------------------------------------------------
+
+    def _memory_put(self, entry: CacheEntry) -> None:
+        """Insert `entry` and evict least recently used entries; caller holds the lock."""
+        old = self._memory.pop(entry.key, None)
+        if old is not None:
+            self._memory_bytes -= len(old.data)
+
+        if len(entry.data) > self.max_memory_bytes:
+            return
+
+        self._memory[entry.key] = entry
+        self._memory_bytes += len(entry.data)
+        while len(self._memory) > self.max_items or self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.data)
+            self._stats["memory_evictions"] += 1
+
+    # -- disk tier -------------------------------------------------------------
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / key[:2] / (key + suffix)
+
+    def _disk_files(self):
+        if self.directory is None:
+            return []
+        return [path for path in self.directory.glob("*/*") if path.suffix in (".docx", ".json")]
+
+    def _disk_get(self, key: str) -> Optional[CacheEntry]:
+        if self.directory is None:
+            return None
+
+        path = self._path(key, ".docx")
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        # refresh the access time used for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        drive_file_id = None
+        try:
+            meta = json.loads(self._path(key, ".json").read_bytes())
+            drive_file_id = meta.get("drive_file_id")
+        except (FileNotFoundError, ValueError):
+            pass
+
+        return CacheEntry(key, data, drive_file_id)
+
+    def _disk_put(self, entry: CacheEntry) -> None:
+        if self.directory is None:
+            return
+
+        path = self._path(entry.key, ".docx")
+        meta = self._path(entry.key, ".json")
+        path.parent.mkdir(exist_ok=True)
+        # overwriting an entry replaces its files
+        freed = _size(path)
+        written = _atomic_write(path, entry.data)
+        if entry.drive_file_id is not None:
+            freed += _size(meta)
+            written += _atomic_write(
+                meta, json.dumps({"drive_file_id": entry.drive_file_id}).encode("utf-8")
+            )
+        self._disk_grow(written - freed)
+
+    def _disk_grow(self, delta: int) -> None:
+        """Account for `delta` bytes written to disk, evicting if over the limit."""
+        with self._lock:
+            self._disk_bytes += delta
+            if self._disk_bytes <= self.max_disk_bytes or self._evicting:
+                return
+            self._evicting = True
+            before = self._disk_bytes
+        try:
+            total, freed, evicted = self._disk_evict()
+        finally:
+            with self._lock:
+                self._evicting = False
+        with self._lock:
+            # writes made by this process while the directory was scanned
+            concurrent = self._disk_bytes - before
+            self._disk_bytes = total - freed + concurrent
+            self._stats["disk_evictions"] += evicted
+
+    def _disk_evict(self):
+        """
+        Remove least recently used entries until the directory is under
+        `DISK_LOW_WATER` of the limit, without holding the lock.
+
+        :return: ``(total, freed, evicted)``: bytes found in the directory,
+            bytes removed and number of entries removed.
+        """
+        # key -> [mtime of the document, bytes of its files]
+        entries: Dict[str, list] = {}
+        for path in self._disk_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entry = entries.setdefault(path.stem, [0.0, 0])
+            entry[1] += stat.st_size
+            if path.suffix == ".docx":
+                entry[0] = stat.st_mtime
+
+        total = sum(size for _, size in entries.values())
+        target = self.max_disk_bytes * DISK_LOW_WATER
+        freed = evicted = 0
+        # sidecars without a document (mtime 0) go first
+        for key, _ in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total - freed <= target:
+                break
+            for suffix in (".docx", ".json"):
+                freed += _unlink(self._path(key, suffix))
+            evicted += 1
+        return total, freed, evicted
+
+
+def _atomic_write(path: Path, data: bytes) -> int:
+    """Write `data` to `path` via a temporary file and rename; return its size."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        _unlink(Path(tmp))
+        raise
+    return len(data)
+
+
+def _size(path: Path) -> int:
+    """Size of `path`, 0 if it does not exist."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _unlink(path: Path) -> int:
+    """Remove `path` if it exists; return the number of bytes freed."""
+    try:
+        size = path.stat().st_size
+        path.unlink()
+    except FileNotFoundError:
+        return 0
+    return size
@@ -0,0 +1,159 @@
+from operator import attrgetter
+from typing import Callable, Iterator, List, Mapping, Sequence, Tuple
+
+from docx.enum.table import WD_CELL_VERTICAL_ALIGNMENT
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+from docx_meditation_form.core.cell_formatter import CellFormatter
+from docx_meditation_form.core.instrumentation import count
+from docx_meditation_form.core.table_layout import CellGrid
+from docx_meditation_form.dataset.form_content import (
+    FORM_ROWS,
+    CellSpec,
+    ParagraphSpec,
+)
+
+VERTICAL_ALIGNMENTS = {
+    "center": WD_CELL_VERTICAL_ALIGNMENT.CENTER,
+    "top": WD_CELL_VERTICAL_ALIGNMENT.TOP,
+    "bottom": WD_CELL_VERTICAL_ALIGNMENT.BOTTOM,
+}
+
+PARAGRAPH_ALIGNMENTS = {
+    "left": WD_ALIGN_PARAGRAPH.LEFT,
+    "center": WD_ALIGN_PARAGRAPH.CENTER,
+    "right": WD_ALIGN_PARAGRAPH.RIGHT,
+}
+
+# op(grid, values, formatter, state); state holds the current [cell, paragraph]
+Op = Callable[[CellGrid, object, CellFormatter, list], None]
+
+
+class RenderPlan:
+    """
+    A row spec (see `dataset.form_content`) compiled into a flat list of operations.
+
+    Compiling resolves everything that does not depend on a submission:
+    which grid cell each spec targets, the alignment enums, spacing, and an
+    `operator.attrgetter` for every value binding. `execute` then just runs
+    the operations in order, so writing a form does no lookups by row index,
+    no branching on row kind and no string building.
+
+    Any form laid out as a grid of labelled cells can be described by a row
+    spec and rendered with the same executor.
+
+    :param rows: Row index -> `CellSpec` items written in that row.
+
+    :raises ValueError: If a spec uses an unknown alignment.
+    """
+
+    def __init__(self, rows: Mapping[int, Sequence[CellSpec]]) -> None:
+        self.rows = {idx: tuple(cells) for idx, cells in sorted(rows.items())}
+        self.ops: List[Op] = []
+        for idx, cells in self.rows.items():
+            for cell in cells:
+                self.ops.extend(_compile_cell(idx, cell))
+
+        self.fields = tuple(
+            dict.fromkeys(
+                run.field
+                for _, cell in self.cells()
+                for paragraph in cell.paragraphs
+                for run in paragraph.runs
+                if run.field is not None
+            )
+        )
+
+    def cells(self) -> Iterator[Tuple[int, CellSpec]]:
+        """``(row, cell spec)`` pairs in render order."""
+        for idx, cells in self.rows.items():
+            for cell in cells:
+                yield idx, cell
+
+    def execute(self, grid: CellGrid, values, formatter: CellFormatter) -> None:
+        """
+        Write `values` into a table.
+
+        :param grid: Cell grid of the table, see `table_layout.cell_grid`.
+        :param values: `FormValues` (or any object with the bound attributes).
+        :param formatter: `CellFormatter` used to style paragraphs and runs.
+        """
+        state = [None, None]
+        for op in self.ops:
+            op(grid, values, formatter, state)
+
+
+def _compile_cell(row: int, spec: CellSpec) -> List[Op]:
+    col = spec.col
+    valign = _lookup(VERTICAL_ALIGNMENTS, spec.valign) if spec.valign else None
+
+    if valign is None:
+
+        def select_cell(grid, values, formatter, state):
+            count("cells")
+            state[0] = grid[row][col]
+
+    else:
+
+        def select_cell(grid, values, formatter, state):
+            count("cells")
+            cell = state[0] = grid[row][col]
+            cell.vertical_alignment = valign
+
+    ops = [select_cell]
+    for idx, paragraph in enumerate(spec.paragraphs):
+        ops.append(_compile_paragraph(paragraph, first=idx == 0))
+        for run in paragraph.runs:
+            ops.append(_compile_run(run.text, run.field, run.bold, run.underline))
+    return ops
+
+
+def _compile_paragraph(spec: ParagraphSpec, *, first: bool) -> Op:
+    align = _lookup(PARAGRAPH_ALIGNMENTS, spec.align)
+    space_before, space_after = spec.space_before, spec.space_after
+
+    if first:
+
+        def paragraph(grid, values, formatter, state):
+            p = state[1] = state[0].paragraphs[0]
+            formatter.format_paragraph(
+                p, align=align, space_before=space_before, space_after=space_after
+            )
+
+    else:
+
+        def paragraph(grid, values, formatter, state):
+            p = state[1] = state[0].add_paragraph()
+            formatter.format_paragraph(
+                p, align=align, space_before=space_before, space_after=space_after
+            )
+
+    return paragraph
+
+
+def _compile_run(text: str, field, bold: bool, underline: bool) -> Op:
+    if field is None:
+
+        def run(grid, values, formatter, state):
+            formatter.add_run(state[1], text, bold=bold, underline=underline)
+
+    else:
+        getter = attrgetter(field)
+
+        def run(grid, values, formatter, state):
+            formatter.add_run(state[1], getter(values), bold=bold, underline=underline)
+
+    return run
+
+
+def _lookup(table: dict, key: str):
+    try:
+        return table[key]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported alignment {key!r}, expected one of {tuple(table)}"
+        ) from None
+
+
+# The mediation application form, compiled once at import
+FORM_PLAN = RenderPlan(FORM_ROWS)
@@ -1,13 +1,36 @@
 # core/settings.py
+from typing import Optional
+
 from docx.document import Document
-from docx.shared import Inches, Pt, RGBColor
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_UNDERLINE
+from docx.shared import Inches, Length, Pt, RGBColor
+from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 
 TOP_MARGIN = Inches(0.2291667)
+SIDE_MARGIN = Inches(0.45)
 
 FONT_NAME = "Times New Roman"
 FONT_SIZE = Pt(10.82727336883545)
 
+# Core properties (docProps/core.xml) of every generated document
+DOCUMENT_TITLE = "Mediation Application Form"
+DOCUMENT_AUTHOR = "docx_meditation_form"
+
+# Named styles used when rendering with `use_styles=True`
+PARAGRAPH_STYLE = "Form Text"
+RUN_STYLES = {
+    (True, False): "Form Bold",
+    (True, True): "Form Bold Underline",
+    (False, True): "Form Underline",
+}
+
+
+def style_id(name: str) -> str:
+    """Style ID written to ``styles.xml`` for the style called `name`."""
+    return name.replace(" ", "")
+
 
 class Color:
     """Centralized color palette."""
@@ -28,10 +51,18 @@ class DocxSettings:
     ----------
     doc : `docx.document.Document`
         Target document whose sections and runs will be modified.
+    use_styles : `bool`
+        Define named paragraph/character styles once in ``styles.xml`` and make
+        paragraphs and runs refer to them, instead of repeating direct
+        formatting on every run. The rendered output looks the same; the
+        document XML is much smaller.
     """
 
-    def __init__(self, doc: Document) -> None:
+    def __init__(self, doc: Document, *, use_styles: bool = False) -> None:
         self.doc = doc
+        self.use_styles = use_styles
+        if use_styles:
+            self.add_styles()
 
     def set_section(self):
         """
@@ -39,8 +70,8 @@ class DocxSettings:
         Intended to match the original PDF layout measurements.
         """
         section = self.doc.sections[0]
-        section.left_margin = Inches(0.45)
-        section.right_margin = Inches(0.45)
+        section.left_margin = SIDE_MARGIN
+        section.right_margin = SIDE_MARGIN
 
     def set_top_margin(self):
         """
@@ -48,6 +79,64 @@ class DocxSettings:
         """
         self.doc.sections[0].top_margin = TOP_MARGIN
 
+    def add_styles(self) -> None:
+        """
+        Define the form's paragraph and character styles, if not defined yet.
+
+        The paragraph style carries the font, size and color with zero spacing
+        before and after; the character styles only add bold/underline.
+        """
+        styles = self.doc.styles
+        names = {style.name for style in styles}
+
+        if PARAGRAPH_STYLE not in names:
+            style = styles.add_style(PARAGRAPH_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = styles["Normal"]
+            style.font.name = FONT_NAME
+            style.font.size = FONT_SIZE
+            style.font.color.rgb = Color.BLACK
+            style.paragraph_format.space_before = 0
+            style.paragraph_format.space_after = 0
+
+        for (bold, underline), name in RUN_STYLES.items():
+            if name not in names:
+                style = styles.add_style(name, WD_STYLE_TYPE.CHARACTER)
+                style.font.bold = bold or None
+                style.font.underline = WD_UNDERLINE.SINGLE if underline else None
+
+    def style_paragraph(
+        self,
+        p: Paragraph,
+        *,
+        space_before: Optional[Length] = None,
+        space_after: Optional[Length] = None,
+    ) -> None:
+        """
+        Apply the form paragraph style (when enabled) and spacing.
+
+        With styles enabled, zero spacing is inherited from the paragraph
+        style and not written again.
+        """
+        if self.use_styles:
+            p.style = PARAGRAPH_STYLE
+        for attr, value in (("space_before", space_before), ("space_after", space_after)):
+            if value is None or (self.use_styles and value == 0):
+                continue
+            setattr(p.paragraph_format, attr, value)
+
+    def style_run(self, run: Run, *, bold=False, underline=False) -> None:
+        """
+        Style a run, by character style reference or direct formatting.
+
+        :param run: The run to style.
+        :param bold: Whether the text should be bold.
+        :param underline: Whether the text should be underlined.
+        """
+        if not self.use_styles:
+            self.apply_run_style(run, bold=bold, underline=underline)
+        elif bold or underline:
+            run.style = RUN_STYLES[(bold, underline)]
+
     @staticmethod
     def apply_run_style(run: Run, *, bold=False, underline=False):
         """
@@ -0,0 +1,174 @@
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Length, Twips
+from docx.table import Table, _Cell
+
+from docx_meditation_form.dataset.dataset import (
+    COLUMN_WIDTHS_DATASET,
+    ROW_HEIGHTS_DATASET,
+)
+
+# Row index -> merge mode ("full": all three cells, "right": last two cells)
+MERGE_RULES = {
+    0: "full",
+    2: "right",
+    7: "right",
+    8: "right",
+    14: "full",
+    15: "full",
+    16: "right",
+}
+
+# (row predicate, `ROW_HEIGHTS_DATASET` key); rows matching none use "base_text"
+ROW_HEIGHT_RULES = [
+    (lambda i: i == 2 or 4 <= i <= 8, "small_text"),
+    (lambda i: i == 3, "section"),
+    (lambda i: i == 10, "major_section"),
+    (lambda i: i == 16, "tiny_gap"),
+]
+
+TABLE_ROWS = 17
+TABLE_COLUMNS = 3
+BORDER_COLOR = "000000"
+
+BORDER_EDGES = ("top", "left", "bottom", "right", "insideH", "insideV")
+
+# A grid of cells: ``grid[row][column]``; merged cells repeat across their span
+CellGrid = List[List[_Cell]]
+
+
+class TableLayout:
+    """
+    Complete geometry of the form table: column widths, row heights, merged
+    cells and borders.
+
+    Everything is resolved once when the layout is built (height rules are
+    evaluated per row index, merge modes are turned into ``(column, span)``
+    lists), so `apply` is a single pass over the ``w:tbl`` element. It gives
+    the same XML as `TableWriter.set_columns_width`, `set_rows_height` and
+    `merge_required_rows`, without python-docx rebuilding the cell grid on
+    every ``row.cells`` access.
+
+    :param column_widths: Column widths, defaults to `COLUMN_WIDTHS_DATASET`.
+    :param row_heights: Row heights by role, defaults to `ROW_HEIGHTS_DATASET`.
+    :param rows: Number of table rows.
+    :param merges: Row index -> merge mode, defaults to `MERGE_RULES`.
+    :param height_rules: ``(predicate, role)`` pairs, defaults to `ROW_HEIGHT_RULES`.
+    :param border_color: Hex color of the table borders.
+
+    :raises ValueError: If a merge mode is not supported.
+    """
+
+    def __init__(
+        self,
+        column_widths: Sequence[Length] = COLUMN_WIDTHS_DATASET,
+        row_heights: Mapping[str, Length] = ROW_HEIGHTS_DATASET,
+        *,
+        rows: int = TABLE_ROWS,
+        merges: Mapping[int, str] = MERGE_RULES,
+        height_rules: Iterable = ROW_HEIGHT_RULES,
+        border_color: str = BORDER_COLOR,
+    ) -> None:
+        height_rules = list(height_rules)
+
+        self.column_widths = list(column_widths)
+        self.columns = len(self.column_widths)
+        self.rows = rows
+        self.border_color = border_color
+
+        # widths are stored in twips, as Word does, so merged widths add up exactly
+        self.column_twips = [width.twips for width in self.column_widths]
+        self.row_heights: List[Length] = [
+            row_heights[resolve_height_key(idx, height_rules, default="base_text")]
+            for idx in range(rows)
+        ]
+        self.spans: List[List[Tuple[int, int]]] = [
+            self._spans(merges.get(idx)) for idx in range(rows)
+        ]
+
+    def _spans(self, mode: Optional[str]) -> List[Tuple[int, int]]:
+        """``(first column, span)`` of every cell in a row with merge `mode`."""
+        if mode is None:
+            return [(col, 1) for col in range(self.columns)]
+        if mode == "full":
+            return [(0, self.columns)]
+        if mode == "right":
+            return [(0, 1), (1, self.columns - 1)]
+        raise ValueError(f"Unsupported merge mode {mode!r}, expected 'full' or 'right'")
+
+    def cell_width(self, col: int, span: int) -> int:
+        """Width in twips of a cell starting at `col` and spanning `span` columns."""
+        return sum(self.column_twips[col : col + span])
+
+    def apply(self, table: Table) -> CellGrid:
+        """
+        Apply borders, widths, heights and merges to a freshly created table.
+
+        :param table: `docx.table.Table` with `rows` x `columns` unmerged cells.
+        :return: The table's cell grid, see `cell_grid`.
+        """
+        tbl = table._tbl
+        tbl.tblPr.append(borders_element(self.border_color))
+
+        for grid_col, twips in zip(tbl.tblGrid.gridCol_lst, self.column_twips):
+            grid_col.w = Twips(twips)
+
+        grid = []
+        for tr, height, spans in zip(tbl.tr_lst, self.row_heights, self.spans):
+            tr_height = OxmlElement("w:trHeight")
+            tr_height.set(qn("w:val"), str(height.twips))
+            tr_height.set(qn("w:hRule"), "atLeast")
+            tr.get_or_add_trPr().append(tr_height)
+
+            tcs = tr.tc_lst
+            cells = []
+            for col, span in spans:
+                tc = tcs[col]
+                for swallowed in tcs[col + 1 : col + span]:
+                    tr.remove(swallowed)
+                tc.width = Twips(self.cell_width(col, span))
+                if span > 1:
+                    tc.grid_span = span
+                cells.extend([_Cell(tc, table)] * span)
+            grid.append(cells)
+
+        return grid
+
+
+def cell_grid(table: Table) -> CellGrid:
+    """
+    Build the cell grid of `table` in one pass.
+
+    Equivalent to ``[row.cells for row in table.rows]`` for tables with
+    horizontal merges only, but each ``w:tc`` is visited once.
+    """
+    grid = []
+    for tr in table._tbl.tr_lst:
+        cells = []
+        for tc in tr.tc_lst:
+            cells.extend([_Cell(tc, table)] * tc.grid_span)
+        grid.append(cells)
+    return grid
+
+
+def resolve_height_key(idx: int, rules: Iterable, *, default: str) -> str:
+    """Resolve the `ROW_HEIGHTS_DATASET` key for a row index."""
+    for predicate, key in rules:
+        if predicate(idx):
+            return key
+    return default
+
+
+def borders_element(color: str):
+    """``w:tblBorders`` with a single `color` line on every edge."""
+    borders = OxmlElement("w:tblBorders")
+    for edge in BORDER_EDGES:
+        e = OxmlElement(f"w:{edge}")
+        e.set(qn("w:val"), "single")
+        e.set(qn("w:sz"), "4")
+        e.set(qn("w:space"), "0")
+        e.set(qn("w:color"), color)
+        borders.append(e)
+    return borders
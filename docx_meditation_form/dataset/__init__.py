@@ -1,4 +1,17 @@
 from .dataset import COLUMN_WIDTHS_DATASET, ROW_HEIGHTS_DATASET
-from .form_values import FormValues
+from .form_content import FORM_ROWS, CellSpec, ParagraphSpec, RunSpec
+from .form_values import FORM_FIELDS, FormValues
+from .form_values_batch import FormValuesBatch, FormValuesRow
 
-_all__ = ["COLUMN_WIDTHS_DATASET", "ROW_HEIGHTS_DATASET", "FormValues"]
+__all__ = [
+    "COLUMN_WIDTHS_DATASET",
+    "ROW_HEIGHTS_DATASET",
+    "FORM_ROWS",
+    "CellSpec",
+    "ParagraphSpec",
+    "RunSpec",
+    "FORM_FIELDS",
+    "FormValues",
+    "FormValuesBatch",
+    "FormValuesRow",
+]
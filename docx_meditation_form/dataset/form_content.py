@@ -0,0 +1,182 @@
+"""Declarative content of the form table: labels, value bindings and formatting."""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+from docx.shared import Inches, Length
+
+
+class RunSpec:
+    """
+    One run of text: a fixed label or a `FormValues` field.
+
+    :param text: Label text; ignored when `field` is set.
+    :param field: `FormValues` attribute whose value is written instead.
+    :param bold: Bold text.
+    :param underline: Underlined text.
+    """
+
+    __slots__ = ("text", "field", "bold", "underline")
+
+    def __init__(
+        self,
+        text: str = "",
+        *,
+        field: Optional[str] = None,
+        bold: bool = False,
+        underline: bool = False,
+    ) -> None:
+        self.text = text
+        self.field = field
+        self.bold = bold
+        self.underline = underline
+
+
+class ParagraphSpec:
+    """
+    One paragraph of a cell.
+
+    :param runs: `RunSpec` items, in order.
+    :param align: ``"left"`` or ``"center"``.
+    :param space_before: Spacing before the paragraph.
+    :param space_after: Spacing after the paragraph.
+    """
+
+    __slots__ = ("runs", "align", "space_before", "space_after")
+
+    def __init__(
+        self,
+        runs: Sequence[RunSpec],
+        *,
+        align: str = "left",
+        space_before: Length = Length(0),
+        space_after: Length = Length(0),
+    ) -> None:
+        self.runs = tuple(runs)
+        self.align = align
+        self.space_before = space_before
+        self.space_after = space_after
+
+
+class CellSpec:
+    """
+    Content of one table cell.
+
+    :param col: Grid column of the cell (the first column of a merged cell).
+    :param paragraphs: `ParagraphSpec` items; the first one fills the cell's
+        existing paragraph, the others are added after it.
+    :param valign: ``"center"``, ``"top"`` or ``None`` to leave it unset.
+    """
+
+    __slots__ = ("col", "paragraphs", "valign")
+
+    def __init__(
+        self,
+        col: int,
+        paragraphs: Sequence[ParagraphSpec],
+        *,
+        valign: Optional[str] = "center",
+    ) -> None:
+        self.col = col
+        self.paragraphs = tuple(paragraphs)
+        self.valign = valign
+
+
+def label(col: int, text: str, *, align="left", bold=True, underline=False) -> CellSpec:
+    """Cell holding a single fixed label."""
+    run = RunSpec(text, bold=bold, underline=underline)
+    return CellSpec(col, [ParagraphSpec([run], align=align)])
+
+
+def number(col: int, text: str) -> CellSpec:
+    """Centered, non-bold serial number cell."""
+    return label(col, text, align="center", bold=False)
+
+
+def value(col: int, field: str) -> CellSpec:
+    """Cell holding a single `FormValues` field."""
+    return CellSpec(col, [ParagraphSpec([RunSpec(field=field, bold=True)])])
+
+
+def address(col: int, prefix: str, space_after: Length) -> CellSpec:
+    """Registered + correspondence address cell for `APPLICANT` or `DEFENDANT`."""
+    return CellSpec(
+        col,
+        [
+            ParagraphSpec(
+                [
+                    RunSpec("REGISTERED ADDRESS:\n", bold=True),
+                    RunSpec(field=f"{prefix}_BRANCH_ADDRESS"),
+                ],
+                space_after=space_after,
+            ),
+            ParagraphSpec(
+                [
+                    RunSpec("CORRESPONDENCE BRANCH ADDRESS:\n", bold=True),
+                    RunSpec(field=f"{prefix}_CORRESPONDENCE_BRANCH_ADDRESS"),
+                ]
+            ),
+        ],
+        valign=None,
+    )
+
+
+def contact_rows(
+    start: int,
+    prefix: str,
+    space_after: Length,
+    *,
+    serial: Optional[str] = None,
+) -> Dict[int, Tuple[CellSpec, ...]]:
+    """Address, telephone, mobile and email rows of one party."""
+    address_row = (label(1, "Address"), address(2, prefix, space_after))
+    if serial is not None:
+        address_row = (number(0, serial),) + address_row
+
+    return {
+        start: address_row,
+        start + 1: (label(1, "Telephone No."), value(2, f"{prefix}_PHONE")),
+        start + 2: (label(1, "Mobile No."), value(2, f"{prefix}_MOBILE")),
+        start + 3: (label(1, "Email ID"), value(2, f"{prefix}_EMAIL_ID")),
+    }
+
+
+# Row index -> cells written in that row
+FORM_ROWS: Dict[int, Tuple[CellSpec, ...]] = {
+    # DETAILS OF PARTIES header
+    0: (label(0, "DETAILS OF PARTIES:"),),
+    # Applicant name row
+    1: (number(0, "1"), label(1, "Name of\nApplicant"), value(2, "APPLICANT_NAME")),
+    # Applicant address subheading
+    2: (label(1, "Address and contact details of Applicant"),),
+    # Applicant contact block (address, phone, mobile, email)
+    **contact_rows(3, "APPLICANT", Inches(0.28), serial="1"),
+    # Opposite party section header
+    7: (
+        number(0, "2"),
+        label(1, "Name, Address and Contact details of Opposite Party:"),
+    ),
+    # Defendant address subheading
+    8: (label(1, "Address and contact details of Defendant/s"),),
+    # Defendant name row
+    9: (label(1, "Name"), value(2, "DEFENDANT_NAME")),
+    # Defendant contact block
+    **contact_rows(10, "DEFENDANT", Inches(0.68)),
+    # DETAILS OF DISPUTE header
+    14: (label(0, "DETAILS OF DISPUTE:"),),
+    # Dispute title line
+    15: (
+        label(
+            0,
+            "THE COMM. COURTS (PRE-INSTITUTION………SETTLEMENT) RULES,2018",
+            align="center",
+            underline=True,
+        ),
+    ),
+    # Nature of dispute description
+    16: (
+        label(
+            1,
+            "Nature of disputes as per section 2(1)(c) of the Commercial Courts Act, 2015 (4 of 2016):",
+        ),
+    ),
+}
@@ -1,4 +1,43 @@
-class FormValues:
+import hashlib
+import json
+from operator import itemgetter
+from typing import Any, Dict, Mapping, Sequence, Tuple, Union
+
+# Field names of one form submission, in form order
+FORM_FIELDS = (
+    "APPLICANT_NAME",
+    "APPLICANT_BRANCH_ADDRESS",
+    "APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS",
+    "APPLICANT_PHONE",
+    "APPLICANT_MOBILE",
+    "APPLICANT_EMAIL_ID",
+    "DEFENDANT_NAME",
+    "DEFENDANT_BRANCH_ADDRESS",
+    "DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS",
+    "DEFENDANT_PHONE",
+    "DEFENDANT_MOBILE",
+    "DEFENDANT_EMAIL_ID",
+)
+
+# Written in place of an empty address so the form can be filled in by hand
+PLACEHOLDER = "________________"
+
+PLACEHOLDER_FIELDS = frozenset(
+    (
+        "APPLICANT_BRANCH_ADDRESS",
+        "APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS",
+        "DEFENDANT_BRANCH_ADDRESS",
+        "DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS",
+    )
+)
+
+# Positions of `PLACEHOLDER_FIELDS`, resolved once for the constructors
+_PLACEHOLDER_INDEXES = tuple(
+    idx for idx, name in enumerate(FORM_FIELDS) if name in PLACEHOLDER_FIELDS
+)
+
+
+class FormValues(tuple):
     """
     Container for all per-user data required to populate the mediation DOCX form.
 
@@ -6,6 +45,13 @@ class FormValues:
     passed explicitly to dataset builders (e.g. `build_rows_dataset`) to render
     the document.
 
+    Like a named tuple, an instance is a tuple of the 12 values in
+    `FORM_FIELDS` order with read-only attribute access, so it is immutable,
+    compact (no per-instance ``__dict__``) and hashable; equal submissions can
+    be used directly as dict or cache keys. Values are stored as strings:
+    ``None`` becomes ``""``, other types are converted with `str`, and empty
+    addresses become `PLACEHOLDER`.
+
     :param APPLICANT_NAME: Full name of the applicant.
     :param APPLICANT_BRANCH_ADDRESS: Registered / branch address of the applicant.
     :param APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS: Correspondence address of the applicant.
@@ -21,8 +67,10 @@ class FormValues:
     :param DEFENDANT_EMAIL_ID: Email address of the defendant.
     """
 
-    def __init__(
-        self,
+    __slots__ = ()
+
+    def __new__(
+        cls,
         *,
         # Applicant
         APPLICANT_NAME="",
@@ -39,41 +87,137 @@ class FormValues:
         DEFENDANT_MOBILE="",
         DEFENDANT_EMAIL_ID="",
     ):
-        placeholder = "________________"
-        # applicant
-        self.APPLICANT_NAME = APPLICANT_NAME
-
-        self.APPLICANT_BRANCH_ADDRESS = (
-            APPLICANT_BRANCH_ADDRESS
-            if APPLICANT_BRANCH_ADDRESS and APPLICANT_BRANCH_ADDRESS != ""
-            else placeholder
-        )
-        self.APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS = (
-            APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS
-            if APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS
-            and APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS != ""
-            else placeholder
+        return _new(
+            cls,
+            (
+                APPLICANT_NAME,
+                APPLICANT_BRANCH_ADDRESS,
+                APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS,
+                APPLICANT_PHONE,
+                APPLICANT_MOBILE,
+                APPLICANT_EMAIL_ID,
+                DEFENDANT_NAME,
+                DEFENDANT_BRANCH_ADDRESS,
+                DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS,
+                DEFENDANT_PHONE,
+                DEFENDANT_MOBILE,
+                DEFENDANT_EMAIL_ID,
+            ),
         )
 
-        self.APPLICANT_PHONE = APPLICANT_PHONE
-        self.APPLICANT_MOBILE = APPLICANT_MOBILE
-        self.APPLICANT_EMAIL_ID = APPLICANT_EMAIL_ID
+    # applicant
+    APPLICANT_NAME = property(itemgetter(0))
+    APPLICANT_BRANCH_ADDRESS = property(itemgetter(1))
+    APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS = property(itemgetter(2))
+    APPLICANT_PHONE = property(itemgetter(3))
+    APPLICANT_MOBILE = property(itemgetter(4))
+    APPLICANT_EMAIL_ID = property(itemgetter(5))
 
-        # defendant
-        self.DEFENDANT_NAME = DEFENDANT_NAME
+    # defendant
+    DEFENDANT_NAME = property(itemgetter(6))
+    DEFENDANT_BRANCH_ADDRESS = property(itemgetter(7))
+    DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS = property(itemgetter(8))
+    DEFENDANT_PHONE = property(itemgetter(9))
+    DEFENDANT_MOBILE = property(itemgetter(10))
+    DEFENDANT_EMAIL_ID = property(itemgetter(11))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], *, strict: bool = False) -> "FormValues":
+        """
+        Build `FormValues` from a mapping of field names, e.g. a parsed JSON body.
+
+        Missing fields are empty; unknown keys are ignored unless `strict`.
+
+        :param data: Mapping of field name to value.
+        :param strict: Raise on keys that are not form fields.
+
+        :raises TypeError: If `strict` and `data` has unknown keys.
+        """
+        if strict:
+            unknown = set(data) - set(FORM_FIELDS)
+            if unknown:
+                raise TypeError(f"Unknown form fields: {sorted(unknown)}")
+
+        try:
+            values = _get_fields(data)
+        except KeyError:
+            get = data.get
+            values = [get(name, "") for name in FORM_FIELDS]
+        return _new(cls, values)
+
+    @classmethod
+    def from_json(cls, text: Union[str, bytes], *, strict: bool = False) -> "FormValues":
+        """
+        Build `FormValues` from a JSON object, see `from_dict`.
+
+        :raises ValueError: If `text` is not valid JSON or not a JSON object.
+        """
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError("Form values must be a JSON object")
+        return cls.from_dict(data, strict=strict)
+
+    def to_dict(self) -> Dict[str, str]:
+        """Field name -> value, in form order."""
+        return dict(zip(FORM_FIELDS, self))
+
+    def replace(self, **changes: Any) -> "FormValues":
+        """Return a copy with some fields changed."""
+        data = self.to_dict()
+        data.update(changes)
+        return type(self).from_dict(data, strict=True)
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Stable SHA-256 hex digest of the values.
+
+        Unlike `hash`, it is the same across processes and Python versions,
+        so it can key on-disk caches and deduplicate resubmissions.
+        """
+        payload = json.dumps(self, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FormValues):
+            return NotImplemented
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        if not isinstance(other, FormValues):
+            return NotImplemented
+        return tuple.__ne__(self, other)
+
+    __hash__ = tuple.__hash__
+
+    def __reduce__(self):
+        return _restore, (tuple(self),)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(FORM_FIELDS, self))
+        return f"{type(self).__name__}({fields})"
+
+
+def _new(cls, values: Sequence[Any]) -> FormValues:
+    """Normalize `values` (in `FORM_FIELDS` order) and build the tuple."""
+    # the common case (all strings, addresses filled in) is checked in C:
+    # str.join raises TypeError as soon as a value is not a string
+    try:
+        "".join(values)
+    except TypeError:
+        values = ["" if value is None else str(value) for value in values]
+    if not all(_get_addresses(values)):
+        values = list(values)
+        for idx in _PLACEHOLDER_INDEXES:
+            if not values[idx]:
+                values[idx] = PLACEHOLDER
+    return tuple.__new__(cls, values)
+
+
+def _restore(values: Tuple[str, ...]) -> FormValues:
+    """Unpickle a `FormValues`; values are already normalized."""
+    return tuple.__new__(FormValues, values)
 
-        self.DEFENDANT_BRANCH_ADDRESS = (
-            DEFENDANT_BRANCH_ADDRESS
-            if DEFENDANT_BRANCH_ADDRESS and DEFENDANT_BRANCH_ADDRESS != ""
-            else placeholder
-        )
-        self.DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS = (
-            DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS
-            if DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS
-            and DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS != ""
-            else placeholder
-        )
 
-        self.DEFENDANT_PHONE = DEFENDANT_PHONE
-        self.DEFENDANT_MOBILE = DEFENDANT_MOBILE
-        self.DEFENDANT_EMAIL_ID = DEFENDANT_EMAIL_ID
+_get_fields = itemgetter(*FORM_FIELDS)
+_get_addresses = itemgetter(*_PLACEHOLDER_INDEXES)
@@ -0,0 +1,345 @@
+import csv
+import os
+from typing import IO, Any, Dict, Iterator, List, Mapping, Sequence, Union
+
+from docx_meditation_form.dataset.form_values import (
+    FORM_FIELDS,
+    PLACEHOLDER,
+    PLACEHOLDER_FIELDS,
+    FormValues,
+    _restore,
+)
+
+
+class FormValuesBatch:
+    """
+    Column-oriented collection of many form submissions.
+
+    Each field is stored as one list of strings (`FORM_FIELDS` order), and the
+    normalization `FormValues` applies per row (``None`` -> ``""``, other
+    types -> `str`, empty addresses -> `PLACEHOLDER`) is applied to whole
+    columns when the batch is built. A column missing from the source is a
+    single repeated value.
+
+    Indexing gives `FormValuesRow` views and slicing gives batches that share
+    the parent's columns, so splitting a batch into per-worker chunks copies
+    nothing. A pickled batch (e.g. sent to a worker process) only carries the
+    rows of its slice.
+
+    .. code-block:: python
+
+        batch = FormValuesBatch.from_csv("cases.csv")
+        for chunk in batch.chunks(5000):
+            for result in render_many(chunk, "out/"):
+                ...
+
+    :param columns: Field name -> column of values; every column must have
+        the same length. Missing fields are empty.
+    :param strict: Raise on keys that are not form fields.
+    :param dedupe: Store repeated values of a column once. Costs a dict
+        lookup per value and saves memory on repetitive columns (e.g. the
+        same defendant across many cases).
+
+    :raises TypeError: If `strict` and `columns` has unknown keys.
+    :raises ValueError: If the columns do not have the same length.
+    """
+
+    __slots__ = ("_columns", "_start", "_stop")
+
+    def __init__(
+        self,
+        columns: Mapping[str, Sequence[Any]],
+        *,
+        strict: bool = False,
+        dedupe: bool = False,
+    ) -> None:
+        if strict:
+            unknown = set(columns) - set(FORM_FIELDS)
+            if unknown:
+                raise TypeError(f"Unknown form fields: {sorted(unknown)}")
+
+        given = {name: _to_list(columns[name]) for name in FORM_FIELDS if name in columns}
+        lengths = {len(column) for column in given.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        size = lengths.pop() if lengths else 0
+
+        self._columns = tuple(
+            _normalize(name, given[name], dedupe) if name in given else _missing(name, size)
+            for name in FORM_FIELDS
+        )
+        self._start = 0
+        self._stop = size
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Mapping[str, Sequence[Any]],
+        *,
+        strict: bool = False,
+        dedupe: bool = False,
+    ) -> "FormValuesBatch":
+        """
+        Build a batch from columns, e.g. ``pyarrow.Table.to_pydict()`` or
+        ``DataFrame.to_dict("list")``.
+
+        Columns may be any sequence; objects with ``to_pylist`` (Arrow
+        arrays) or ``tolist`` (NumPy arrays, pandas Series) are converted with
+        it. See the class documentation for the parameters.
+        """
+        return cls(columns, strict=strict, dedupe=dedupe)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Union[FormValues, Mapping[str, Any]]]) -> "FormValuesBatch":
+        """
+        Build a batch from `FormValues` or mappings of field names.
+
+        :param records: Rows; missing fields are empty, unknown keys ignored.
+        """
+        columns: Dict[str, List[Any]] = {name: [] for name in FORM_FIELDS}
+        for record in records:
+            if not isinstance(record, Mapping):
+                record = dict(zip(FORM_FIELDS, record))
+            for name, column in columns.items():
+                column.append(record.get(name, ""))
+        return cls(columns)
+
+    @classmethod
+    def from_csv(
+        cls,
+        source: Union[str, os.PathLike, IO[str]],
+        *,
+        strict: bool = False,
+        dedupe: bool = False,
+        **fmtparams: Any,
+    ) -> "FormValuesBatch":
+        """
+        Read a CSV file whose header row names the form fields.
+
+        The rows are read once and transposed into one list per form field;
+        rows shorter than the header are padded with empty values and blank
+        lines are skipped, like `csv.DictReader`.
+
+        :param source: File path or text stream opened with ``newline=""``.
+        :param strict: Raise on header names that are not form fields.
+        :param dedupe: See the class documentation.
+        :param fmtparams: Passed to `csv.reader` (e.g. ``delimiter=";"``).
+
+        :raises TypeError: If `strict` and the header has unknown names.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, newline="", encoding="utf-8") as fh:
+                return cls.from_csv(fh, strict=strict, dedupe=dedupe, **fmtparams)
+
+        reader = csv.reader(source, **fmtparams)
+        header = next(reader, [])
+        if strict:
+            unknown = set(header) - set(FORM_FIELDS)
+            if unknown:
+                raise TypeError(f"Unknown form fields: {sorted(unknown)}")
+
+        width = len(header)
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            rows.append(row)
+
+        columns = {
+            name: [row[position] for row in rows]
+            for position, name in enumerate(header)
+            if name in FORM_FIELDS
+        }
+        if not columns:
+            # no form field in the header: every row is an empty form
+            columns = {FORM_FIELDS[0]: [""] * len(rows)}
+        return cls(columns, dedupe=dedupe)
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __iter__(self) -> Iterator["FormValuesRow"]:
+        columns = self._columns
+        for index in range(self._start, self._stop):
+            yield FormValuesRow(columns, index)
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                view = FormValuesBatch.__new__(FormValuesBatch)
+                view._columns = self._columns
+                view._start = self._start + start
+                view._stop = self._start + max(start, stop)
+                return view
+            return _from_normalized(
+                [column[self._start : self._stop][key] for column in self._columns]
+            )
+
+        size = len(self)
+        if key < 0:
+            key += size
+        if not 0 <= key < size:
+            raise IndexError("FormValuesBatch index out of range")
+        return FormValuesRow(self._columns, self._start + key)
+
+    def column(self, name: str) -> List[str]:
+        """
+        Normalized values of field `name` for the rows of this batch.
+
+        :raises KeyError: If `name` is not a form field.
+        """
+        try:
+            position = FORM_FIELDS.index(name)
+        except ValueError:
+            raise KeyError(name) from None
+        return self._columns[position][self._start : self._stop]
+
+    def chunks(self, size: int) -> Iterator["FormValuesBatch"]:
+        """
+        Split into consecutive batches of at most `size` rows, without copying.
+
+        :raises ValueError: If `size` is not positive.
+        """
+        if size < 1:
+            raise ValueError("Chunk size must be positive")
+        for start in range(0, len(self), size):
+            yield self[start : start + size]
+
+    def split(self, parts: int) -> List["FormValuesBatch"]:
+        """
+        Split into `parts` consecutive batches whose sizes differ by at most
+        one row, e.g. one per worker.
+
+        :raises ValueError: If `parts` is not positive.
+        """
+        if parts < 1:
+            raise ValueError("Number of parts must be positive")
+        size, extra = divmod(len(self), parts)
+        out = []
+        start = 0
+        for part in range(parts):
+            stop = start + size + (part < extra)
+            out.append(self[start:stop])
+            start = stop
+        return out
+
+    def to_values(self) -> List[FormValues]:
+        """Materialize every row as `FormValues`."""
+        columns = [column[self._start : self._stop] for column in self._columns]
+        return [_restore(values) for values in zip(*columns)]
+
+    def __reduce__(self):
+        return _from_normalized, ([column[self._start : self._stop] for column in self._columns],)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} rows)"
+
+
+class FormValuesRow:
+    """
+    Read-only view of one row of a `FormValuesBatch`.
+
+    Has the same field attributes as `FormValues` (one property per
+    `FORM_FIELDS` entry) and iterates over the 12 values like it, so it can
+    be rendered wherever `FormValues` can; it only stores a reference to the
+    batch columns and its row number. Equal to, and hashes like, the
+    `FormValues` with the same values, and pickles as that `FormValues`.
+    """
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: Sequence[List[str]], index: int) -> None:
+        self._columns = columns
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(FORM_FIELDS)
+
+    def __iter__(self) -> Iterator[str]:
+        index = self._index
+        for column in self._columns:
+            yield column[index]
+
+    def to_values(self) -> FormValues:
+        """The row as `FormValues`."""
+        index = self._index
+        return _restore(tuple([column[index] for column in self._columns]))
+
+    def to_dict(self) -> Dict[str, str]:
+        """Field name -> value, in form order."""
+        index = self._index
+        return {name: column[index] for name, column in zip(FORM_FIELDS, self._columns)}
+
+    @property
+    def content_hash(self) -> str:
+        """See `FormValues.content_hash`."""
+        return self.to_values().content_hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FormValuesRow):
+            other = other.to_values()
+        if not isinstance(other, FormValues):
+            return NotImplemented
+        return tuple.__eq__(self.to_values(), other)
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self) -> int:
+        return hash(self.to_values())
+
+    def __reduce__(self):
+        return self.to_values().__reduce__()
+
+    def __repr__(self) -> str:
+        return repr(self.to_values()).replace("FormValues(", f"{type(self).__name__}(", 1)
+
+
+def _field(position: int) -> property:
+    """Read-only `FormValuesRow` attribute for the field at `position`."""
+    return property(lambda self: self._columns[position][self._index])
+
+
+for _position, _name in enumerate(FORM_FIELDS):
+    setattr(FormValuesRow, _name, _field(_position))
+del _position, _name
+
+
+def _from_normalized(columns: List[List[str]]) -> FormValuesBatch:
+    """Build (or unpickle) a batch from columns that are already normalized."""
+    batch = FormValuesBatch.__new__(FormValuesBatch)
+    batch._columns = tuple(columns)
+    batch._start = 0
+    batch._stop = len(columns[0])
+    return batch
+
+
+def _to_list(column: Any) -> list:
+    for method in ("to_pylist", "tolist"):
+        convert = getattr(column, method, None)
+        if convert is not None:
+            return convert()
+    return list(column)
+
+
+def _normalize(name: str, column: list, dedupe: bool = False) -> List[str]:
+    """`FormValues` normalization of one whole column."""
+    # str.join raises TypeError as soon as a value is not a string
+    try:
+        "".join(column)
+    except TypeError:
+        column = ["" if value is None else str(value) for value in column]
+    if name in PLACEHOLDER_FIELDS and not all(column):
+        column = [value or PLACEHOLDER for value in column]
+    if dedupe:
+        seen: Dict[str, str] = {}
+        column = [seen.setdefault(value, value) for value in column]
+    return column
+
+
+def _missing(name: str, size: int) -> List[str]:
+    return [PLACEHOLDER if name in PLACEHOLDER_FIELDS else ""] * size
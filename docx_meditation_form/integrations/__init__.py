@@ -1,3 +1,59 @@
-from .google_drive import GoogleDriveUploader
+"""
+Upload integrations.
 
-__all__ = ["GoogleDriveUploader"]
+The Google API client stack is heavy to import, so the uploaders are loaded
+lazily on first attribute access; ``import docx_meditation_form`` alone never
+imports ``googleapiclient`` or ``aiohttp``.
+"""
+
+import importlib
+
+# public name -> submodule defining it
+_LAZY_EXPORTS = {
+    "GoogleDriveUploader": ".google_drive",
+    "DriveClientPool": ".client_pool",
+    "AsyncGoogleDriveUploader": ".async_drive",
+    "UploadScheduler": ".upload_scheduler",
+    "RetryPolicy": ".upload_scheduler",
+    "PermissionBatcher": ".upload_scheduler",
+}
+
+# public name -> optional extra providing its dependencies
+_EXTRAS = {
+    "GoogleDriveUploader": "google",
+    "DriveClientPool": "google",
+    "AsyncGoogleDriveUploader": "async",
+    "UploadScheduler": "google",
+    "RetryPolicy": "google",
+    "PermissionBatcher": "google",
+}
+
+__all__ = [
+    "GoogleDriveUploader",
+    "DriveClientPool",
+    "AsyncGoogleDriveUploader",
+    "UploadScheduler",
+    "RetryPolicy",
+    "PermissionBatcher",
+]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+    except ImportError as exc:
+        raise ImportError(
+            f"{name} requires optional dependencies: "
+            f"pip install 'docx_meditation_form[{_EXTRAS[name]}]'"
+        ) from exc
+
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
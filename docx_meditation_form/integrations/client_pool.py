@@ -0,0 +1,101 @@
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import google_auth_httplib2
+import httplib2
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+from docx_meditation_form.integrations.google_drive import (
+    GoogleDriveUploader,
+    load_credentials,
+)
+
+_discovery_lock = threading.Lock()
+_discovery_doc: Optional[Dict[str, Any]] = None
+
+
+def drive_discovery_document() -> Dict[str, Any]:
+    """Return the parsed Drive v3 discovery document, loaded once per process."""
+    global _discovery_doc
+    with _discovery_lock:
+        if _discovery_doc is None:
+            _discovery_doc = json.loads(get_static_doc("drive", "v3"))
+        return _discovery_doc
+
+
+class DriveClientPool:
+    """
+    Thread-safe pool of ready-to-use `GoogleDriveUploader` clients.
+
+    The credentials file is read once and the Drive discovery document is
+    parsed once. Each pooled client owns its own ``httplib2.Http`` (which is
+    not thread-safe), so its HTTP connections stay open between uploads
+    while the client sits in the pool.
+
+    .. code-block:: python
+
+        pool = DriveClientPool("token.json")
+
+        with pool.client() as uploader:
+            file_id = uploader.upload_file(data, name="form.docx")
+
+    :param credentials_json_path: Path to the credentials JSON file.
+    :param max_idle: Maximum number of idle clients kept for reuse.
+    :param base_url: Drive API root (uploads and batch requests included);
+        point it at a local fake Drive server for testing and benchmarking.
+
+    :raises FileNotFoundError: If the credentials file does not exist.
+    :raises ValueError: If the credentials format is not supported.
+    """
+
+    def __init__(
+        self,
+        credentials_json_path: str,
+        *,
+        max_idle: int = 8,
+        base_url: Optional[str] = None,
+    ) -> None:
+        self.creds = load_credentials(credentials_json_path)
+        self.max_idle = max_idle
+        self.discovery = drive_discovery_document()
+        if base_url is not None:
+            self.discovery = {**self.discovery, "rootUrl": base_url.rstrip("/") + "/"}
+        self._idle: List[GoogleDriveUploader] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self) -> GoogleDriveUploader:
+        """Take a client from the pool, building a new one if none is idle."""
+        with self._lock:
+            if self._idle:
+                self.hits += 1
+                return self._idle.pop()
+            self.misses += 1
+
+        http = google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http())
+        service = build_from_document(self.discovery, http=http)
+        return GoogleDriveUploader.from_service(self.creds, service)
+
+    def release(self, uploader: GoogleDriveUploader) -> None:
+        """Return a client to the pool; it is dropped if the pool is full."""
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(uploader)
+
+    @contextmanager
+    def client(self) -> Iterator[GoogleDriveUploader]:
+        """Borrow a client for the duration of a ``with`` block."""
+        uploader = self.acquire()
+        try:
+            yield uploader
+        finally:
+            self.release(uploader)
+
+    def stats(self) -> Dict[str, int]:
+        """Pool counters: ``hits``, ``misses`` and currently ``idle`` clients."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "idle": len(self._idle)}
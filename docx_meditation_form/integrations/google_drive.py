@@ -1,14 +1,70 @@
 import json
+import os
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import IO, Any, Dict, Iterable, Optional, Tuple, Union
 
 from google.oauth2.credentials import Credentials as OAuthCredentials
 from google.oauth2.service_account import Credentials as SACredentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
+
+from docx_meditation_form.core.instrumentation import timed
+from docx_meditation_form.integrations.upload_scheduler import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_RETRY,
+    RetryPolicy,
+    execute_batch,
+    resumable_upload,
+)
 
 SCOPES = ["https://www.googleapis.com/auth/drive.file"]
 
+DOCX_MIMETYPE = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+)
+
+
+def load_credentials(credentials_json_path: str):
+    """
+    Load Google credentials from a Service Account or OAuth ``token.json`` file.
+
+    :param credentials_json_path: Path to the credentials JSON file.
+
+    :return: `google.oauth2` credentials scoped to `SCOPES`.
+
+    :raises FileNotFoundError: If the credentials file does not exist.
+    :raises ValueError: If the credentials format is not supported.
+    """
+    path = Path(credentials_json_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Credentials file not found: {path}")
+
+    data: Dict[str, Any] = json.loads(path.read_text())
+
+    # Service Account credentials
+    if data.get("type") == "service_account":
+        return SACredentials.from_service_account_info(
+            data,
+            scopes=SCOPES,
+        )
+
+    # OAuth credentials
+    if "refresh_token" in data:
+        return OAuthCredentials(
+            token=data.get("access_token"),
+            refresh_token=data.get("refresh_token"),
+            token_uri=data.get("token_uri", "https://oauth2.googleapis.com/token"),
+            client_id=data.get("client_id"),
+            client_secret=data.get("client_secret"),
+            scopes=SCOPES,
+        )
+
+    raise ValueError(
+        "Unrecognized credentials JSON format. "
+        "Expected service account or OAuth token JSON."
+    )
+
 
 class GoogleDriveUploader:
     """
@@ -29,88 +85,173 @@ class GoogleDriveUploader:
     """
 
     def __init__(self, credentials_json_path: str) -> None:
-        path = Path(credentials_json_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Credentials file not found: {path}")
-
-        data: Dict[str, Any] = json.loads(path.read_text())
-
-        # Service Account credentials
-        if data.get("type") == "service_account":
-            self.creds = SACredentials.from_service_account_info(
-                data,
-                scopes=SCOPES,
-            )
+        self.creds = load_credentials(credentials_json_path)
+        self.service = build("drive", "v3", credentials=self.creds)
 
-        # OAuth credentials
-        elif "refresh_token" in data:
-            self.creds = OAuthCredentials(
-                token=data.get("access_token"),
-                refresh_token=data.get("refresh_token"),
-                token_uri=data.get("token_uri", "https://oauth2.googleapis.com/token"),
-                client_id=data.get("client_id"),
-                client_secret=data.get("client_secret"),
-                scopes=SCOPES,
-            )
+    @classmethod
+    def from_service(cls, creds, service) -> "GoogleDriveUploader":
+        """
+        Wrap already loaded credentials and a built Drive service.
 
-        else:
-            raise ValueError(
-                "Unrecognized credentials JSON format. "
-                "Expected service account or OAuth token JSON."
-            )
+        Used by `DriveClientPool` to avoid re-reading the credentials file and
+        rebuilding the service for every uploader.
 
-        self.service = build("drive", "v3", credentials=self.creds)
+        :param creds: Credentials returned by `load_credentials`.
+        :param service: Drive v3 ``googleapiclient`` resource.
+        """
+        uploader = cls.__new__(cls)
+        uploader.creds = creds
+        uploader.service = service
+        return uploader
 
+    @timed("drive.upload")
     def upload_file(
         self,
-        file_path: str,
+        source: Union[str, os.PathLike, bytes, IO[bytes]],
         *,
+        name: Optional[str] = None,
         drive_folder_id: Optional[str] = None,
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
     ) -> str:
         """
         Upload a file to Google Drive.
 
-        :param file_path: Local path to the file to upload.
-        :type file_path: ``str``
+        The upload is resumable and sent in `chunksize` pieces; a chunk that
+        fails with a rate-limit, server or connection error is retried
+        according to `retry`, resuming the same upload session.
+
+        :param source: Local path of the file, or the file content as ``bytes``
+            or a readable binary stream (e.g. `io.BytesIO`).
+        :type source: ``str``, ``os.PathLike``, ``bytes`` or binary file object
+
+        :param name: Drive file name. Defaults to the file name for paths and
+            is required for in-memory sources.
+        :type name: ``str`` or ``None``
 
         :param drive_folder_id: Target Drive folder ID. If omitted, uploads to root.
         :type drive_folder_id: ``str`` or ``None``
 
+        :param chunksize: Upload chunk size in bytes, a multiple of 256 KiB.
+        :type chunksize: ``int``
+
+        :param retry: Retry policy per chunk; ``None`` disables retries.
+        :type retry: `RetryPolicy` or ``None``
+
         :return: The Google Drive file ID of the uploaded file.
         :rtype: ``str``
+
+        :raises FileNotFoundError: If `source` is a path that does not exist.
+        :raises ValueError: If `name` is missing for an in-memory source.
+        :raises googleapiclient.errors.HttpError: If the upload fails and
+            retries are exhausted.
         """
-        path = Path(file_path)
+        def new_request():
+            return self.upload_request(
+                source, name=name, drive_folder_id=drive_folder_id, chunksize=chunksize
+            )
 
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {path}")
+        return resumable_upload(new_request(), retry=retry, restart=new_request)["id"]
+
+    def upload_request(
+        self,
+        source: Union[str, os.PathLike, bytes, IO[bytes]],
+        *,
+        name: Optional[str] = None,
+        drive_folder_id: Optional[str] = None,
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Build the resumable ``files.create`` request `upload_file` runs,
+        without sending anything.
 
-        metadata: Dict[str, Any] = {"name": path.name}
+        Used by `UploadScheduler` to pace and retry the chunks itself. See
+        `upload_file` for the parameters.
+
+        :return: ``googleapiclient.http.HttpRequest``; complete it with
+            `resumable_upload`.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            name = name or Path(source).name
+        elif not name:
+            raise ValueError("A file name is required when uploading bytes or a stream")
+
+        media = _media(source, chunksize)
+        metadata: Dict[str, Any] = {"name": name}
 
         if drive_folder_id:
             metadata["parents"] = [drive_folder_id]
 
-        media = MediaFileUpload(
-            filename=str(path),
-            mimetype=(
-                "application/vnd.openxmlformats-officedocument."
-                "wordprocessingml.document"
-            ),
-            resumable=True,
+        return self.service.files().create(
+            body=metadata,
+            media_body=media,
+            fields="id",
         )
 
-        response = (
-            self.service.files()
-            .create(
-                body=metadata,
-                media_body=media,
-                fields="id",
-            )
-            .execute()
-        )
+    @timed("drive.update")
+    def update_file(
+        self,
+        file_id: str,
+        source: Union[str, os.PathLike, bytes, IO[bytes]],
+        *,
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+    ) -> str:
+        """
+        Replace the content of an existing Drive file, e.g. with a form
+        amended by `FormPatcher`.
 
-        return response["id"]
+        The file keeps its ID, name, parents, permissions and links, so
+        nothing has to be shared again. The upload is resumable and retried
+        like `upload_file`.
 
-    def make_public(self, file_id: str) -> None:
+        :param file_id: Google Drive file ID.
+        :type file_id: ``str``
+
+        :param source: Local path of the new content, or the content as
+            ``bytes`` or a readable binary stream.
+        :type source: ``str``, ``os.PathLike``, ``bytes`` or binary file object
+
+        :param chunksize: Upload chunk size in bytes, a multiple of 256 KiB.
+        :type chunksize: ``int``
+
+        :param retry: Retry policy per chunk; ``None`` disables retries.
+        :type retry: `RetryPolicy` or ``None``
+
+        :return: The Google Drive file ID (`file_id`).
+        :rtype: ``str``
+
+        :raises FileNotFoundError: If `source` is a path that does not exist.
+        :raises googleapiclient.errors.HttpError: If the update fails and
+            retries are exhausted.
+        """
+        def new_request():
+            return self.update_request(file_id, source, chunksize=chunksize)
+
+        return resumable_upload(new_request(), retry=retry, restart=new_request)["id"]
+
+    def update_request(
+        self,
+        file_id: str,
+        source: Union[str, os.PathLike, bytes, IO[bytes]],
+        *,
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Build the resumable ``files.update`` request `update_file` runs,
+        without sending anything. See `update_file` for the parameters.
+
+        :return: ``googleapiclient.http.HttpRequest``; complete it with
+            `resumable_upload`.
+        """
+        return self.service.files().update(
+            fileId=file_id,
+            media_body=_media(source, chunksize),
+            fields="id",
+        )
+
+    @timed("drive.make_public")
+    def make_public(self, file_id: str, *, retry: Optional[RetryPolicy] = DEFAULT_RETRY) -> None:
         """
         Make a Google Drive file publicly accessible.
 
@@ -120,13 +261,112 @@ class GoogleDriveUploader:
         :param file_id: Google Drive file ID.
         :type file_id: FileId to make public.
 
+        :param retry: Retry policy for rate-limit, server and connection
+            errors; ``None`` disables retries.
+        :type retry: `RetryPolicy` or ``None``
+
         :raises googleapiclient.errors.HttpError:
             If the permission change request fails.
         """
-        self.service.permissions().create(
+        request = self.public_permission_request(file_id)
+        if retry is None:
+            request.execute()
+        else:
+            retry.call(request.execute)
+
+    @timed("drive.make_public_many")
+    def make_public_many(
+        self,
+        file_ids: Iterable[str],
+        *,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+    ) -> Dict[str, Exception]:
+        """
+        Make many files (or folders) publicly accessible, with Drive batch
+        requests of up to 100 permission grants each instead of one round
+        trip per file.
+
+        :param file_ids: Google Drive file IDs.
+        :type file_ids: iterable of ``str``
+
+        :param retry: Retry policy for rate-limit, server and connection
+            errors; ``None`` disables retries.
+        :type retry: `RetryPolicy` or ``None``
+
+        :return: File ID -> exception for the grants that failed; empty if
+            every file was shared.
+        :rtype: ``dict``
+        """
+        requests = {file_id: self.public_permission_request(file_id) for file_id in file_ids}
+        _, errors = execute_batch(self.service, requests, retry=retry)
+        return errors
+
+    @timed("drive.get_files")
+    def get_files(
+        self,
+        file_ids: Iterable[str],
+        *,
+        fields: str = "id, name, webViewLink",
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Exception]]:
+        """
+        Fetch the metadata of many files with Drive batch requests.
+
+        :param file_ids: Google Drive file IDs.
+        :type file_ids: iterable of ``str``
+
+        :param fields: Drive ``fields`` selector for each file.
+        :type fields: ``str``
+
+        :param retry: Retry policy; ``None`` disables retries.
+        :type retry: `RetryPolicy` or ``None``
+
+        :return: ``(metadata, errors)``: file ID -> metadata for the files
+            found and file ID -> exception for the others.
+        :rtype: ``tuple``
+        """
+        requests = {
+            file_id: self.service.files().get(fileId=file_id, fields=fields)
+            for file_id in file_ids
+        }
+        return execute_batch(self.service, requests, retry=retry)
+
+    def public_permission_request(self, file_id: str):
+        """
+        Build the unsent ``permissions.create`` request that `make_public`
+        runs, e.g. to add it to a batch.
+
+        :param file_id: Google Drive file ID.
+        :return: ``googleapiclient.http.HttpRequest``.
+        """
+        return self.service.permissions().create(
             fileId=file_id,
             body={
                 "type": "anyone",
                 "role": "reader",
             },
-        ).execute()
+        )
+
+
+def _media(source: Union[str, os.PathLike, bytes, IO[bytes]], chunksize: int):
+    """Resumable upload body for a path, ``bytes`` or binary stream."""
+    if isinstance(source, (str, os.PathLike)):
+        path = Path(source)
+
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+
+        return MediaFileUpload(
+            filename=str(path),
+            mimetype=DOCX_MIMETYPE,
+            chunksize=chunksize,
+            resumable=True,
+        )
+
+    stream = BytesIO(source) if isinstance(source, bytes) else source
+    return MediaIoBaseUpload(
+        stream,
+        mimetype=DOCX_MIMETYPE,
+        chunksize=chunksize,
+        resumable=True,
+    )
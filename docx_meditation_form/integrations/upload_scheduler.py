@@ -0,0 +1,671 @@
+"""
+Quota-aware scheduling of Drive uploads.
+
+Drive enforces per-user and per-project request quotas and answers bursts with
+``403 rateLimitExceeded`` / ``userRateLimitExceeded`` or ``429``, and
+occasionally fails with a 5xx. `UploadScheduler` keeps a batch within quota
+and survives those errors:
+
+- a `TokenBucket` spaces requests (every resumable chunk and permission call
+  is one request) to a sustained rate with a bounded burst;
+- `AdaptiveConcurrency` limits uploads in flight, halving the limit when Drive
+  throttles and growing it back by one per window of successes (AIMD);
+- a `RetryPolicy` retries throttling, server and transport errors with capped
+  exponential backoff and full jitter;
+- uploads are resumable and sent in `chunksize` pieces; a failed chunk is
+  retried within the same upload session, which resumes from the last byte
+  Drive acknowledged instead of starting over, and an expired session is
+  restarted with a fresh request;
+- permission grants are sent as Drive batch requests of up to `BATCH_LIMIT`
+  calls (`execute_batch`, `PermissionBatcher`) instead of one round trip per
+  file.
+
+.. code-block:: python
+
+    scheduler = UploadScheduler(DriveClientPool("token.json"), rate=10, concurrency=4)
+    file_id = scheduler.upload("form.docx", drive_folder_id=folder_id)
+    scheduler.make_public(file_id)
+    print(scheduler.summary())
+
+    # or share many files in a few batch requests
+    failed = scheduler.make_public_many(file_ids)
+"""
+
+import json
+import random
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from docx_meditation_form.core import instrumentation
+
+T = TypeVar("T")
+
+# Resumable upload chunks must be a multiple of 256 KiB
+CHUNK_ALIGNMENT = 256 * 1024
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# `error_kind` results
+THROTTLED = "throttled"
+SERVER_ERROR = "server_error"
+TRANSPORT_ERROR = "transport_error"
+SESSION_EXPIRED = "session_expired"
+
+# Most calls Drive accepts in one batch request
+BATCH_LIMIT = 100
+
+RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+
+_TRANSPORT_ERRORS = (ConnectionError, TimeoutError, socket.timeout, httplib2.HttpLib2Error)
+
+
+def error_kind(exc: BaseException) -> Optional[str]:
+    """
+    Classify an exception raised by a Drive request.
+
+    :return: `THROTTLED` for 429 and rate-limit 403 responses, `SERVER_ERROR`
+        for 5xx, `TRANSPORT_ERROR` for connection failures and timeouts, or
+        ``None`` if the request should not be retried.
+    """
+    if isinstance(exc, HttpError):
+        status = exc.resp.status
+        if status == 429 or (status == 403 and _reasons(exc) & RATE_LIMIT_REASONS):
+            return THROTTLED
+        if status >= 500:
+            return SERVER_ERROR
+        return None
+    if isinstance(exc, _TRANSPORT_ERRORS):
+        return TRANSPORT_ERROR
+    return None
+
+
+def _reasons(exc: HttpError) -> set:
+    """``reason`` values of a Drive error response body."""
+    try:
+        error = json.loads(exc.content)["error"]
+    except (ValueError, KeyError, TypeError):
+        return set()
+    return {item.get("reason") for item in error.get("errors", ()) if isinstance(item, dict)}
+
+
+class RetryPolicy:
+    """
+    Capped exponential backoff with full jitter.
+
+    Attempt ``n`` (from 0) that fails with a retryable error (see
+    `error_kind`) is followed by a sleep drawn uniformly from
+    ``[0, min(max_delay, base_delay * 2 ** n)]``.
+
+    :param max_attempts: Attempts per call, including the first one.
+    :param base_delay: Backoff ceiling, in seconds, after the first failure.
+    :param max_delay: Cap on the backoff ceiling, in seconds.
+    :param sleep: Sleep function, replaceable for testing.
+    """
+
+    __slots__ = ("max_attempts", "base_delay", "max_delay", "sleep")
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 64.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt `attempt` (counted from 0)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        *,
+        on_error: Optional[Callable[[BaseException, str], None]] = None,
+    ) -> T:
+        """
+        Call `fn` until it succeeds, fails with a non-retryable error or runs
+        out of attempts.
+
+        :param fn: Callable to run.
+        :param on_error: Called with the exception and its `error_kind`
+            before every retry.
+        :return: The result of `fn`.
+        :raises Exception: The last error raised by `fn`.
+        """
+        for attempt in range(self.max_attempts):
+            try:
+                return fn()
+            except Exception as exc:
+                kind = error_kind(exc)
+                if kind is None or attempt + 1 >= self.max_attempts:
+                    raise
+                if on_error is not None:
+                    on_error(exc, kind)
+                instrumentation.count("drive_retries", kind=kind)
+                self.sleep(self.delay(attempt))
+        raise AssertionError("unreachable")
+
+
+# Retries used by `GoogleDriveUploader` when none is given
+DEFAULT_RETRY = RetryPolicy()
+
+
+def resumable_upload(
+    request,
+    *,
+    retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+    before_request: Optional[Callable[[], Any]] = None,
+    on_error: Optional[Callable[[BaseException, str], None]] = None,
+    restart: Optional[Callable[[], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Drive a resumable ``googleapiclient`` request to completion, chunk by chunk.
+
+    A chunk that fails with a retryable error is retried on the same upload
+    session: ``next_chunk`` first asks Drive how many bytes it has and
+    continues from there. If the session itself has expired (404/410), the
+    upload starts over with a new request from `restart`; like retries,
+    restarts are limited by ``retry.max_attempts``.
+
+    :param request: ``HttpRequest`` with resumable media, e.g. from
+        `GoogleDriveUploader.upload_request`.
+    :param retry: Retry policy per chunk; ``None`` disables retries and
+        restarts.
+    :param before_request: Called before every HTTP request (e.g. to take a
+        rate limiter token).
+    :param on_error: See `RetryPolicy.call`.
+    :param restart: Builds a fresh request for the same upload, e.g.
+        ``lambda: uploader.upload_request(...)``. Without it an expired
+        session raises its `HttpError`.
+    :return: The response body of the completed upload.
+    """
+    sessions = 1
+    max_sessions = 1 if retry is None or restart is None else retry.max_attempts
+
+    def next_chunk():
+        nonlocal request, sessions
+        if before_request is not None:
+            before_request()
+        try:
+            return request.next_chunk()
+        except HttpError as exc:
+            expired = exc.resp.status in (404, 410) and request.resumable_uri is not None
+            if not expired or sessions >= max_sessions:
+                raise
+            sessions += 1
+            request = restart()
+            if on_error is not None:
+                on_error(exc, SESSION_EXPIRED)
+            instrumentation.count("drive_retries", kind=SESSION_EXPIRED)
+            return None, None
+
+    response = None
+    while response is None:
+        if retry is None:
+            _, response = next_chunk()
+        else:
+            _, response = retry.call(next_chunk, on_error=on_error)
+    return response
+
+
+def execute_batch(
+    service,
+    requests: Mapping[str, Any],
+    *,
+    retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+    on_error: Optional[Callable[[BaseException, str], None]] = None,
+    batch_size: int = BATCH_LIMIT,
+) -> Tuple[Dict[str, Any], Dict[str, BaseException]]:
+    """
+    Run independent Drive calls as batch HTTP requests.
+
+    Calls are grouped `batch_size` at a time into
+    ``service.new_batch_http_request()``, so N calls cost ``ceil(N / 100)``
+    round trips. Calls that fail with a retryable error (see `error_kind`)
+    are sent again in a later batch after a backoff delay; a batch request
+    that fails as a whole is retried like any other request.
+
+    :param service: Drive v3 ``googleapiclient`` resource.
+    :param requests: Key -> unsent ``HttpRequest``, e.g.
+        `GoogleDriveUploader.public_permission_request`.
+    :param retry: Retry policy; ``None`` disables retries.
+    :param on_error: See `RetryPolicy.call`.
+    :param batch_size: Calls per batch request, at most `BATCH_LIMIT`.
+    :return: ``(responses, errors)``: response body per successful key and
+        the final exception per failed key.
+    """
+    results: Dict[str, Any] = {}
+    errors: Dict[str, BaseException] = {}
+    pending = dict(requests)
+    attempt = 0
+
+    while pending:
+        retryable: Dict[str, Any] = {}
+        last_attempt = retry is None or attempt + 1 >= retry.max_attempts
+
+        def batch_callback(keys: Dict[str, str]) -> Callable[..., None]:
+            """Callback of one batch request, mapping its request IDs back to `keys`."""
+
+            def callback(request_id: str, response: Any, exception: Optional[BaseException]) -> None:
+                key = keys[request_id]
+                if exception is None:
+                    results[key] = response
+                    return
+                kind = error_kind(exception)
+                if kind is None or last_attempt:
+                    errors[key] = exception
+                    return
+                retryable[key] = pending[key]
+                if on_error is not None:
+                    on_error(exception, kind)
+                instrumentation.count("drive_retries", kind=kind)
+
+            return callback
+
+        items = list(pending)
+        for start in range(0, len(items), batch_size):
+            # batch request IDs end up in MIME headers; keys can be anything
+            chunk = items[start : start + batch_size]
+            keys = {str(offset): key for offset, key in enumerate(chunk)}
+            batch = service.new_batch_http_request(callback=batch_callback(keys))
+            for request_id, key in keys.items():
+                batch.add(pending[key], request_id=request_id)
+            try:
+                if retry is None:
+                    batch.execute()
+                else:
+                    retry.call(batch.execute, on_error=on_error)
+            except Exception as exc:
+                for key in keys.values():
+                    errors[key] = exc
+            instrumentation.count("drive_batches")
+
+        if retryable:
+            retry.sleep(retry.delay(attempt))
+        pending = retryable
+        attempt += 1
+
+    return results, errors
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens accrue at `rate` per second up to `capacity`. `acquire` takes a
+    token, sleeping if none is available; waiters are served in the order
+    they reserve tokens, so the sustained rate never exceeds `rate`.
+
+    :param rate: Tokens added per second.
+    :param capacity: Maximum burst, defaults to `rate` (one second's worth).
+    :param clock: Monotonic clock, replaceable for testing.
+    :param sleep: Sleep function, replaceable for testing.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take `tokens`, waiting until they are available.
+
+        :return: Seconds spent waiting.
+        """
+        with self._lock:
+            self._refill(self.clock())
+            # reserve the tokens now, going into debt; the wait pays it back
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def drain(self) -> None:
+        """Drop the tokens saved up, so no burst follows a throttling response."""
+        with self._lock:
+            self._refill(self.clock())
+            self._tokens = min(self._tokens, 0.0)
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit adjusted by additive increase / multiplicative decrease.
+
+    Every success raises the limit by ``1 / limit`` (so by one per window of
+    `limit` successes); a throttling response halves it, at most once per
+    `cooldown` seconds so that one burst of rejections counts once. Use as a
+    context manager around each unit of work.
+
+    :param initial: Starting limit.
+    :param minimum: Lowest limit.
+    :param maximum: Highest limit.
+    :param cooldown: Minimum seconds between two decreases.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        *,
+        minimum: int = 1,
+        maximum: int = 32,
+        cooldown: float = 1.0,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._active = 0
+        self._decreased = float("-inf")
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of permitted concurrent units."""
+        return int(self._limit)
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def acquire(self) -> None:
+        """Wait for a free slot under the current limit."""
+        with self._cond:
+            while self._active >= int(self._limit):
+                self._cond.wait()
+            self._active += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            previous = int(self._limit)
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            if int(self._limit) > previous:
+                self._cond.notify()
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            if now - self._decreased >= self.cooldown:
+                self._limit = max(self.minimum, self._limit / 2)
+                self._decreased = now
+
+    def __enter__(self) -> "AdaptiveConcurrency":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class UploadScheduler:
+    """
+    Thread-safe, quota-aware front end to a `DriveClientPool`.
+
+    Call `upload` (and `make_public`) from as many threads as convenient, e.g.
+    the upload stage of `run_pipeline`; the scheduler decides how many
+    uploads actually run and how fast requests go out. See the module
+    docstring for the policies involved.
+
+    :param pool: `DriveClientPool` (anything with a ``client()`` context
+        manager yielding a `GoogleDriveUploader`).
+    :param rate: Sustained Drive requests per second; set it to your
+        project's per-user quota.
+    :param burst: Token bucket capacity, defaults to `rate`.
+    :param concurrency: Initial number of concurrent uploads.
+    :param max_concurrency: Upper bound for the adaptive concurrency.
+    :param chunksize: Resumable upload chunk size in bytes, a multiple of
+        256 KiB.
+    :param retry: `RetryPolicy` applied to every request.
+
+    :raises ValueError: If `chunksize` is not a positive multiple of 256 KiB.
+    """
+
+    def __init__(
+        self,
+        pool,
+        *,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        concurrency: int = 4,
+        max_concurrency: int = 32,
+        chunksize: int = DEFAULT_CHUNK_SIZE,
+        retry: Optional[RetryPolicy] = None,
+    ) -> None:
+        if chunksize <= 0 or chunksize % CHUNK_ALIGNMENT:
+            raise ValueError(f"chunksize must be a positive multiple of {CHUNK_ALIGNMENT} bytes")
+        self.pool = pool
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrency(concurrency, maximum=max_concurrency)
+        self.chunksize = chunksize
+        self.retry = retry or RetryPolicy()
+
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.uploaded = 0
+        self.failed = 0
+        self.bytes = 0
+        self.shared = 0
+        self.retries: Dict[str, int] = {}
+
+    def upload(
+        self,
+        source,
+        *,
+        name: Optional[str] = None,
+        drive_folder_id: Optional[str] = None,
+    ) -> str:
+        """
+        Upload one file, see `GoogleDriveUploader.upload_file`.
+
+        :return: The Google Drive file ID of the uploaded file.
+        :raises googleapiclient.errors.HttpError: If Drive rejects the upload
+            or retries are exhausted.
+        """
+        with self.concurrency, self.pool.client() as uploader:
+            return self._send(
+                lambda: uploader.upload_request(
+                    source, name=name, drive_folder_id=drive_folder_id, chunksize=self.chunksize
+                )
+            )
+
+    def update(self, file_id: str, source) -> str:
+        """
+        Replace the content of an existing file, see `GoogleDriveUploader.update_file`.
+
+        :return: The Google Drive file ID.
+        :raises googleapiclient.errors.HttpError: If Drive rejects the upload
+            or retries are exhausted.
+        """
+        with self.concurrency, self.pool.client() as uploader:
+            return self._send(
+                lambda: uploader.update_request(file_id, source, chunksize=self.chunksize)
+            )
+
+    def _send(self, new_request: Callable[[], Any]) -> str:
+        """Run the resumable upload `new_request` builds, paced and retried; the file ID."""
+        request = new_request()
+        try:
+            response = resumable_upload(
+                request,
+                retry=self.retry,
+                before_request=self.bucket.acquire,
+                on_error=self._on_error,
+                restart=new_request,
+            )
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+
+        self.concurrency.on_success()
+        with self._lock:
+            self.uploaded += 1
+            self.bytes += request.resumable.size() or 0
+        return response["id"]
+
+    def make_public(self, file_id: str) -> None:
+        """Share `file_id` with anyone with the link, see `GoogleDriveUploader.make_public`."""
+
+        def call() -> None:
+            self.bucket.acquire()
+            uploader.make_public(file_id, retry=None)
+
+        with self.concurrency, self.pool.client() as uploader:
+            self.retry.call(call, on_error=self._on_error)
+        with self._lock:
+            self.shared += 1
+
+    def make_public_many(self, file_ids: Sequence[str]) -> Dict[str, BaseException]:
+        """
+        Share many files with anyone with the link, in batch requests.
+
+        Each grant still counts against the request quota, so the rate limiter
+        is charged one token per file.
+
+        :return: File ID -> exception for the grants that failed.
+        """
+        if not file_ids:
+            return {}
+        with self.concurrency, self.pool.client() as uploader:
+            requests = {}
+            for file_id in file_ids:
+                requests[file_id] = uploader.public_permission_request(file_id)
+            self.bucket.acquire(len(requests))
+            _, errors = execute_batch(
+                uploader.service, requests, retry=self.retry, on_error=self._on_error
+            )
+        with self._lock:
+            self.shared += len(requests) - len(errors)
+        return errors
+
+    def _on_error(self, exc: BaseException, kind: str) -> None:
+        if kind == THROTTLED:
+            self.concurrency.on_throttle()
+            self.bucket.drain()
+        with self._lock:
+            self.retries[kind] = self.retries.get(kind, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters since the scheduler was created: ``uploaded``, ``failed``,
+        ``bytes``, ``shared`` (permission grants), ``retries`` (by `error_kind`), the current ``concurrency``
+        limit, ``elapsed`` seconds and the sustained ``files_per_second`` and
+        ``bytes_per_second``.
+        """
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        with self._lock:
+            return {
+                "uploaded": self.uploaded,
+                "failed": self.failed,
+                "bytes": self.bytes,
+                "shared": self.shared,
+                "retries": dict(self.retries),
+                "concurrency": self.concurrency.limit,
+                "elapsed": elapsed,
+                "files_per_second": self.uploaded / elapsed,
+                "bytes_per_second": self.bytes / elapsed,
+            }
+
+    def summary(self) -> str:
+        """One-line human readable `stats`."""
+        stats = self.stats()
+        retries = ", ".join(f"{kind} {n}" for kind, n in sorted(stats["retries"].items())) or "none"
+        return (
+            f"uploads: {stats['uploaded']} ok, {stats['failed']} failed, "
+            f"{stats['files_per_second']:.1f}/s, {stats['bytes_per_second'] / 1024:.0f} KiB/s, "
+            f"{stats['shared']} shared; "
+            f"retries: {retries}; concurrency {stats['concurrency']}"
+        )
+
+
+class PermissionBatcher:
+    """
+    Collects file IDs to share publicly and grants them in batches.
+
+    Meant for the upload stage of a pipeline: `add` each uploaded file and
+    every `batch_size` files the calling thread sends one batch request
+    through `UploadScheduler.make_public_many`. Call `flush` (or use as a
+    context manager) to share the remainder.
+
+    :param scheduler: `UploadScheduler` the grants go through.
+    :param batch_size: Files per batch request, at most `BATCH_LIMIT`.
+    :param on_shared: Called with the file IDs of each batch that were
+        shared, e.g. `Checkpoint.record_shared`.
+    """
+
+    def __init__(
+        self,
+        scheduler: UploadScheduler,
+        *,
+        batch_size: int = BATCH_LIMIT,
+        on_shared: Optional[Callable[[List[str]], None]] = None,
+    ) -> None:
+        self.scheduler = scheduler
+        self.batch_size = min(batch_size, BATCH_LIMIT)
+        self.on_shared = on_shared
+        self.failed: Dict[str, BaseException] = {}
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+
+    def add(self, file_id: str) -> None:
+        """Queue `file_id`; sends a batch once `batch_size` files are queued."""
+        with self._lock:
+            self._pending.append(file_id)
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+        self._grant(batch)
+
+    def flush(self) -> None:
+        """Share every queued file now."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        self._grant(batch)
+
+    def _grant(self, file_ids: List[str]) -> None:
+        if not file_ids:
+            return
+        errors = self.scheduler.make_public_many(file_ids)
+        if errors:
+            with self._lock:
+                self.failed.update(errors)
+        if self.on_shared is not None:
+            self.on_shared([file_id for file_id in file_ids if file_id not in errors])
+
+    def __enter__(self) -> "PermissionBatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
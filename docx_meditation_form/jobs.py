@@ -0,0 +1,595 @@
+"""
+Persistent render-and-upload job queue.
+
+Submitting a form returns a job ID immediately; worker processes drain the
+queue, render each form and upload it, and the caller polls (or long-polls)
+for the Drive file ID. Request latency is thus decoupled from Drive latency,
+and bursts wait in the queue instead of timing out.
+
+State lives in one SQLite database (WAL mode), shared by the web process
+and any number of worker processes on the same machine. A job is *claimed*
+with a lease and a claim token; if its worker dies the lease expires and
+another worker picks the job up. Outcomes are only recorded with the token of
+the current claim, so a worker that lost its lease cannot complete or fail a
+job that has been claimed again; `work` renews the lease while an upload
+runs. Failed attempts are retried with exponential backoff, and jobs that
+exhaust `max_attempts` are moved to the ``dead`` state (dead letters) with
+their last error, from where they can be inspected and `retry`-ed.
+
+.. code-block:: python
+
+    queue = JobQueue("jobs.db")
+    job_id = queue.submit(values)
+
+    with JobWorkers("jobs.db", DriveUpload("token.json"), workers=4):
+        job = queue.wait(job_id, timeout=30)
+        print(job.status, job.url)
+"""
+
+import json
+import multiprocessing
+import os
+import signal
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.dataset.form_values import FormValues
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+DEAD = "dead"
+
+JOB_STATES = (QUEUED, RUNNING, DONE, DEAD)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL,
+    lease_until REAL,
+    token TEXT,
+    file_id TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, run_after);
+"""
+
+_COLUMNS = "id, payload, status, attempts, max_attempts, file_id, error, created, updated"
+
+
+class Job:
+    """
+    Snapshot of one job.
+
+    :param id: Job ID.
+    :param values: `FormValues` to render.
+    :param status: One of `JOB_STATES`.
+    :param attempts: Number of attempts started so far.
+    :param max_attempts: Attempts allowed before the job is dead-lettered.
+    :param file_id: Drive file ID once ``done``.
+    :param error: Last error, if any attempt failed.
+    :param created: Submission time (UNIX seconds).
+    :param updated: Time of the last state change.
+    :param token: Claim token, set on jobs returned by `JobQueue.claim`.
+    """
+
+    __slots__ = (
+        "id",
+        "values",
+        "status",
+        "attempts",
+        "max_attempts",
+        "file_id",
+        "error",
+        "created",
+        "updated",
+        "token",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        values: FormValues,
+        status: str,
+        attempts: int = 0,
+        max_attempts: int = 5,
+        file_id: Optional[str] = None,
+        error: Optional[str] = None,
+        created: float = 0.0,
+        updated: float = 0.0,
+        token: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.values = values
+        self.status = status
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+        self.file_id = file_id
+        self.error = error
+        self.created = created
+        self.updated = updated
+        self.token = token
+
+    @property
+    def finished(self) -> bool:
+        """``True`` once the job is ``done`` or ``dead``."""
+        return self.status in (DONE, DEAD)
+
+    @property
+    def url(self) -> Optional[str]:
+        """Drive link of the uploaded form, once ``done``."""
+        if self.file_id is None:
+            return None
+        return f"https://drive.google.com/file/d/{self.file_id}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable status, without the form values."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "file_id": self.file_id,
+            "url": self.url,
+            "error": self.error,
+            "created": self.created,
+            "updated": self.updated,
+        }
+
+    def __repr__(self) -> str:
+        return f"Job(id={self.id!r}, status={self.status!r}, attempts={self.attempts})"
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue; safe to use from several threads and processes.
+
+    :param path: Database file; created if missing.
+    :param max_attempts: Default attempts per job before dead-lettering.
+    :param retry_delay: Backoff before the first retry, in seconds; doubles
+        with every further attempt.
+    :param max_retry_delay: Upper bound of the backoff.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        *,
+        max_attempts: int = 5,
+        retry_delay: float = 2.0,
+        max_retry_delay: float = 300.0,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._local = threading.local()
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection (sqlite3 connections are not thread-safe)."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    # -- producer side -------------------------------------------------------
+
+    def submit(self, values: FormValues, *, max_attempts: Optional[int] = None) -> str:
+        """
+        Queue `values` for rendering and uploading.
+
+        :return: The new job ID.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO jobs (id, payload, status, max_attempts, run_after, created, updated)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                job_id,
+                json.dumps(values.to_dict(), ensure_ascii=False),
+                QUEUED,
+                max_attempts or self.max_attempts,
+                now,
+                now,
+                now,
+            ),
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the current state of a job, or ``None`` if it does not exist."""
+        row = self._connect().execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return _job(row) if row is not None else None
+
+    def wait(self, job_id: str, timeout: float, *, interval: float = 0.2) -> Optional[Job]:
+        """
+        Long-poll: return the job once it is finished or `timeout` has passed.
+
+        :return: The job's latest state, or ``None`` if it does not exist.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job.finished or time.monotonic() >= deadline:
+                return job
+            time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+
+    def jobs(self, status: str, *, limit: int = 100) -> List[Job]:
+        """Oldest jobs in `status`, e.g. ``jobs(DEAD)`` for the dead letters."""
+        rows = self._connect().execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE status = ? ORDER BY created LIMIT ?",
+            (status, limit),
+        ).fetchall()
+        return [_job(row) for row in rows]
+
+    def retry(self, job_id: str) -> bool:
+        """Move a dead job back to the queue with a fresh attempt budget."""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = ?, attempts = 0, run_after = ?, updated = ?"
+            " WHERE id = ? AND status = ?",
+            (QUEUED, time.time(), time.time(), job_id, DEAD),
+        )
+        return cursor.rowcount == 1
+
+    def stats(self) -> Dict[str, int]:
+        """Number of jobs per state."""
+        counts = dict.fromkeys(JOB_STATES, 0)
+        counts.update(
+            self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        )
+        return counts
+
+    def pending(self) -> int:
+        """Number of jobs queued or running."""
+        (count,) = self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+        ).fetchone()
+        return count
+
+    # -- worker side ---------------------------------------------------------
+
+    def claim(self, *, lease: float = 300.0) -> Optional[Job]:
+        """
+        Atomically take the next ready job and mark it ``running``.
+
+        Jobs whose lease expired (their worker died or stalled) are claimed
+        again, or dead-lettered if they have no attempts left. Each claim gets
+        a new `Job.token`, which `complete`, `fail` and `renew` require.
+
+        :param lease: Seconds the job is reserved for the caller; see `renew`
+            for work that may take longer.
+        :return: The claimed job, or ``None`` if nothing is ready.
+        """
+        db = self._connect()
+        now = time.time()
+        token = uuid.uuid4().hex
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated = ?"
+                " WHERE status = ? AND lease_until < ? AND attempts >= max_attempts",
+                (DEAD, "worker lost (lease expired)", now, RUNNING, now),
+            )
+            row = db.execute(
+                f"SELECT {_COLUMNS} FROM jobs"
+                " WHERE (status = ? AND run_after <= ?) OR (status = ? AND lease_until < ?)"
+                " ORDER BY run_after LIMIT 1",
+                (QUEUED, now, RUNNING, now),
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_until = ?,"
+                    " token = ?, updated = ? WHERE id = ?",
+                    (RUNNING, now + lease, token, now, row[0]),
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        job = _job(row)
+        job.status = RUNNING
+        job.attempts += 1
+        job.token = token
+        return job
+
+    def renew(self, job_id: str, token: str, *, lease: float = 300.0) -> bool:
+        """
+        Extend the lease of a claimed job to `lease` seconds from now.
+
+        :return: ``False`` if the claim is no longer current (the lease
+            expired and the job was claimed again, or it was recorded).
+        """
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_until = ?, updated = ?"
+            " WHERE id = ? AND token = ? AND status = ?",
+            (now + lease, now, job_id, token, RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, file_id: str, *, token: str) -> bool:
+        """
+        Mark a claimed job ``done``.
+
+        :param token: `Job.token` of the claim.
+        :return: ``False`` if the claim is no longer current; nothing is
+            recorded then.
+        """
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = ?, file_id = ?, error = NULL, lease_until = NULL,"
+            " token = NULL, updated = ? WHERE id = ? AND token = ? AND status = ?",
+            (DONE, file_id, time.time(), job_id, token, RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, error: BaseException, *, token: str) -> Optional[str]:
+        """
+        Record a failed attempt of a claimed job.
+
+        The job is queued again after a backoff, or dead-lettered once it has
+        used all its attempts.
+
+        :param token: `Job.token` of the claim.
+        :return: The job's new state, or ``None`` if the claim is no longer
+            current; nothing is recorded then.
+        """
+        db = self._connect()
+        row = db.execute(
+            "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND token = ? AND status = ?",
+            (job_id, token, RUNNING),
+        ).fetchone()
+        if row is None:
+            return None
+
+        attempts, max_attempts = row
+        now = time.time()
+        status = DEAD if attempts >= max_attempts else QUEUED
+        delay = min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+        cursor = db.execute(
+            "UPDATE jobs SET status = ?, error = ?, run_after = ?, lease_until = NULL,"
+            " token = NULL, updated = ? WHERE id = ? AND token = ? AND status = ?",
+            (status, repr(error), now + delay, now, job_id, token, RUNNING),
+        )
+        return status if cursor.rowcount == 1 else None
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+class DriveUpload:
+    """
+    Picklable ``data -> file_id`` upload callable for job workers.
+
+    The `GoogleDriveUploader` is built lazily inside the worker process.
+
+    :param credentials_json_path: Path to the credentials JSON file.
+    :param drive_folder_id: Drive folder uploads go into.
+    :param make_public: Share uploads with anyone with the link.
+    """
+
+    def __init__(
+        self,
+        credentials_json_path: str,
+        *,
+        drive_folder_id: Optional[str] = None,
+        make_public: bool = True,
+    ) -> None:
+        self.credentials_json_path = credentials_json_path
+        self.drive_folder_id = drive_folder_id
+        self.make_public = make_public
+        self._uploader = None
+
+    def __call__(self, data: bytes) -> str:
+        if self._uploader is None:
+            from docx_meditation_form.integrations import GoogleDriveUploader
+
+            self._uploader = GoogleDriveUploader(self.credentials_json_path)
+
+        file_id = self._uploader.upload_file(
+            data, name="mediation_form.docx", drive_folder_id=self.drive_folder_id
+        )
+        if self.make_public:
+            self._uploader.make_public(file_id)
+        return file_id
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {**self.__dict__, "_uploader": None}
+
+
+def work(
+    path: Union[str, os.PathLike],
+    upload: Callable[[bytes], str],
+    *,
+    engine: str = "xml",
+    poll_interval: float = 0.5,
+    lease: float = 300.0,
+    stop: Optional[Any] = None,
+) -> None:
+    """
+    Worker loop: claim jobs, render, upload, record the outcome.
+
+    Runs until `stop` is set (forever if omitted). The lease of the current
+    job is renewed every third of `lease` while it renders and uploads, so a
+    slow upload is not handed to a second worker; if the lease is lost anyway
+    (e.g. the worker was paused for longer than `lease`), its outcome is
+    discarded by the queue.
+
+    :param path: Job database.
+    :param upload: ``data -> file_id`` callable, e.g. `DriveUpload`.
+    :param engine: `FormRenderer` engine.
+    :param poll_interval: Seconds to sleep while the queue is empty.
+    :param lease: Seconds a claimed job is reserved, see `JobQueue.claim`.
+    :param stop: `threading.Event` or `multiprocessing.Event` ending the loop.
+    """
+    queue = JobQueue(path)
+    renderer = FormRenderer(engine=engine)
+    try:
+        while stop is None or not stop.is_set():
+            job = queue.claim(lease=lease)
+            if job is None:
+                if stop is not None:
+                    stop.wait(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+                continue
+
+            try:
+                with _LeaseKeeper(queue, job, lease):
+                    file_id = upload(renderer.render_to_bytes(job.values))
+            except Exception as exc:
+                queue.fail(job.id, exc, token=job.token)
+            else:
+                queue.complete(job.id, file_id, token=job.token)
+    finally:
+        queue.close()
+
+
+class _LeaseKeeper:
+    """Renews the lease of a claimed job from a background thread."""
+
+    def __init__(self, queue: JobQueue, job: Job, lease: float) -> None:
+        self.queue = queue
+        self.job = job
+        self.lease = lease
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{job.id}", daemon=True)
+
+    def _run(self) -> None:
+        try:
+            while not self._done.wait(self.lease / 3):
+                if not self.queue.renew(self.job.id, self.job.token, lease=self.lease):
+                    return
+        finally:
+            self.queue.close()
+
+    def __enter__(self) -> "_LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._done.set()
+        self._thread.join()
+
+
+class JobWorkers:
+    """
+    Pool of worker processes draining a `JobQueue`.
+
+    Use as a context manager, or call `start` and `stop`.
+
+    :param path: Job database.
+    :param upload: Picklable ``data -> file_id`` callable, e.g. `DriveUpload`.
+    :param workers: Number of worker processes.
+    :param engine: `FormRenderer` engine.
+    :param poll_interval: Seconds workers sleep while the queue is empty.
+    :param lease: Seconds a claimed job is reserved.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        upload: Callable[[bytes], str],
+        *,
+        workers: int = 2,
+        engine: str = "xml",
+        poll_interval: float = 0.5,
+        lease: float = 300.0,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.upload = upload
+        self.workers = workers
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._stop = multiprocessing.Event()
+        self._processes: List[multiprocessing.Process] = []
+
+    def start(self) -> None:
+        """Start the worker processes."""
+        # create the schema before the workers race to do it
+        JobQueue(self.path).close()
+        self._stop.clear()
+        for n in range(self.workers):
+            process = multiprocessing.Process(
+                target=_work_process,
+                args=(self.path, self.upload),
+                kwargs={
+                    "engine": self.engine,
+                    "poll_interval": self.poll_interval,
+                    "lease": self.lease,
+                    "stop": self._stop,
+                },
+                name=f"job-worker-{n}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Let workers finish their current job, then stop them.
+
+        :param timeout: Seconds to wait per worker before terminating it.
+        """
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+
+    def __enter__(self) -> "JobWorkers":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def _work_process(*args, **kwargs) -> None:
+    """`work` in a child process; Ctrl+C is left to the parent, which stops
+    the workers between jobs."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    work(*args, **kwargs)
+
+
+def _job(row) -> Job:
+    id, payload, status, attempts, max_attempts, file_id, error, created, updated = row
+    return Job(
+        id,
+        FormValues.from_dict(json.loads(payload)),
+        status,
+        attempts,
+        max_attempts,
+        file_id,
+        error,
+        created,
+        updated,
+    )
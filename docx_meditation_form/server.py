@@ -0,0 +1,610 @@
+"""
+Production HTTP service for rendering (and uploading) forms.
+
+`FormServer` is a plain ASGI application with no web framework dependency;
+run it with any ASGI server:
+
+.. code-block:: console
+
+    $ uvicorn --factory docx_meditation_form.server:create_app --port 8080
+
+Rendering is CPU bound, so it runs in a pool of worker processes, each with
+its own warm `FormRenderer`; the event loop only parses requests and awaits
+results. Uploads go through an asyncio uploader (`AsyncGoogleDriveUploader`),
+so slow Drive calls never occupy a render worker.
+
+Admission is bounded: at most `max_concurrency` requests are processed and
+at most `max_waiting` more wait for a slot. Beyond that requests are refused
+straight away with ``429 Too Many Requests``, and requests that wait longer
+than `admission_timeout` get ``503 Service Unavailable``, both with a
+``Retry-After`` header, so overload shows up as fast rejections instead of
+ever-growing latency.
+
+Endpoints:
+
+- ``POST /generate-docx``: JSON object of form fields. Returns
+  ``{"file_id", "url"}`` after uploading, or the DOCX itself with
+  ``?download=1`` (or ``true``/``yes``; always, when no uploader is
+  configured). The DOCX carries
+  the render cache key as a strong ``ETag``; the JSON a weak one derived
+  from it (the file id differs between uploads unless the cache has one).
+  A request whose ``If-None-Match`` matches gets ``412 Precondition Failed``
+  without rendering or uploading.
+- ``GET /generate-docx?<field>=<value>&...``: the DOCX for the form fields
+  given as query parameters, with the same ``ETag``; a matching
+  ``If-None-Match`` gets ``304 Not Modified``.
+- ``POST /jobs``: same body; queues the form in a `JobQueue` and returns
+  ``202 {"job_id", "status_url"}`` at once (``429`` once `max_queued_jobs`
+  are pending). Workers are run separately, see `docx_meditation_form.jobs`.
+- ``GET /jobs/<id>``: job status with the Drive URL once done;
+  ``?wait=<seconds>`` long-polls until the job finishes (up to 60 s).
+- ``GET /healthz``: ``200`` while serving, ``503`` while shutting down.
+- ``GET /metrics``: Prometheus text (stage timings, counters, admission gauges).
+
+On shutdown (ASGI lifespan) the server stops admitting requests, waits up to
+`shutdown_timeout` for in-flight ones to finish, then stops the workers and
+closes the uploader.
+"""
+
+import asyncio
+import hmac
+import json
+import math
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from docx_meditation_form.core import instrumentation
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.core.render_cache import RenderCache
+from docx_meditation_form.dataset.form_values import FormValues
+from docx_meditation_form.jobs import JobQueue
+
+# same as `integrations.google_drive.DOCX_MIMETYPE`, without importing the Google client
+DOCX_MIMETYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+Headers = List[Tuple[bytes, bytes]]
+
+# Longest accepted ``?wait=`` of a job long-poll, in seconds
+MAX_JOB_WAIT = 60.0
+
+# Renderer of a worker process, built by `_init_worker`
+_worker_renderer: Optional[FormRenderer] = None
+
+
+class HTTPError(Exception):
+    """
+    Aborts a request with an HTTP error response.
+
+    :param status: HTTP status code.
+    :param message: Error message returned as ``{"error": message}``.
+    :param retry_after: Seconds sent in a ``Retry-After`` header, if given.
+    """
+
+    def __init__(self, status: int, message: str, *, retry_after: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+class FormServer:
+    """
+    ASGI application serving the mediation form.
+
+    :param engine: `FormRenderer` engine used by the workers, ``"xml"`` or
+        ``"docx"``; the service only serves DOCX.
+    :param workers: Number of render processes, defaults to the number of CPUs.
+    :param uploader: Async uploader with ``upload_file(data, name=...,
+        drive_folder_id=...)`` and ``make_public(file_id)`` coroutines, e.g.
+        `AsyncGoogleDriveUploader` (pointed at a fake Drive for testing).
+        Without one, forms are only returned for download.
+    :param drive_folder_id: Drive folder uploads go into.
+    :param make_public: Share uploads with anyone with the link.
+    :param api_key: Required ``X-API-KEY`` header value; ``None`` disables auth.
+    :param cache: `RenderCache` consulted before rendering.
+    :param jobs: `JobQueue` behind the ``/jobs`` endpoints; they return 404
+        without one.
+    :param max_queued_jobs: Pending jobs beyond which submissions get 429.
+    :param max_concurrency: Requests processed at once, defaults to twice
+        the number of workers.
+    :param max_waiting: Requests allowed to wait for a slot before new ones
+        are refused with 429.
+    :param admission_timeout: Seconds a request may wait for a slot before
+        it is refused with 503.
+    :param max_body_bytes: Largest accepted request body.
+    :param shutdown_timeout: Seconds to wait for in-flight requests on shutdown.
+    :param registry: `HistogramRegistry` exported on ``/metrics``; a new one
+        is created and enabled by default.
+
+    :raises ValueError: If `engine` does not produce DOCX.
+    """
+
+    def __init__(
+        self,
+        *,
+        engine: str = "xml",
+        workers: Optional[int] = None,
+        uploader: Any = None,
+        drive_folder_id: Optional[str] = None,
+        make_public: bool = True,
+        api_key: Optional[str] = None,
+        cache: Optional[RenderCache] = None,
+        jobs: Optional[JobQueue] = None,
+        max_queued_jobs: int = 10000,
+        max_concurrency: Optional[int] = None,
+        max_waiting: int = 64,
+        admission_timeout: float = 5.0,
+        max_body_bytes: int = 64 * 1024,
+        shutdown_timeout: float = 30.0,
+        registry: Optional[instrumentation.HistogramRegistry] = None,
+    ) -> None:
+        if FormRenderer.EXTENSIONS.get(engine) != ".docx":
+            raise ValueError(f"Unsupported engine {engine!r}, the server renders DOCX ('xml' or 'docx')")
+        self.renderer = FormRenderer(engine=engine)
+        self.workers = workers or os.cpu_count() or 1
+        self.uploader = uploader
+        self.drive_folder_id = drive_folder_id
+        self.make_public = make_public
+        self.api_key = api_key
+        self.cache = cache
+        self.jobs = jobs
+        self.max_queued_jobs = max_queued_jobs
+        self.max_concurrency = max_concurrency or 2 * self.workers
+        self.max_waiting = max_waiting
+        self.admission_timeout = admission_timeout
+        self.max_body_bytes = max_body_bytes
+        self.shutdown_timeout = shutdown_timeout
+        self.registry = registry or instrumentation.HistogramRegistry()
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._in_flight = 0
+        self._waiting = 0
+        self._draining = False
+
+    # -- lifecycle -------------------------------------------------------------
+
+    async def startup(self) -> None:
+        """Start the render workers; called on ASGI lifespan startup."""
+        instrumentation.enable(self.registry)
+        self._ensure_started()
+        # the parent needs the template too: its fingerprint is part of the ETag
+        await asyncio.get_running_loop().run_in_executor(None, lambda: self.renderer.template)
+
+    async def shutdown(self) -> None:
+        """Drain in-flight requests, then stop workers and the uploader."""
+        self._draining = True
+        if self._in_flight and self._idle is not None:
+            try:
+                await asyncio.wait_for(self._idle.wait(), self.shutdown_timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: pool.shutdown(wait=True, cancel_futures=True)
+            )
+        close = getattr(self.uploader, "close", None)
+        if close is not None:
+            await close()
+        instrumentation.disable(self.registry)
+
+    def _ensure_started(self) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._idle = asyncio.Event()
+            self._idle.set()
+        if self._pool is None and not self._draining:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.renderer.engine,),
+            )
+
+    # -- ASGI ------------------------------------------------------------------
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        self._ensure_started()
+        route = (scope["method"], scope["path"])
+        instrumentation.count("http_requests")
+        try:
+            if route[1] == "/generate-docx" and route[0] in ("GET", "POST"):
+                await self._generate(scope, receive, send)
+            elif route == ("POST", "/jobs") and self.jobs is not None:
+                await self._submit_job(scope, receive, send)
+            elif (
+                route[0] == "GET"
+                and route[1].startswith("/jobs/")
+                and self.jobs is not None
+            ):
+                await self._job_status(scope, send, route[1][len("/jobs/") :])
+            elif route == ("GET", "/healthz"):
+                await self._healthz(send)
+            elif route == ("GET", "/metrics"):
+                await self._metrics(send)
+            else:
+                raise HTTPError(404, "not found")
+        except HTTPError as exc:
+            instrumentation.count(f"http_errors_{exc.status}")
+            headers = []
+            if exc.retry_after is not None:
+                headers.append((b"retry-after", str(exc.retry_after).encode()))
+            await _send_json(send, exc.status, {"error": exc.message}, headers)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as exc:
+                    await send({"type": "lifespan.startup.failed", "message": repr(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # -- endpoints -------------------------------------------------------------
+
+    def _authorize(self, headers: Dict[str, str]) -> None:
+        if self.api_key is not None and not hmac.compare_digest(
+            headers.get("x-api-key", ""), self.api_key
+        ):
+            raise HTTPError(401, "unauthorized")
+
+    async def _read_values(self, receive) -> FormValues:
+        body = await _read_body(receive, self.max_body_bytes)
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "invalid JSON") from None
+        if not isinstance(data, dict):
+            raise HTTPError(400, "expected a JSON object")
+        # unknown keys are ignored
+        return FormValues.from_dict(data)
+
+    async def _generate(self, scope, receive, send) -> None:
+        headers = _headers(scope)
+        self._authorize(headers)
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if scope["method"] == "GET":
+            # unknown parameters are ignored, like unknown JSON keys
+            values = FormValues.from_dict({name: value[0] for name, value in query.items()})
+            download = True
+        else:
+            values = await self._read_values(receive)
+            download = self.uploader is None or _flag(query, "download")
+
+        # the DOCX and the JSON link are different representations of the form
+        key = RenderCache.key(values, self.renderer)
+        etag = f'"{key}"' if download else f'W/"{key}-link"'
+        if _etag_matches(etag, headers.get("if-none-match", "")):
+            if scope["method"] != "GET":
+                # RFC 9110 13.1.2: only GET and HEAD answer 304
+                raise HTTPError(412, "precondition failed")
+            await send({"type": "http.response.start", "status": 304, "headers": [(b"etag", etag.encode())]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async with self._admit():
+            data = await self._render(values)
+            if download:
+                await _send(
+                    send,
+                    200,
+                    data,
+                    [
+                        (b"content-type", DOCX_MIMETYPE.encode()),
+                        (b"content-disposition", b'attachment; filename="mediation_form.docx"'),
+                        (b"etag", etag.encode()),
+                    ],
+                )
+                return
+            file_id = await self._upload(values, data)
+
+        payload = {"file_id": file_id, "url": f"https://drive.google.com/file/d/{file_id}"}
+        await _send_json(send, 200, payload, [(b"etag", etag.encode())])
+
+    async def _submit_job(self, scope, receive, send) -> None:
+        self._authorize(_headers(scope))
+        values = await self._read_values(receive)
+        if self._draining:
+            raise HTTPError(503, "shutting down", retry_after=5)
+
+        # SQLite calls block; keep them off the event loop
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, self.jobs.pending) >= self.max_queued_jobs:
+            instrumentation.count("server_rejected")
+            raise HTTPError(429, "job queue full", retry_after=5)
+        job_id = await loop.run_in_executor(None, self.jobs.submit, values)
+        instrumentation.count("jobs_submitted")
+
+        status_url = f"/jobs/{job_id}"
+        await _send_json(
+            send,
+            202,
+            {"job_id": job_id, "status_url": status_url},
+            [(b"location", status_url.encode())],
+        )
+
+    async def _job_status(self, scope, send, job_id: str) -> None:
+        self._authorize(_headers(scope))
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        try:
+            wait = float(query.get("wait", ["0"])[0])
+        except ValueError:
+            raise HTTPError(400, "invalid wait") from None
+        # NaN would never reach the deadline; inf and negatives are errors too
+        if not math.isfinite(wait) or wait < 0:
+            raise HTTPError(400, "invalid wait")
+        wait = min(wait, MAX_JOB_WAIT)
+
+        # long-poll: re-read the job until it finishes, the wait is over or
+        # shutdown starts
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while True:
+            job = await loop.run_in_executor(None, self.jobs.get, job_id)
+            if job is None:
+                raise HTTPError(404, "no such job")
+            if job.finished or self._draining or loop.time() >= deadline:
+                break
+            await asyncio.sleep(min(0.2, deadline - loop.time()))
+
+        await _send_json(send, 200, job.to_dict())
+
+    async def _healthz(self, send) -> None:
+        status = 503 if self._draining else 200
+        await _send_json(
+            send,
+            status,
+            {
+                "status": "draining" if self._draining else "ok",
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+            },
+        )
+
+    async def _metrics(self, send) -> None:
+        text = instrumentation.PrometheusExporter(self.registry).render()
+        gauges = {
+            "in_flight": (self._in_flight, "Requests being processed."),
+            "waiting": (self._waiting, "Requests waiting for admission."),
+            "max_concurrency": (self.max_concurrency, "Admission limit."),
+        }
+        for name, (value, help_text) in gauges.items():
+            metric = f"docx_form_server_{name}"
+            text += f"# HELP {metric} {help_text}\n# TYPE {metric} gauge\n{metric} {value}\n"
+        await _send(
+            send,
+            200,
+            text.encode("utf-8"),
+            [(b"content-type", instrumentation.PrometheusExporter.CONTENT_TYPE.encode())],
+        )
+
+    # -- admission, render, upload ---------------------------------------------
+
+    def _admit(self) -> "_Admission":
+        return _Admission(self)
+
+    async def _render(self, values: FormValues) -> bytes:
+        key = None
+        if self.cache is not None:
+            key = RenderCache.key(values, self.renderer)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry.data
+
+        loop = asyncio.get_running_loop()
+        pool = self._pool
+        try:
+            with instrumentation.stage("server.render"):
+                data = await loop.run_in_executor(
+                    pool, _render_bytes, self.renderer.engine, values
+                )
+        except BrokenProcessPool:
+            # a worker died; start a fresh pool for the next requests, unless
+            # another request that failed on the same pool already did
+            if self._pool is pool:
+                self._pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._ensure_started()
+            raise HTTPError(503, "render workers restarting", retry_after=1) from None
+        except Exception as exc:
+            raise HTTPError(500, f"render failed: {exc!r}") from None
+
+        if self.cache is not None:
+            self.cache.put(key, data)
+        return data
+
+    async def _upload(self, values: FormValues, data: bytes) -> str:
+        key = None
+        if self.cache is not None:
+            key = RenderCache.key(values, self.renderer)
+            entry = self.cache.get(key)
+            if entry is not None and entry.drive_file_id is not None:
+                return entry.drive_file_id
+
+        try:
+            file_id = await self.uploader.upload_file(
+                data, name="mediation_form.docx", drive_folder_id=self.drive_folder_id
+            )
+            if self.make_public:
+                await self.uploader.make_public(file_id)
+        except Exception as exc:
+            raise HTTPError(502, f"upload failed: {exc!r}") from None
+
+        if self.cache is not None:
+            self.cache.set_drive_file_id(key, file_id)
+        return file_id
+
+
+class _Admission:
+    """Async context manager holding one of the server's processing slots."""
+
+    def __init__(self, server: FormServer) -> None:
+        self.server = server
+
+    async def __aenter__(self) -> None:
+        server = self.server
+        if server._draining:
+            instrumentation.count("server_rejected")
+            raise HTTPError(503, "shutting down", retry_after=5)
+
+        if not server._slots.locked():
+            # a free slot is taken without suspending
+            await server._slots.acquire()
+        elif server._waiting >= server.max_waiting:
+            instrumentation.count("server_rejected")
+            raise HTTPError(429, "too many requests", retry_after=1)
+        else:
+            server._waiting += 1
+            try:
+                await asyncio.wait_for(server._slots.acquire(), server.admission_timeout)
+            except asyncio.TimeoutError:
+                instrumentation.count("server_rejected")
+                raise HTTPError(503, "server busy", retry_after=1) from None
+            finally:
+                server._waiting -= 1
+
+        server._in_flight += 1
+        server._idle.clear()
+
+    async def __aexit__(self, *exc_info) -> None:
+        server = self.server
+        server._in_flight -= 1
+        server._slots.release()
+        if not server._in_flight:
+            server._idle.set()
+
+
+def create_app() -> FormServer:
+    """
+    Build a `FormServer` configured from environment variables.
+
+    ``DOCX_FORM_API_KEY``, ``DOCX_FORM_WORKERS``, ``DOCX_FORM_MAX_CONCURRENCY``,
+    ``DOCX_FORM_MAX_WAITING``, ``DOCX_FORM_CACHE_DIR``, ``DOCX_FORM_JOBS_DB``
+    (job database enabling ``/jobs``), and for uploads
+    ``DOCX_FORM_CREDENTIALS`` (credentials JSON), ``DOCX_FORM_DRIVE_FOLDER``,
+    ``DOCX_FORM_SHARED_FOLDER`` (``1`` if the folder is already shared by
+    link, so uploads need no permission call) and ``DOCX_FORM_DRIVE_URL``
+    (Drive API root, e.g. a local fake Drive).
+    """
+    env = os.environ
+    uploader = None
+    if env.get("DOCX_FORM_CREDENTIALS"):
+        from docx_meditation_form.integrations import AsyncGoogleDriveUploader
+
+        kwargs = {}
+        if env.get("DOCX_FORM_DRIVE_URL"):
+            kwargs["base_url"] = env["DOCX_FORM_DRIVE_URL"]
+        uploader = AsyncGoogleDriveUploader(env["DOCX_FORM_CREDENTIALS"], **kwargs)
+
+    def integer(name: str) -> Optional[int]:
+        return int(env[name]) if env.get(name) else None
+
+    return FormServer(
+        workers=integer("DOCX_FORM_WORKERS"),
+        uploader=uploader,
+        drive_folder_id=env.get("DOCX_FORM_DRIVE_FOLDER"),
+        make_public=env.get("DOCX_FORM_SHARED_FOLDER") != "1",
+        api_key=env.get("DOCX_FORM_API_KEY"),
+        cache=RenderCache(env["DOCX_FORM_CACHE_DIR"]) if env.get("DOCX_FORM_CACHE_DIR") else None,
+        jobs=JobQueue(env["DOCX_FORM_JOBS_DB"]) if env.get("DOCX_FORM_JOBS_DB") else None,
+        max_concurrency=integer("DOCX_FORM_MAX_CONCURRENCY"),
+        max_waiting=integer("DOCX_FORM_MAX_WAITING") or 64,
+    )
+
+
+# -- worker processes ------------------------------------------------------------
+
+
+def _init_worker(engine: str) -> None:
+    """Build the worker's renderer up front; leave Ctrl+C to the parent."""
+    global _worker_renderer
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_renderer = FormRenderer(engine=engine)
+    _worker_renderer.template
+
+
+def _render_bytes(engine: str, values: FormValues) -> bytes:
+    """Worker entry point: render `values` into DOCX bytes."""
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = FormRenderer(engine=engine)
+    return _worker_renderer.render_to_bytes(values)
+
+
+# -- ASGI helpers --------------------------------------------------------------
+
+
+def _headers(scope) -> Dict[str, str]:
+    return {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+
+
+def _flag(query: Dict[str, List[str]], name: str) -> bool:
+    """
+    Parse a boolean query parameter; absent means false.
+
+    :raises HTTPError: 400 if the value is not a recognised boolean.
+    """
+    value = query.get(name, ["0"])[-1].strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off", ""):
+        return False
+    raise HTTPError(400, f"invalid {name}")
+
+
+def _etag_matches(etag: str, header: str) -> bool:
+    """
+    Whether an ``If-None-Match`` header matches `etag`, using the weak
+    comparison RFC 9110 prescribes for it (``W/`` prefixes are ignored).
+    """
+    tags = [tag.strip() for tag in header.split(",") if tag.strip()]
+    return "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+async def _read_body(receive, limit: int) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "client disconnected")
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            raise HTTPError(413, "request body too large")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send(send, status: int, body: bytes, headers: Headers) -> None:
+    headers = headers + [(b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status: int, payload: Dict[str, Any], headers: Headers = ()) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await _send(send, status, body, [(b"content-type", b"application/json"), *headers])
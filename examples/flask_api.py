@@ -1,18 +1,12 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, send_file
 from functools import wraps
-import tempfile
-import os
+from io import BytesIO
 import base64
 
-from docx import Document
-
-from docx_meditation_form.core import DocxSettings, HeaderWriter, TableWriter
-from docx_meditation_form.dataset import (
-    COLUMN_WIDTHS_DATASET,
-    ROW_HEIGHTS_DATASET,
-    FormValues,
-)
-from docx_meditation_form.integrations import GoogleDriveUploader
+from docx_meditation_form.core import FormRenderer, RenderCache, instrumentation
+from docx_meditation_form.dataset import FormValues
+from docx_meditation_form.integrations import DriveClientPool
+from docx_meditation_form.integrations.google_drive import DOCX_MIMETYPE
 
 app = Flask(__name__)
 
@@ -20,6 +14,19 @@ API_PASSWORD = b'https://www.youtube.com/watch?v=dQw4w9WgXcQ' # change this with
 API_KEY = base64.b64encode(API_PASSWORD).decode("utf-8")
 GOOGLE_TOKEN_PATH = "token.json"
 
+# per-stage timings and counters, exposed on /metrics
+metrics = instrumentation.HistogramRegistry()
+instrumentation.enable(metrics)
+
+# static form layout is built once and reused by every request
+renderer = FormRenderer(engine="xml")
+
+# exact resubmissions are served from here, without rendering or uploading again
+render_cache = RenderCache("render-cache/")
+
+# credentials, discovery document and HTTP connections are shared across requests
+drive_pool = DriveClientPool(GOOGLE_TOKEN_PATH)
+
 
 def require_auth(fn):
     @wraps(fn)
@@ -47,39 +54,65 @@ def require_auth(fn):
 #     "DEFENDANT_MOBILE": "+91-9123456789",
 #     "DEFENDANT_EMAIL_ID": "rahul.sharma@example.com"
 #   }'
+#
+# Add `?download=1` to receive the DOCX itself instead of a Drive link.
+#
+# Output is deterministic, so the cache key identifies the DOCX exactly and is
+# sent as its strong ETag; the JSON link gets a weak ETag derived from it.
+# A POST whose `If-None-Match` matches gets 412 Precondition Failed without
+# rendering or uploading the form again (304 is only for GET and HEAD).
 @app.route("/generate-docx", methods=["POST"])
 @require_auth
 def generate_docx():
-    data = request.json or {}
-    values = FormValues(**data)
-
-    doc = Document()
-    settings = DocxSettings(doc)
-    settings.set_top_margin()
-    settings.set_section()
-    HeaderWriter(doc).write()
-
-    table_writer = TableWriter(doc)
-    table = table_writer.init_table()
-    table_writer.set_columns_width(table, COLUMN_WIDTHS_DATASET)
-    table_writer.set_rows_height(table, ROW_HEIGHTS_DATASET)
-    table_writer.merge_required_rows(table)
-    table_writer.write_table(table, values)
-
-    # write to temp file
-    with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as tmp:
-        doc.save(tmp.name)
-        tmp_path = tmp.name
-
-    uploader = GoogleDriveUploader(GOOGLE_TOKEN_PATH)
-    file_id = uploader.upload_file(tmp_path)
-    uploader.make_public(file_id)
-
-    os.remove(tmp_path)
-
-    return jsonify({
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "expected a JSON object"}), 400
+    # unknown keys are ignored
+    values = FormValues.from_dict(data)
+
+    # the DOCX and the JSON link are different representations of the form
+    download = bool(request.args.get("download"))
+    key = RenderCache.key(values, renderer)
+    etag = key if download else f"{key}-link"
+    if request.if_none_match.contains_weak(etag):
+        return jsonify({"error": "precondition failed"}), 412
+
+    # render in memory, no temporary files; cached by content
+    entry = render_cache.render(renderer, values)
+
+    if download:
+        return send_file(
+            BytesIO(entry.data),
+            mimetype=DOCX_MIMETYPE,
+            as_attachment=True,
+            download_name="mediation_form.docx",
+            etag=etag,
+        )
+
+    file_id = entry.drive_file_id
+    if file_id is None:
+        with drive_pool.client() as uploader:
+            file_id = uploader.upload_file(entry.data, name="mediation_form.docx")
+            uploader.make_public(file_id)
+        render_cache.set_drive_file_id(entry.key, file_id)
+
+    response = jsonify({
         "url": f"https://drive.google.com/file/d/{file_id}"
     })
+    response.set_etag(etag, weak=True)
+    return response
+
+
+@app.route("/cache-stats")
+@require_auth
+def cache_stats():
+    return jsonify(render_cache.stats())
+
+
+@app.route("/metrics")
+def prometheus_metrics():
+    text = instrumentation.PrometheusExporter(metrics).render()
+    return text, 200, {"Content-Type": instrumentation.PrometheusExporter.CONTENT_TYPE}
 
 
 if __name__ == "__main__":
@@ -11,9 +11,29 @@ setup(
     packages=find_packages(),
     install_requires=[
         "python-docx",
-        "google-api-python-client",
-        "google-auth",
-        "google-auth-oauthlib",
     ],
+    extras_require={
+        "google": [
+            "google-api-python-client",
+            "google-auth",
+            "google-auth-oauthlib",
+        ],
+        "async": [
+            "aiohttp",
+            "google-api-python-client",
+            "google-auth",
+        ],
+        "server": [
+            "uvicorn",
+            "aiohttp",
+            "google-api-python-client",
+            "google-auth",
+        ],
+    },
+    entry_points={
+        "console_scripts": [
+            "docx-meditation-form=docx_meditation_form.__main__:main",
+        ],
+    },
     python_requires=">=3.9",
 )
@@ -0,0 +1,40 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from bench_drive import FakeDrive  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def _fake_drive_server():
+    with FakeDrive() as drive:
+        yield drive
+
+
+@pytest.fixture
+def fake_drive(_fake_drive_server):
+    """Local fake Drive v3 server (see ``benchmarks/bench_drive.py``), reset per test."""
+    _fake_drive_server.reset()
+    _fake_drive_server.latency = 0.0
+    return _fake_drive_server
+
+
+@pytest.fixture
+def drive_token(tmp_path):
+    """Authorized-user credentials file accepted by the fake Drive."""
+    path = tmp_path / "token.json"
+    path.write_text(
+        json.dumps(
+            {
+                "access_token": "test",
+                "refresh_token": "test",
+                "client_id": "test",
+                "client_secret": "test",
+            }
+        )
+    )
+    return str(path)
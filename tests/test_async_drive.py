@@ -0,0 +1,78 @@
+import asyncio
+import io
+import threading
+
+import pytest
+
+from docx_meditation_form.integrations.async_drive import AsyncGoogleDriveUploader
+
+
+def _upload_many(drive, token, files, **kwargs):
+    async def main():
+        async with AsyncGoogleDriveUploader(token, base_url=drive.url) as uploader:
+            return await uploader.upload_many(files, **kwargs)
+
+    return asyncio.run(main())
+
+
+def test_upload_many_returns_ids_and_errors_in_input_order(fake_drive, drive_token, tmp_path):
+    path = tmp_path / "form.docx"
+    path.write_bytes(b"PK from disk")
+    files = [
+        (b"PK bytes", "a.docx"),
+        (path, None),
+        (tmp_path / "missing.docx", None),
+        (io.BytesIO(b"PK stream"), "c.docx"),
+    ]
+
+    results = _upload_many(fake_drive, drive_token, files, make_public=True, concurrency=2)
+
+    assert isinstance(results[2], FileNotFoundError)
+    file_ids = [results[0], results[1], results[3]]
+    assert all(isinstance(file_id, str) for file_id in file_ids)
+    assert fake_drive.public == set(file_ids)
+    assert b"PK bytes" in fake_drive.contents[results[0]]
+    assert b'"name": "form.docx"' in fake_drive.contents[results[1]]
+    assert b"PK stream" in fake_drive.contents[results[3]]
+
+
+def test_upload_many_consumes_files_lazily(fake_drive, drive_token):
+    fake_drive.latency = 0.01
+    ahead = []
+
+    def files():
+        for index in range(12):
+            # files taken but not yet uploaded when the next one is taken
+            ahead.append(index - fake_drive.calls["upload"])
+            yield b"PK", f"form_{index}.docx"
+
+    results = _upload_many(fake_drive, drive_token, files(), concurrency=3)
+
+    assert len(results) == 12
+    assert fake_drive.calls["upload"] == 12
+    assert max(ahead) <= 3
+
+
+def test_streams_are_read_off_the_event_loop(fake_drive, drive_token):
+    readers = []
+
+    class Stream(io.BytesIO):
+        def read(self, *args):
+            readers.append(threading.current_thread())
+            return super().read(*args)
+
+    results = _upload_many(fake_drive, drive_token, [(Stream(b"PK"), "form.docx")])
+
+    assert results[0].startswith("file")
+    assert readers and readers[0] is not threading.main_thread()
+
+
+def test_in_memory_source_requires_a_name(fake_drive, drive_token):
+    (result,) = _upload_many(fake_drive, drive_token, [(b"PK", None)])
+    assert isinstance(result, ValueError)
+    assert fake_drive.calls["upload"] == 0
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_upload_many_with_no_files(fake_drive, drive_token, concurrency):
+    assert _upload_many(fake_drive, drive_token, [], concurrency=concurrency) == []
@@ -0,0 +1,19 @@
+import pytest
+
+from docx_meditation_form.core.batch import render_many
+from docx_meditation_form.dataset.form_values import FormValues
+
+
+@pytest.mark.parametrize("max_pending", [0, -1])
+def test_render_many_rejects_max_pending_below_one(tmp_path, max_pending):
+    with pytest.raises(ValueError, match="max_pending"):
+        next(render_many([FormValues()], tmp_path, executor="thread", max_pending=max_pending))
+
+
+def test_render_many_with_one_pending_item(tmp_path):
+    values = [FormValues(APPLICANT_NAME=f"Applicant {n}") for n in range(3)]
+    results = list(render_many(values, tmp_path, workers=2, executor="thread", max_pending=1))
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert all(result.ok for result in results)
+    assert all(result.path.stat().st_size for result in results)
@@ -0,0 +1,68 @@
+import io
+import zipfile
+
+import pytest
+from docx import Document
+
+from docx_meditation_form.core.cell_formatter import coalesce_runs
+from docx_meditation_form.core.form_template import FormRenderer, FormTemplate
+from docx_meditation_form.core.settings import PARAGRAPH_STYLE, RUN_STYLES
+from docx_meditation_form.dataset.form_values import FORM_FIELDS, FormValues
+
+VALUES = FormValues(**{name: f"{name.lower()} & <value>" for name in FORM_FIELDS})
+
+
+def _part(data: bytes, name: str) -> bytes:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return archive.read(name)
+
+
+def _paragraph(*runs):
+    """A paragraph with one run per ``(text, bold)`` pair."""
+    doc = Document()
+    p = doc.add_paragraph()
+    for text, bold in runs:
+        p.add_run(text).bold = bold
+    return p
+
+
+def test_coalesce_merges_runs_with_the_same_formatting():
+    p = _paragraph(("one ", False), ("two ", False), ("three", False), (" bold", True))
+
+    assert coalesce_runs(p._p) == 2
+    assert [(run.text, run.bold) for run in p.runs] == [("one two three", False), (" bold", True)]
+
+
+def test_coalesce_keeps_excluded_runs():
+    p = _paragraph(("label ", False), ("slot", False), (" tail", False))
+
+    assert coalesce_runs(p._p, exclude=[p.runs[1]._r]) == 0
+    assert [run.text for run in p.runs] == ["label ", "slot", " tail"]
+
+
+@pytest.mark.parametrize("options", [{"use_styles": True}, {"coalesce": True}])
+def test_xml_engine_matches_docx_engine(options):
+    template = FormTemplate(**options)
+    expected = FormRenderer(template, engine="docx").render_to_bytes(VALUES)
+    actual = FormRenderer(template, engine="xml").render_to_bytes(VALUES)
+
+    assert _part(actual, "word/document.xml") == _part(expected, "word/document.xml")
+    assert _part(actual, "word/styles.xml") == _part(expected, "word/styles.xml")
+
+
+def test_styles_shrink_the_document_and_keep_the_text():
+    plain = FormRenderer(FormTemplate()).render(VALUES)
+    styled = FormRenderer(FormTemplate(use_styles=True)).render(VALUES)
+
+    def texts(doc):
+        return [t.text for t in doc.element.body.iter("{*}t")]
+
+    assert texts(styled) == texts(plain)
+    styles = {style.name for style in styled.styles}
+    assert {PARAGRAPH_STYLE, *RUN_STYLES.values()} <= styles
+
+    plain_xml = _part(FormRenderer(FormTemplate()).render_to_bytes(VALUES), "word/document.xml")
+    styled_xml = _part(
+        FormRenderer(FormTemplate(use_styles=True)).render_to_bytes(VALUES), "word/document.xml"
+    )
+    assert len(styled_xml) < len(plain_xml)
@@ -0,0 +1,52 @@
+import threading
+
+from docx_meditation_form.integrations import DriveClientPool
+from docx_meditation_form.integrations.client_pool import drive_discovery_document
+
+
+def test_discovery_document_is_loaded_once():
+    assert drive_discovery_document() is drive_discovery_document()
+
+
+def test_clients_are_reused(fake_drive, drive_token):
+    pool = DriveClientPool(drive_token, base_url=fake_drive.url)
+
+    with pool.client() as first:
+        first.upload_file(b"PK", name="a.docx")
+    with pool.client() as second:
+        second.upload_file(b"PK", name="b.docx")
+
+    assert second is first
+    assert pool.stats() == {"hits": 1, "misses": 1, "idle": 1}
+    assert fake_drive.calls["upload"] == 2
+
+
+def test_idle_clients_are_capped(drive_token):
+    pool = DriveClientPool(drive_token, max_idle=2)
+    clients = [pool.acquire() for _ in range(3)]
+    assert len({id(client) for client in clients}) == 3
+    for client in clients:
+        pool.release(client)
+    assert pool.stats() == {"hits": 0, "misses": 3, "idle": 2}
+
+
+def test_concurrent_clients_are_distinct(fake_drive, drive_token):
+    pool = DriveClientPool(drive_token, base_url=fake_drive.url)
+    barrier = threading.Barrier(4)
+    used = []
+
+    def worker(n):
+        with pool.client() as client:
+            barrier.wait()
+            used.append(client)
+            client.upload_file(b"PK", name=f"{n}.docx")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(client) for client in used}) == 4
+    assert fake_drive.calls["upload"] == 4
+    assert pool.stats()["idle"] == 4
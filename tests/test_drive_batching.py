@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from bench_drive import run
+
+from docx_meditation_form.integrations import DriveClientPool, PermissionBatcher, UploadScheduler
+
+FILES = 30
+
+
+@pytest.mark.parametrize(
+    "strategy, http_requests",
+    [
+        # resumable upload: start + PUT per file, then one grant per file
+        ("per_file", 3 * FILES),
+        # one batch request for all the grants
+        ("batched", 2 * FILES + 1),
+        # one grant on the folder
+        ("shared_folder", 2 * FILES + 1),
+    ],
+)
+def test_sharing_strategy_request_counts(fake_drive, strategy, http_requests):
+    stats = run(fake_drive, strategy, FILES, threads=4)
+    assert stats["http_requests"] == http_requests
+    assert stats["all_shared"]
+
+
+def test_permission_batches_map_every_response_to_its_file(fake_drive, drive_token):
+    pool = DriveClientPool(drive_token, base_url=fake_drive.url)
+    scheduler = UploadScheduler(pool, rate=1e6, concurrency=4)
+    shared = []
+
+    with PermissionBatcher(scheduler, batch_size=7, on_shared=shared.extend) as permissions:
+        with ThreadPoolExecutor(4) as executor:
+            file_ids = list(
+                executor.map(
+                    lambda n: scheduler.upload(b"PK", name=f"form_{n}.docx"), range(FILES)
+                )
+            )
+        for file_id in file_ids:
+            permissions.add(file_id)
+
+    assert fake_drive.requests["batch"] == 5  # ceil(30 / 7)
+    assert fake_drive.public == set(file_ids)
+    assert sorted(shared) == sorted(file_ids)
+    assert permissions.failed == {}
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+from docx import Document
+
+from docx_meditation_form.core.form_patch import FormPatcher
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.dataset.form_values import FormValues
+
+ORIGINAL = FormValues(APPLICANT_NAME="Acme", DEFENDANT_NAME="Bank", APPLICANT_PHONE="022 1234")
+CHANGES = {
+    "APPLICANT_NAME": 'Smith & Sons <"Ltd">',
+    "APPLICANT_BRANCH_ADDRESS": "12 Long Street\nFort",
+    "DEFENDANT_PHONE": "\tspaced ",
+}
+
+PATCHER = FormPatcher()
+
+
+@pytest.mark.parametrize("engine", ["docx", "xml"])
+def test_patch_bytes_equals_a_fresh_render(engine):
+    renderer = FormRenderer(engine=engine)
+    source = renderer.render_to_bytes(ORIGINAL)
+
+    patched, changed = PATCHER.patch_bytes(source, CHANGES)
+
+    assert changed == ["APPLICANT_NAME", "APPLICANT_BRANCH_ADDRESS", "DEFENDANT_PHONE"]
+    assert patched == renderer.render_to_bytes(ORIGINAL.replace(**CHANGES))
+
+
+def test_patch_back_restores_the_original_bytes():
+    source = FormRenderer().render_to_bytes(ORIGINAL)
+    patched, _ = PATCHER.patch_bytes(source, CHANGES)
+
+    restored, changed = PATCHER.patch_bytes(patched, ORIGINAL)
+    assert sorted(changed) == sorted(CHANGES)
+    assert restored == source
+
+
+def test_read_returns_the_written_values():
+    values = ORIGINAL.replace(**CHANGES)
+    assert PATCHER.read(FormRenderer().render_to_bytes(values)) == values
+
+
+def test_patch_of_a_combined_document_changes_one_form(tmp_path):
+    path = tmp_path / "combined.docx"
+    second = FormValues(APPLICANT_NAME="Second")
+    FormRenderer(engine="xml").save_combined([ORIGINAL, second], str(path))
+
+    changed = PATCHER.patch(str(path), {"DEFENDANT_NAME": "Other bank"}, str(path), form=1)
+
+    assert changed == ["DEFENDANT_NAME"]
+    assert PATCHER.read(str(path), form=0) == ORIGINAL
+    assert PATCHER.read(str(path), form=1) == second.replace(DEFENDANT_NAME="Other bank")
+
+
+def test_unchanged_values_return_the_source():
+    source = FormRenderer().render_to_bytes(ORIGINAL)
+    patched, changed = PATCHER.patch_bytes(io.BytesIO(source), {"APPLICANT_NAME": "Acme"})
+    assert changed == []
+    assert patched == source
+
+
+def test_unknown_field_is_rejected():
+    source = FormRenderer().render_to_bytes(ORIGINAL)
+    with pytest.raises(TypeError):
+        PATCHER.patch_bytes(source, {"NOT_A_FIELD": "x"})
+
+
+def test_document_without_the_template_slots_is_rejected():
+    buffer = io.BytesIO()
+    Document().save(buffer)
+    with pytest.raises(ValueError):
+        PATCHER.read(buffer.getvalue())
@@ -0,0 +1,77 @@
+import io
+import threading
+
+from docx import Document
+
+from docx_meditation_form.core import form_template
+from docx_meditation_form.core.form_template import FormRenderer, FormTemplate
+from docx_meditation_form.core.package import save_document
+from docx_meditation_form.dataset.form_values import FormValues
+
+TEMPLATE = FormTemplate()
+
+
+def _saved(doc) -> bytes:
+    buffer = io.BytesIO()
+    save_document(doc, buffer)
+    return buffer.getvalue()
+
+
+def _texts(doc) -> list:
+    return [r.text for r in doc.element.body.iter() if r.tag.endswith("}t")]
+
+
+def test_new_document_matches_a_parsed_skeleton():
+    assert _saved(TEMPLATE.new_document()) == _saved(Document(io.BytesIO(TEMPLATE.skeleton)))
+
+
+def test_new_documents_are_independent_copies():
+    first = TEMPLATE.new_document()
+    TEMPLATE.fill(first, FormValues(APPLICANT_NAME="First"))
+    first.core_properties.title = "changed"
+
+    second = TEMPLATE.new_document()
+    assert "First" in _texts(first)
+    assert "First" not in _texts(second)
+    assert second.core_properties.title != "changed"
+    assert _saved(second) == _saved(Document(io.BytesIO(TEMPLATE.skeleton)))
+
+
+def test_render_fills_every_slot():
+    values = FormValues(APPLICANT_NAME="Acme & Co", DEFENDANT_NAME="Bank")
+    texts = _texts(FormRenderer(TEMPLATE).render(values))
+    assert "Acme & Co" in texts
+    assert "Bank" in texts
+
+
+def test_render_combined_without_values_leaves_only_the_section():
+    doc = FormRenderer(TEMPLATE).render_combined([])
+    assert [el.tag.rsplit("}", 1)[1] for el in doc.element.body] == ["sectPr"]
+
+
+def test_default_template_is_built_once_across_threads(monkeypatch):
+    built = []
+
+    class CountingTemplate(FormTemplate):
+        def __init__(self):
+            built.append(self)
+            super().__init__()
+
+    monkeypatch.setattr(form_template, "FormTemplate", CountingTemplate)
+    monkeypatch.setattr(FormRenderer, "_default_template", None)
+
+    barrier = threading.Barrier(4)
+    templates = []
+
+    def worker():
+        barrier.wait()
+        templates.append(FormRenderer().template)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
+    assert all(template is built[0] for template in templates)
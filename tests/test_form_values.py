@@ -0,0 +1,92 @@
+import hashlib
+import json
+import pickle
+
+import pytest
+
+from docx_meditation_form.dataset.form_values import (
+    FORM_FIELDS,
+    PLACEHOLDER,
+    PLACEHOLDER_FIELDS,
+    FormValues,
+)
+
+
+def test_defaults_are_empty_with_address_placeholders():
+    values = FormValues()
+    assert values.to_dict() == {
+        name: PLACEHOLDER if name in PLACEHOLDER_FIELDS else "" for name in FORM_FIELDS
+    }
+
+
+def test_values_are_normalized_to_strings():
+    values = FormValues(
+        APPLICANT_NAME=None,
+        APPLICANT_PHONE=0,
+        APPLICANT_MOBILE=9876543210,
+        APPLICANT_BRANCH_ADDRESS=0,
+        DEFENDANT_BRANCH_ADDRESS=None,
+        DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS="",
+        DEFENDANT_PHONE=12.5,
+    )
+    assert values.APPLICANT_NAME == ""
+    assert values.APPLICANT_PHONE == "0"
+    assert values.APPLICANT_MOBILE == "9876543210"
+    # a non-string 0 is a value, not an empty address
+    assert values.APPLICANT_BRANCH_ADDRESS == "0"
+    assert values.DEFENDANT_BRANCH_ADDRESS == PLACEHOLDER
+    assert values.DEFENDANT_CORRESPONDENCE_BRANCH_ADDRESS == PLACEHOLDER
+    assert values.DEFENDANT_PHONE == "12.5"
+    assert all(isinstance(value, str) for value in values)
+
+
+def test_from_dict_matches_the_constructor():
+    data = {"APPLICANT_NAME": "Acme", "APPLICANT_PHONE": 0, "DEFENDANT_BRANCH_ADDRESS": ""}
+    assert FormValues.from_dict(data) == FormValues(**data)
+    assert FormValues.from_dict({name: name for name in FORM_FIELDS}) == FormValues(
+        **{name: name for name in FORM_FIELDS}
+    )
+    assert FormValues.from_dict({"UNKNOWN": "x"}) == FormValues()
+    with pytest.raises(TypeError):
+        FormValues.from_dict({"UNKNOWN": "x"}, strict=True)
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", '"text"', "null"])
+def test_from_json_requires_an_object(text):
+    with pytest.raises(ValueError):
+        FormValues.from_json(text)
+
+
+def test_from_json():
+    assert FormValues.from_json(b'{"APPLICANT_NAME": "Acme"}') == FormValues(APPLICANT_NAME="Acme")
+
+
+def test_values_are_immutable_hashable_and_comparable():
+    values = FormValues(APPLICANT_NAME="Acme")
+    with pytest.raises(AttributeError):
+        values.APPLICANT_NAME = "changed"
+
+    same = FormValues(APPLICANT_NAME="Acme")
+    assert values == same and hash(values) == hash(same)
+    assert {values: 1}[same] == 1
+    assert values != FormValues(APPLICANT_NAME="Other")
+
+
+def test_replace_changes_fields_and_normalizes():
+    values = FormValues(APPLICANT_NAME="Acme", APPLICANT_BRANCH_ADDRESS="Fort")
+    changed = values.replace(APPLICANT_BRANCH_ADDRESS="", APPLICANT_PHONE=1)
+    assert changed.APPLICANT_NAME == "Acme"
+    assert changed.APPLICANT_BRANCH_ADDRESS == PLACEHOLDER
+    assert changed.APPLICANT_PHONE == "1"
+    with pytest.raises(TypeError):
+        values.replace(UNKNOWN="x")
+
+
+def test_pickle_and_content_hash():
+    values = FormValues(APPLICANT_NAME="Zoë", DEFENDANT_NAME="Bank")
+    restored = pickle.loads(pickle.dumps(values))
+    assert type(restored) is FormValues
+    assert restored == values
+
+    payload = json.dumps(list(values), ensure_ascii=False, separators=(",", ":"))
+    assert values.content_hash == hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,87 @@
+import io
+import pickle
+
+import pytest
+
+from docx_meditation_form.dataset.form_values import FORM_FIELDS, PLACEHOLDER, FormValues
+from docx_meditation_form.dataset.form_values_batch import FormValuesBatch, FormValuesRow
+
+RECORDS = [
+    {"APPLICANT_NAME": "Acme", "APPLICANT_PHONE": 0, "DEFENDANT_BRANCH_ADDRESS": "Fort"},
+    {"APPLICANT_NAME": None, "APPLICANT_BRANCH_ADDRESS": "", "DEFENDANT_MOBILE": 98.5},
+    {"APPLICANT_NAME": "", "APPLICANT_BRANCH_ADDRESS": " ", "DEFENDANT_EMAIL_ID": False},
+    {},
+]
+
+
+def _columns(records):
+    names = {name for record in records for name in record}
+    return {name: [record.get(name, "") for record in records] for name in names}
+
+
+@pytest.mark.parametrize("dedupe", [False, True])
+def test_batch_normalization_matches_from_dict(dedupe):
+    batch = FormValuesBatch(_columns(RECORDS), dedupe=dedupe)
+    expected = [FormValues.from_dict(record) for record in RECORDS]
+
+    assert batch.to_values() == expected
+    assert list(batch) == expected
+    assert FormValuesBatch.from_records(RECORDS).to_values() == expected
+
+
+def test_rows_expose_every_field_like_form_values():
+    batch = FormValuesBatch(_columns(RECORDS))
+    for row, record in zip(batch, RECORDS):
+        values = FormValues.from_dict(record)
+        assert [getattr(row, name) for name in FORM_FIELDS] == list(values)
+        assert row == values
+        assert hash(row) == hash(values)
+    assert batch[1].APPLICANT_BRANCH_ADDRESS == PLACEHOLDER
+    with pytest.raises(AttributeError):
+        batch[0].APPLICANT_NAME = "changed"
+
+
+def test_slices_and_chunks_share_storage():
+    batch = FormValuesBatch({"APPLICANT_NAME": [f"name {n}" for n in range(10)]})
+
+    view = batch[2:7]
+    chunks = list(batch.chunks(4))
+    assert view._columns is batch._columns
+    assert all(chunk._columns is batch._columns for chunk in chunks)
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert view.column("APPLICANT_NAME") == [f"name {n}" for n in range(2, 7)]
+    assert view[0] == batch[2]
+    assert view[-1] == batch[6]
+    with pytest.raises(IndexError):
+        view[5]
+
+
+def test_pickled_slice_carries_only_its_rows():
+    batch = FormValuesBatch({"APPLICANT_NAME": [f"name {n}" for n in range(1000)]})
+    view = batch[10:12]
+
+    restored = pickle.loads(pickle.dumps(view))
+    assert len(restored) == 2
+    assert all(len(column) == 2 for column in restored._columns)
+    assert restored.to_values() == view.to_values()
+    assert len(pickle.dumps(view)) < len(pickle.dumps(batch)) / 20
+
+    row = pickle.loads(pickle.dumps(batch[3]))
+    assert type(row) is FormValues
+    assert row == batch[3]
+
+
+def test_from_csv_pads_short_rows_and_skips_blank_lines():
+    source = io.StringIO("APPLICANT_NAME,DEFENDANT_NAME,NOTES\nAcme,Bank,x\n\nSolo\n")
+    batch = FormValuesBatch.from_csv(source)
+
+    assert len(batch) == 2
+    assert batch[1] == FormValues(APPLICANT_NAME="Solo")
+    assert isinstance(batch[0], FormValuesRow)
+    with pytest.raises(TypeError):
+        FormValuesBatch.from_csv(io.StringIO("NOTES\nx\n"), strict=True)
+
+
+def test_columns_of_different_lengths_are_rejected():
+    with pytest.raises(ValueError):
+        FormValuesBatch({"APPLICANT_NAME": ["a", "b"], "DEFENDANT_NAME": ["c"]})
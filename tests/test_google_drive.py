@@ -0,0 +1,55 @@
+import io
+
+import pytest
+
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.dataset.form_values import FormValues
+from docx_meditation_form.integrations import DriveClientPool
+
+VALUES = FormValues(APPLICANT_NAME="Acme")
+
+
+@pytest.fixture
+def uploader(fake_drive, drive_token):
+    with DriveClientPool(drive_token, base_url=fake_drive.url).client() as client:
+        yield client
+
+
+def test_render_to_bytes_and_stream_match_a_saved_file(tmp_path):
+    renderer = FormRenderer()
+    path = tmp_path / "form.docx"
+    renderer.save(VALUES, str(path))
+
+    stream = io.BytesIO()
+    renderer.render_to_stream(VALUES, stream)
+
+    data = renderer.render_to_bytes(VALUES)
+    assert data == path.read_bytes()
+    assert stream.getvalue() == data
+    assert stream.tell() == len(data)
+
+
+@pytest.mark.parametrize("kind", ["bytes", "stream", "path"])
+def test_upload_from_memory_or_disk(fake_drive, uploader, tmp_path, kind):
+    data = FormRenderer().render_to_bytes(VALUES)
+    path = tmp_path / "form.docx"
+    path.write_bytes(data)
+    source = {"bytes": data, "stream": io.BytesIO(data), "path": path}[kind]
+
+    file_id = uploader.upload_file(
+        source, name=None if kind == "path" else "form.docx", drive_folder_id="folder"
+    )
+
+    assert fake_drive.contents[file_id] == data
+    assert fake_drive.calls["upload"] == 1
+
+
+def test_in_memory_upload_requires_a_name(fake_drive, uploader):
+    with pytest.raises(ValueError):
+        uploader.upload_file(b"PK")
+    assert fake_drive.calls["upload"] == 0
+
+
+def test_missing_path_is_reported(uploader, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        uploader.upload_file(tmp_path / "missing.docx")
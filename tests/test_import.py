@@ -0,0 +1,71 @@
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative `import docx_meditation_form` time (python-docx and lxml are
+# most of it, ~90 ms on a laptop); generous for slow CI machines
+IMPORT_BUDGET_MS = 300
+
+# Not needed to render a form: optional extras, or only used by a few functions
+LAZY_MODULES = (
+    "googleapiclient",
+    "google.oauth2",
+    "aiohttp",
+    "cProfile",
+    "tracemalloc",
+    "concurrent.futures",
+    "urllib.request",
+    "http.client",
+    "xml.sax.saxutils",
+)
+
+
+def _run(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout, result.stderr
+
+
+def _import_ms(stderr):
+    """Cumulative time of the package from ``-X importtime`` output."""
+    for line in stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "docx_meditation_form":
+            return int(fields[1]) / 1000
+    raise AssertionError("docx_meditation_form missing from -X importtime output")
+
+
+def test_import_does_not_load_unneeded_modules():
+    stdout, _ = _run(
+        "import json, sys, docx_meditation_form\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    assert json.loads(stdout) == []
+
+
+@pytest.mark.skipif(sys.flags.dev_mode, reason="dev mode slows imports down")
+def test_import_time_within_budget():
+    times = [_import_ms(_run("import docx_meditation_form")[1]) for _ in range(3)]
+    assert statistics.median(times) < IMPORT_BUDGET_MS, times
+
+
+def test_lazy_exports_still_resolve():
+    stdout, _ = _run(
+        "import docx_meditation_form\n"
+        "from docx_meditation_form.core import instrumentation, render_many\n"
+        "with instrumentation.capture_profile(memory=False) as report:\n"
+        "    pass\n"
+        "print(bool(report.stats_text()))"
+    )
+    assert stdout.strip() == "True"
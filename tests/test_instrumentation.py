@@ -0,0 +1,105 @@
+import os
+import re
+import threading
+
+import pytest
+
+from docx_meditation_form.core import instrumentation
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.dataset.form_values import FormValues
+
+VALUES = FormValues(APPLICANT_NAME="Acme", DEFENDANT_PHONE="022-1234")
+
+
+@pytest.fixture
+def registry():
+    registry = instrumentation.HistogramRegistry()
+    instrumentation.enable(registry)
+    yield registry
+    instrumentation.disable(registry)
+
+
+def _counters(registry):
+    return registry.snapshot()["counters"]
+
+
+@pytest.mark.parametrize("engine", FormRenderer.ENGINES)
+def test_output_bytes_counts_stream_output(registry, engine):
+    renderer = FormRenderer(engine=engine)
+    data = renderer.render_to_bytes(VALUES)
+
+    counters = _counters(registry)
+    assert counters["forms"] == 1
+    assert counters["output_bytes"] == len(data)
+
+
+@pytest.mark.parametrize("engine", FormRenderer.ENGINES)
+def test_output_bytes_on_pipe(registry, engine):
+    renderer = FormRenderer(engine=engine)
+    read_fd, write_fd = os.pipe()
+    received = []
+    reader = threading.Thread(target=lambda: received.append(os.fdopen(read_fd, "rb").read()))
+    reader.start()
+    with os.fdopen(write_fd, "wb") as pipe:
+        renderer.render_to_stream(VALUES, pipe)
+    reader.join()
+
+    assert received[0]
+    assert _counters(registry)["output_bytes"] == len(received[0])
+
+
+@pytest.mark.parametrize("engine", FormRenderer.ENGINES)
+def test_output_bytes_when_overwriting_a_file(registry, tmp_path, engine):
+    renderer = FormRenderer(engine=engine)
+    path = tmp_path / "form.out"
+    path.write_bytes(b"x" * 500_000)
+
+    renderer.save(VALUES, path)
+
+    assert _counters(registry)["output_bytes"] == path.stat().st_size
+
+
+def test_save_without_instrumentation_writes_the_same_bytes(tmp_path):
+    renderer = FormRenderer(engine="xml")
+    plain = tmp_path / "plain.docx"
+    renderer.save(VALUES, plain)
+
+    registry = instrumentation.HistogramRegistry()
+    instrumentation.enable(registry)
+    try:
+        counted = tmp_path / "counted.docx"
+        renderer.save(VALUES, counted)
+    finally:
+        instrumentation.disable(registry)
+
+    assert plain.read_bytes() == counted.read_bytes()
+
+
+# one sample line of the Prometheus text format: name, optional labels, value
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_]\w*="(?:[^"\\]|\\.)*",?)*\})? (\S+)$')
+
+
+def _parse_prometheus(text):
+    """Sample name -> value; fails on any line that is not valid exposition text."""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("# "):
+            kind, name = line.split()[1:3]
+            assert kind in ("HELP", "TYPE")
+            assert re.fullmatch(r"[a-zA-Z_:][a-zA-Z0-9_:]*", name), line
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        samples[match.group(1) + (match.group(2) or "")] = float(match.group(3))
+    return samples
+
+
+def test_prometheus_names_are_valid_for_dotted_names():
+    registry = instrumentation.HistogramRegistry()
+    registry.increment("drive.batches", 2)
+    registry.observe('drive.upload "x"', 0.01)
+
+    samples = _parse_prometheus(instrumentation.PrometheusExporter(registry).render())
+
+    assert samples["docx_form_drive_batches_total"] == 2
+    assert samples['docx_form_stage_seconds_count{stage="drive.upload \\"x\\""}'] == 1
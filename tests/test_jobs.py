@@ -0,0 +1,160 @@
+import threading
+import time
+
+import pytest
+
+from docx_meditation_form.dataset.form_values import FormValues
+from docx_meditation_form.jobs import DEAD, DONE, QUEUED, RUNNING, JobQueue, work
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=3, retry_delay=0.0)
+    yield queue
+    queue.close()
+
+
+def _submit(queue, **kwargs):
+    return queue.submit(FormValues(APPLICANT_NAME="Acme"), **kwargs)
+
+
+def test_submit_claim_complete(queue):
+    job_id = _submit(queue)
+    assert queue.get(job_id).status == QUEUED
+
+    job = queue.claim()
+    assert job.id == job_id
+    assert job.status == RUNNING
+    assert job.attempts == 1
+    assert job.token
+    assert job.values.APPLICANT_NAME == "Acme"
+    assert queue.claim() is None
+
+    assert queue.complete(job_id, "file-1", token=job.token)
+    done = queue.get(job_id)
+    assert done.status == DONE
+    assert done.file_id == "file-1"
+    assert done.url == "https://drive.google.com/file/d/file-1"
+    assert queue.pending() == 0
+
+
+def test_fail_backs_off_then_dead_letters(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=2, retry_delay=60.0)
+    job_id = _submit(queue)
+
+    job = queue.claim()
+    assert queue.fail(job_id, RuntimeError("drive down"), token=job.token) == QUEUED
+    failed = queue.get(job_id)
+    assert failed.status == QUEUED
+    assert "drive down" in failed.error
+    # backoff: not ready yet
+    assert queue.claim() is None
+
+    queue.retry_delay = 0.0
+    queue._connect().execute("UPDATE jobs SET run_after = 0 WHERE id = ?", (job_id,))
+    job = queue.claim()
+    assert job.attempts == 2
+    assert queue.fail(job_id, RuntimeError("still down"), token=job.token) == DEAD
+
+    dead = queue.jobs(DEAD)
+    assert [job.id for job in dead] == [job_id]
+    assert "still down" in dead[0].error
+    assert queue.claim() is None
+    queue.close()
+
+
+def test_retry_requeues_dead_job(queue):
+    job_id = _submit(queue, max_attempts=1)
+    job = queue.claim()
+    assert queue.fail(job_id, RuntimeError("boom"), token=job.token) == DEAD
+
+    assert queue.retry(job_id)
+    assert not queue.retry(job_id)  # only dead jobs
+    requeued = queue.get(job_id)
+    assert requeued.status == QUEUED
+    assert requeued.attempts == 0
+
+    job = queue.claim()
+    assert job.id == job_id
+    assert job.attempts == 1
+
+
+def test_expired_lease_is_claimed_again(queue):
+    job_id = _submit(queue)
+    first = queue.claim(lease=0.05)
+    assert queue.claim(lease=0.05) is None
+
+    time.sleep(0.1)
+    second = queue.claim()
+    assert second.id == job_id
+    assert second.attempts == 2
+    assert second.token != first.token
+
+
+def test_expired_lease_without_attempts_left_is_dead(queue):
+    job_id = _submit(queue, max_attempts=1)
+    queue.claim(lease=0.05)
+    time.sleep(0.1)
+
+    assert queue.claim() is None
+    assert queue.get(job_id).status == DEAD
+
+
+def test_stale_worker_cannot_fail_reclaimed_job(queue):
+    job_id = _submit(queue)
+    stale = queue.claim(lease=0.05)
+    time.sleep(0.1)
+    current = queue.claim()
+
+    assert queue.fail(job_id, RuntimeError("late"), token=stale.token) is None
+    assert not queue.renew(job_id, stale.token)
+    assert queue.get(job_id).status == RUNNING
+    assert queue.claim() is None  # not handed out a third time
+
+    assert queue.complete(job_id, "file-2", token=current.token)
+    assert queue.get(job_id).file_id == "file-2"
+
+
+def test_stale_worker_cannot_complete_reclaimed_job(queue):
+    job_id = _submit(queue)
+    stale = queue.claim(lease=0.05)
+    time.sleep(0.1)
+    current = queue.claim()
+
+    assert not queue.complete(job_id, "stale-file", token=stale.token)
+    job = queue.get(job_id)
+    assert job.status == RUNNING
+    assert job.file_id is None
+
+    assert queue.fail(job_id, RuntimeError("boom"), token=current.token) == QUEUED
+
+
+def test_renew_extends_lease(queue):
+    job_id = _submit(queue)
+    job = queue.claim(lease=0.05)
+    assert queue.renew(job_id, job.token, lease=60.0)
+    time.sleep(0.1)
+    assert queue.claim() is None
+
+
+def test_worker_renews_lease_during_slow_upload(tmp_path):
+    path = tmp_path / "jobs.db"
+    queue = JobQueue(path)
+    job_id = _submit(queue)
+    claims = []
+
+    def upload(data: bytes) -> str:
+        # a second claim while the upload runs would mean a duplicate upload
+        time.sleep(0.3)
+        claims.append(queue.claim())
+        stop.set()
+        return "file-3"
+
+    stop = threading.Event()
+    work(path, upload, lease=0.1, poll_interval=0.01, stop=stop)
+
+    assert claims == [None]
+    job = queue.get(job_id)
+    assert job.status == DONE
+    assert job.attempts == 1
+    queue.close()
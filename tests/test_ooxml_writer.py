@@ -0,0 +1,69 @@
+import io
+import zipfile
+
+import pytest
+
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.dataset.form_values import FORM_FIELDS, FormValues
+
+FILLED = FormValues(**{name: f"{name.title()} value" for name in FORM_FIELDS})
+
+ESCAPING = FormValues(
+    APPLICANT_NAME='Smith & Sons <"Ltd">',
+    APPLICANT_BRANCH_ADDRESS="12 Long Street\nFort\nMumbai",
+    APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS="",
+    APPLICANT_PHONE="022\t1234",
+    APPLICANT_EMAIL_ID="a&b@example.com",
+    DEFENDANT_NAME="<Bank> of 'India'",
+    DEFENDANT_BRANCH_ADDRESS="\n\tleading and trailing\t\n",
+    DEFENDANT_PHONE="  spaced  ",
+    DEFENDANT_EMAIL_ID="]]> <![CDATA[",
+)
+
+CASES = {"default": FormValues(), "filled": FILLED, "escaping": ESCAPING}
+
+
+def _document_xml(data: bytes) -> bytes:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return archive.read("word/document.xml")
+
+
+def _combined(engine: str, values) -> bytes:
+    out = io.BytesIO()
+    FormRenderer(engine=engine).save_combined(values, out)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_single_document_matches_docx_engine(case):
+    values = CASES[case]
+    expected = FormRenderer(engine="docx").render_to_bytes(values)
+    actual = FormRenderer(engine="xml").render_to_bytes(values)
+
+    assert _document_xml(actual) == _document_xml(expected)
+
+
+def test_combined_document_matches_docx_engine():
+    values = list(CASES.values())
+    expected = _combined("docx", values)
+    actual = _combined("xml", values)
+
+    assert _document_xml(actual) == _document_xml(expected)
+
+
+def test_combined_single_form_matches_single_document():
+    single = FormRenderer(engine="xml").render_to_bytes(ESCAPING)
+    combined = _combined("xml", [ESCAPING])
+
+    assert _document_xml(combined) == _document_xml(single)
+
+
+def test_document_is_a_valid_zip_with_the_same_parts():
+    expected = FormRenderer(engine="docx").render_to_bytes(FILLED)
+    actual = FormRenderer(engine="xml").render_to_bytes(FILLED)
+
+    with zipfile.ZipFile(io.BytesIO(actual)) as archive:
+        assert archive.testzip() is None
+        names = set(archive.namelist())
+    with zipfile.ZipFile(io.BytesIO(expected)) as archive:
+        assert names == set(archive.namelist())
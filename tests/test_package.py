@@ -0,0 +1,132 @@
+import io
+import pickle
+import zipfile
+import zlib
+
+import pytest
+
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.core.package import (
+    BLOCK_SIZE,
+    DEFAULT_LEVEL,
+    FastPackageZip,
+    PartCache,
+    SaveBackend,
+    save_document,
+)
+from docx_meditation_form.dataset.form_values import FormValues
+
+
+def _entries(data: bytes) -> dict:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_save_document_writes_the_same_entries_as_python_docx():
+    doc = FormRenderer(engine="docx").render(FormValues(APPLICANT_NAME="Acme"))
+
+    expected = io.BytesIO()
+    doc.save(expected)
+    actual = io.BytesIO()
+    save_document(doc, actual)
+
+    expected_entries = _entries(expected.getvalue())
+    actual_entries = _entries(actual.getvalue())
+    assert list(actual_entries) == list(expected_entries)
+    assert actual_entries == expected_entries
+
+
+def _members(data: bytes) -> dict:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        return {info.filename: (info.compress_type, archive.read(info)) for info in archive.infolist()}
+
+
+@pytest.mark.parametrize("engine", ["docx", "xml"])
+def test_fast_writer_matches_zipfile_byte_for_byte(engine):
+    values = FormValues(APPLICANT_NAME="Acme")
+    expected = FormRenderer(engine=engine).render_to_bytes(values)
+    for _ in range(2):  # the second render reuses the cached static parts
+        actual = FormRenderer(engine=engine, backend=SaveBackend("fast")).render_to_bytes(values)
+        assert actual == expected
+
+
+@pytest.mark.parametrize("writer", SaveBackend.WRITERS)
+def test_compression_levels(writer):
+    values = FormValues(APPLICANT_NAME="Acme")
+    sizes = {}
+    for level in (0, 1, 9):
+        renderer = FormRenderer(engine="xml", backend=SaveBackend(writer, level=level))
+        data = renderer.render_to_bytes(values)
+        members = _members(data)
+        methods = {method for method, _ in members.values()}
+        assert methods == ({zipfile.ZIP_STORED} if level == 0 else {zipfile.ZIP_DEFLATED})
+        sizes[level] = len(data)
+    assert sizes[0] > sizes[1] > sizes[9]
+
+
+class _Unseekable(io.RawIOBase):
+    """Write-only stream that cannot seek or tell."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+
+@pytest.mark.parametrize("seekable", [True, False])
+def test_parallel_deflate_of_a_streamed_member(seekable):
+    blob = b"".join(b"line %d of a large part\n" % n for n in range(200_000))
+    assert len(blob) > 2 * BLOCK_SIZE
+
+    target = io.BytesIO() if seekable else _Unseekable()
+    with FastPackageZip(target, threads=3) as zf:
+        zf.write("small.xml", b"<small/>")
+        with zf.open("large.xml") as member:
+            for start in range(0, len(blob), 100_000):
+                member.write(blob[start : start + 100_000])
+
+    data = target.getvalue() if seekable else bytes(target.data)
+    members = _members(data)
+    assert members["large.xml"][1] == blob
+    assert members["small.xml"][1] == b"<small/>"
+    # within a fraction of a percent of serial deflate
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        parallel = archive.getinfo("large.xml").compress_size
+    serial = len(zlib.compress(blob, DEFAULT_LEVEL))
+    assert parallel < serial * 1.01
+
+
+def test_part_cache_never_serves_a_changed_part():
+    cache = PartCache()
+    first = io.BytesIO()
+    with FastPackageZip(first, cache=cache) as zf:
+        zf.write("word/styles.xml", b"<styles>one</styles>")
+    second = io.BytesIO()
+    with FastPackageZip(second, cache=cache) as zf:
+        zf.write("word/styles.xml", b"<styles>two</styles>")
+    third = io.BytesIO()
+    with FastPackageZip(third, cache=cache) as zf:
+        zf.write("word/styles.xml", b"<styles>two</styles>")
+
+    assert _members(second.getvalue())["word/styles.xml"][1] == b"<styles>two</styles>"
+    assert third.getvalue() == second.getvalue()
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_save_backend_validation_and_pickling():
+    with pytest.raises(ValueError):
+        SaveBackend("7z")
+    with pytest.raises(ValueError):
+        SaveBackend(level=10)
+
+    backend = SaveBackend("fast", level=1, threads=4, precompress=False)
+    restored = pickle.loads(pickle.dumps(backend))
+    assert restored == backend
+    assert restored.precompress is False
+    assert len({SaveBackend().key, SaveBackend("fast").key, backend.key, SaveBackend("fast", threads=2).key}) == 4
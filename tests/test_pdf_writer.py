@@ -0,0 +1,117 @@
+import io
+import re
+import zlib
+
+from docx_meditation_form.core.form_template import FormRenderer
+from docx_meditation_form.core.pdf_writer import PAGE_WIDTH, PdfWriter, _measure
+from docx_meditation_form.dataset.form_values import FormValues
+
+WRITER = PdfWriter()
+
+_OBJECT = re.compile(rb"(\d+) 0 obj\n")
+_STREAM = re.compile(rb"<< /Length (\d+) /Filter /FlateDecode >>\nstream\n")
+_SHOW = re.compile(rb"\(((?:[^\\)]|\\.)*)\) Tj")
+
+
+def _objects(pdf: bytes) -> dict:
+    """
+    Check the header, xref table and trailer of `pdf` and return its
+    objects: number -> body, with streams decompressed.
+    """
+    assert pdf.startswith(b"%PDF-1.4\n")
+    startxref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", pdf).group(1))
+    table = re.compile(rb"xref\n0 (\d+)\n").match(pdf, startxref)
+    assert table is not None
+    size = int(table.group(1))
+    entries = pdf[table.end() : table.end() + 20 * size]
+    assert entries[:20] == b"0000000000 65535 f \n"
+    trailer = pdf[table.end() + 20 * size :]
+    assert trailer.startswith(b"trailer\n<< /Size %d /Root 1 0 R /Info 5 0 R >>" % size)
+
+    objects = {}
+    for number in range(1, size):
+        entry = entries[20 * number : 20 * number + 20]
+        if entry[17:18] == b"f":
+            continue
+        offset = int(entry[:10])
+        header = _OBJECT.match(pdf, offset)
+        assert header is not None and int(header.group(1)) == number
+        stream = _STREAM.match(pdf, header.end())
+        if stream is None:
+            end = pdf.index(b"\nendobj\n", header.end())
+            objects[number] = pdf[header.end() : end]
+        else:
+            start = stream.end()
+            end = start + int(stream.group(1))
+            assert pdf[end:].startswith(b"\nendstream\nendobj\n")
+            objects[number] = zlib.decompress(pdf[start:end])
+    return objects
+
+
+def _pages(pdf: bytes) -> list:
+    """Content streams of the pages, in page order."""
+    objects = _objects(pdf)
+    kids = [int(kid) for kid in re.findall(rb"(\d+) 0 R", objects[2].split(b"/Count")[0])]
+    count = int(re.search(rb"/Count (\d+)", objects[2]).group(1))
+    assert count == len(kids)
+    contents = []
+    for kid in kids:
+        assert objects[kid].startswith(b"<< /Type /Page /Parent 2 0 R")
+        contents.append(objects[int(re.search(rb"/Contents (\d+) 0 R", objects[kid]).group(1))])
+    return contents
+
+
+def _shown(content: bytes) -> list:
+    """Strings drawn by ``Tj``, decoded from WinAnsi."""
+    return [
+        re.sub(rb"\\(.)", rb"\1", text).decode("cp1252") for text in _SHOW.findall(content)
+    ]
+
+
+def _pdf(values_list) -> bytes:
+    buffer = io.BytesIO()
+    WRITER.save_many(values_list, buffer)
+    return buffer.getvalue()
+
+
+def test_single_form_structure_and_text():
+    values = FormValues(APPLICANT_NAME="Acme (India) \\ Ltd", DEFENDANT_NAME="Bank")
+    pdf = WRITER.render_bytes(values)
+
+    (content,) = _pages(pdf)
+    shown = _shown(content)
+    assert "Acme (India) \\ Ltd" in shown
+    assert "Bank" in shown
+    assert pdf == WRITER.render_bytes(values)
+    assert pdf == FormRenderer(engine="pdf").render_to_bytes(values)
+
+
+def test_one_page_per_form():
+    pdf = _pdf([FormValues(APPLICANT_NAME=f"Applicant {n}") for n in range(3)])
+    pages = _pages(pdf)
+    assert len(pages) == 3
+    assert ["Applicant 2" in _shown(page) for page in pages] == [False, False, True]
+
+
+def test_no_forms_is_a_valid_empty_document():
+    buffer = io.BytesIO()
+    assert WRITER.save_many(iter([]), buffer) == 0
+    assert _pages(buffer.getvalue()) == []
+
+
+def test_overlong_values_wrap_inside_the_page():
+    word = "X" * 3000
+    address = " ".join(["Long Street"] * 200)
+    pdf = WRITER.render_bytes(FormValues(APPLICANT_NAME=word, APPLICANT_BRANCH_ADDRESS=address))
+
+    shown = _shown(_pages(pdf)[0])
+    pieces = [text for text in shown if set(text) == {"X"}]
+    assert len(pieces) > 1
+    assert "".join(pieces) == word
+    assert all(_measure(text.rstrip(" "), False) < PAGE_WIDTH for text in shown)
+    assert sum(text.count("Long Street") for text in shown) == 200
+
+
+def test_characters_outside_cp1252_become_question_marks():
+    pdf = WRITER.render_bytes(FormValues(APPLICANT_NAME="Zoë pays €5 or ₹100 日本"))
+    assert "Zoë pays €5 or ?100 ??" in _shown(_pages(pdf)[0])
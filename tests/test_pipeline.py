@@ -0,0 +1,123 @@
+import json
+import threading
+
+from docx_meditation_form.core.pipeline import Checkpoint, read_records, run_pipeline
+
+
+def _records(n):
+    return [(index, {"APPLICANT_NAME": f"Applicant {index}"}) for index in range(n)]
+
+
+class FakeDrive:
+    """Upload and share callables recording what they were called with."""
+
+    def __init__(self):
+        self.uploads = []
+        self.shared = []
+        self._lock = threading.Lock()
+
+    def upload(self, path):
+        with self._lock:
+            self.uploads.append(path.name)
+            return f"file-{path.stem}"
+
+    def share(self, file_id):
+        with self._lock:
+            self.shared.append(file_id)
+
+
+def _run(tmp_path, drive, records, **kwargs):
+    with Checkpoint(tmp_path / "batch.checkpoint") as checkpoint:
+        stats = run_pipeline(
+            records,
+            tmp_path / "out",
+            checkpoint=checkpoint,
+            upload=drive.upload,
+            executor="thread",
+            workers=2,
+            upload_workers=2,
+            **kwargs,
+        )
+    return stats
+
+
+def test_resume_skips_done_and_retries_failed_records(tmp_path):
+    records = _records(4)
+    records[2] = (2, ValueError("bad line"))
+    drive = FakeDrive()
+    stats = _run(tmp_path, drive, records)
+    assert (stats.uploaded, stats.failed) == (3, 1)
+
+    again = FakeDrive()
+    records[2] = (2, {"APPLICANT_NAME": "Fixed"})
+    stats = _run(tmp_path, again, records)
+    assert (stats.skipped, stats.uploaded, stats.failed) == (3, 1, 0)
+    assert len(again.uploads) == 1
+
+
+def test_upload_is_not_done_until_shared(tmp_path):
+    drive = FakeDrive()
+    _run(tmp_path, drive, _records(3), share=drive.share)
+    assert sorted(drive.shared) == [f"file-form_{index:06d}" for index in range(3)]
+
+    # killed before the permission batch: nothing is done, everything unshared
+    checkpoint = Checkpoint(tmp_path / "batch.checkpoint")
+    assert checkpoint.done == set()
+    assert sorted(checkpoint.unshared) == [0, 1, 2]
+    checkpoint.close()
+
+    # the next run shares them again instead of uploading them again
+    again = FakeDrive()
+    stats = _run(tmp_path, again, _records(3), share=again.share)
+    assert again.uploads == []
+    assert stats.skipped == 3
+    assert sorted(again.shared) == sorted(drive.shared)
+
+
+def test_record_shared_marks_records_done(tmp_path):
+    drive = FakeDrive()
+    shared_ok = []
+
+    def share(file_id):
+        drive.share(file_id)
+        # only the first file's grant succeeds
+        if file_id == "file-form_000000":
+            shared_ok.append(file_id)
+
+    with Checkpoint(tmp_path / "batch.checkpoint") as checkpoint:
+        run_pipeline(
+            _records(2),
+            tmp_path / "out",
+            checkpoint=checkpoint,
+            upload=drive.upload,
+            share=share,
+            executor="thread",
+        )
+        checkpoint.record_shared(shared_ok + ["unknown-file"])
+
+    checkpoint = Checkpoint(tmp_path / "batch.checkpoint")
+    assert checkpoint.done == {0}
+    assert list(checkpoint.unshared) == [1]
+    checkpoint.close()
+
+
+def test_checkpoint_ignores_a_torn_last_line(tmp_path):
+    path = tmp_path / "batch.checkpoint"
+    with Checkpoint(path) as checkpoint:
+        checkpoint.record(0, status="ok", file_id="file-0")
+    with path.open("a") as fh:
+        fh.write('{"index": 1, "sta')
+
+    checkpoint = Checkpoint(path)
+    assert checkpoint.done == {0}
+    checkpoint.close()
+
+
+def test_read_records_yields_parse_errors_in_place(tmp_path):
+    path = tmp_path / "input.jsonl"
+    path.write_text(json.dumps({"APPLICANT_NAME": "A"}) + "\n\n[1]\n{oops\n", encoding="utf-8")
+
+    records = list(read_records(path))
+    assert [index for index, _ in records] == [0, 2, 3]
+    assert records[0][1] == {"APPLICANT_NAME": "A"}
+    assert all(isinstance(record, ValueError) for _, record in records[1:])
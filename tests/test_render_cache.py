@@ -0,0 +1,78 @@
+import os
+import time
+
+from docx_meditation_form.core.render_cache import DISK_LOW_WATER, RenderCache
+
+
+def _directory_bytes(directory):
+    return sum(path.stat().st_size for path in directory.glob("*/*") if path.suffix in (".docx", ".json"))
+
+
+def _key(n):
+    return f"{n:02x}" + "0" * 62
+
+
+def test_disk_hit_survives_a_new_cache(tmp_path):
+    cache = RenderCache(tmp_path)
+    cache.put(_key(1), b"docx bytes")
+    cache.set_drive_file_id(_key(1), "file-1")
+
+    reopened = RenderCache(tmp_path)
+    entry = reopened.get(_key(1))
+    assert entry.data == b"docx bytes"
+    assert entry.drive_file_id == "file-1"
+    assert reopened.get(_key(2)) is None
+
+    stats = reopened.stats()
+    assert (stats["disk_hits"], stats["misses"]) == (1, 1)
+    assert stats["disk_bytes"] == _directory_bytes(tmp_path)
+
+
+def test_disk_bytes_track_overwrites_and_sidecars(tmp_path):
+    cache = RenderCache(tmp_path)
+    cache.put(_key(1), b"x" * 100)
+    cache.put(_key(1), b"y" * 40, drive_file_id="file-1")
+    cache.put(_key(1), b"z" * 40, drive_file_id="file-2")
+    cache.set_drive_file_id(_key(1), "file-3")
+
+    assert cache.stats()["disk_bytes"] == _directory_bytes(tmp_path)
+    assert RenderCache(tmp_path).get(_key(1)).drive_file_id == "file-3"
+
+
+def test_disk_evicts_least_recently_used_down_to_low_water(tmp_path):
+    cache = RenderCache(tmp_path, max_items=1, max_disk_bytes=1000)
+    old = time.time() - 100
+    for n in range(9):
+        cache.put(_key(n), b"x" * 100)
+        # distinct modification times, oldest first
+        os.utime(cache._path(_key(n), ".docx"), (old + n, old + n))
+    # reading entry 0 makes it the most recently used
+    cache.get(_key(0))
+
+    cache.put(_key(9), b"x" * 200)
+
+    stats = cache.stats()
+    assert stats["disk_bytes"] == _directory_bytes(tmp_path)
+    assert stats["disk_bytes"] <= 1000 * DISK_LOW_WATER
+    # 1100 bytes: trimmed to 900, not just under 1000
+    assert stats["disk_evictions"] == 2
+    survivors = {path.stem for path in tmp_path.glob("*/*.docx")}
+    assert survivors == {_key(n) for n in (0, 3, 4, 5, 6, 7, 8, 9)}
+
+
+def test_put_under_the_limit_does_not_scan(tmp_path, monkeypatch):
+    cache = RenderCache(tmp_path, max_disk_bytes=10_000)
+    monkeypatch.setattr(cache, "_disk_files", lambda: 1 / 0)
+    for n in range(10):
+        cache.put(_key(n), b"x" * 100)
+    assert cache.stats()["disk_evictions"] == 0
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = RenderCache(tmp_path)
+    cache.put(_key(1), b"data", drive_file_id="file-1")
+    cache.clear()
+
+    assert cache.get(_key(1)) is None
+    assert _directory_bytes(tmp_path) == 0
+    assert cache.stats()["disk_bytes"] == 0
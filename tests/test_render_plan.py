@@ -0,0 +1,69 @@
+import pytest
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+from docx_meditation_form.core.form_template import FormRenderer, FormTemplate
+from docx_meditation_form.core.render_plan import FORM_PLAN, RenderPlan
+from docx_meditation_form.dataset.form_content import (
+    FORM_ROWS,
+    CellSpec,
+    ParagraphSpec,
+    RunSpec,
+)
+from docx_meditation_form.dataset.form_values import FORM_FIELDS, FormValues
+
+VALUES = FormValues(**{name: f"<{name}>" for name in FORM_FIELDS})
+
+
+def _cell_texts(doc):
+    table = doc.tables[0]
+    return [[cell.text for cell in row.cells] for row in table.rows]
+
+
+def test_form_plan_binds_every_field_once_in_form_order():
+    assert FORM_PLAN.fields == FORM_FIELDS
+    assert [row for row, _ in FORM_PLAN.cells()] == sorted(
+        row for row, cells in FORM_ROWS.items() for _ in cells
+    )
+
+
+def test_plan_writes_labels_and_values_into_their_cells():
+    rows = _cell_texts(FormRenderer(FormTemplate()).render(VALUES))
+    assert rows[1][2] == "<APPLICANT_NAME>"
+    assert rows[9][2] == "<DEFENDANT_NAME>"
+    assert "<APPLICANT_BRANCH_ADDRESS>" in rows[3][2]
+    assert "<APPLICANT_CORRESPONDENCE_BRANCH_ADDRESS>" in rows[3][2]
+    assert rows[4][1] == "Telephone No."
+
+
+def test_custom_plan_renders_only_its_rows():
+    plan = RenderPlan(
+        {
+            0: (CellSpec(0, [ParagraphSpec([RunSpec("Custom title", bold=True)], align="center")]),),
+            1: (
+                CellSpec(1, [ParagraphSpec([RunSpec("Name")])]),
+                CellSpec(2, [ParagraphSpec([RunSpec(field="APPLICANT_NAME")])]),
+            ),
+        }
+    )
+    assert plan.fields == ("APPLICANT_NAME",)
+
+    doc = FormRenderer(FormTemplate(plan=plan)).render(VALUES)
+    rows = _cell_texts(doc)
+    assert rows[0][0] == "Custom title"
+    assert rows[1][1:] == ["Name", "<APPLICANT_NAME>"]
+    assert all(text == "" for row in rows[2:] for text in row)
+    title = doc.tables[0].rows[0].cells[0].paragraphs[0]
+    assert title.alignment == WD_ALIGN_PARAGRAPH.CENTER
+    assert title.runs[0].bold
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        CellSpec(0, [ParagraphSpec([RunSpec("x")], align="justify")]),
+        CellSpec(0, [ParagraphSpec([RunSpec("x")])], valign="middle"),
+    ],
+)
+def test_unknown_alignment_is_rejected(spec):
+    with pytest.raises(ValueError):
+        RenderPlan({0: (spec,)})
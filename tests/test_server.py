@@ -0,0 +1,344 @@
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from docx_meditation_form.core.render_cache import RenderCache
+from docx_meditation_form.dataset.form_values import FormValues
+from docx_meditation_form.integrations.async_drive import AsyncGoogleDriveUploader
+from docx_meditation_form.jobs import JobQueue
+from docx_meditation_form.server import FormServer
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = {name.decode(): value.decode() for name, value in headers}
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+async def request(app, method, path, *, body=b"", headers=None, query=b""):
+    """Send one HTTP request through the ASGI interface."""
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start = sent[0]
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    return Response(start["status"], start.get("headers", []), body)
+
+
+async def until(condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+def run(app, scenario):
+    """Run `scenario(app)` on a fresh event loop, then shut the server down."""
+
+    async def main():
+        try:
+            return await scenario(app)
+        finally:
+            await app.shutdown()
+
+    return asyncio.run(main())
+
+
+class FakeUploader:
+    """
+    Async uploader keeping uploads in memory. With `block`, uploads wait
+    until `released` is set, so a request can be held in flight.
+    """
+
+    def __init__(self, *, block=False):
+        self.uploads = []
+        self.public = []
+        self.started = False
+        self.released = not block
+
+    async def upload_file(self, data, *, name, drive_folder_id=None):
+        self.started = True
+        await until(lambda: self.released)
+        self.uploads.append(data)
+        return f"file-{len(self.uploads)}"
+
+    async def make_public(self, file_id):
+        self.public.append(file_id)
+
+
+BODY = json.dumps({"APPLICANT_NAME": "Acme"}).encode()
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    yield queue
+    queue.close()
+
+
+def test_generate_uploads_and_returns_link_with_etag():
+    uploader = FakeUploader()
+    app = FormServer(workers=1, uploader=uploader)
+
+    async def scenario(app):
+        return await request(app, "POST", "/generate-docx", body=BODY)
+
+    response = run(app, scenario)
+    assert response.status == 200
+    assert response.json() == {"file_id": "file-1", "url": "https://drive.google.com/file/d/file-1"}
+    assert response.headers["etag"]
+    assert uploader.uploads[0][:2] == b"PK"
+    assert uploader.public == ["file-1"]
+
+
+@pytest.mark.parametrize("body", [b"[1, 2]", b'"text"', b"null"])
+def test_generate_rejects_non_object_body(body):
+    app = FormServer(workers=1, uploader=FakeUploader())
+
+    async def scenario(app):
+        return await request(app, "POST", "/generate-docx", body=body)
+
+    response = run(app, scenario)
+    assert response.status == 400
+    assert response.json() == {"error": "expected a JSON object"}
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-API-KEY": "wrong"}])
+def test_generate_requires_api_key(headers):
+    uploader = FakeUploader()
+    app = FormServer(workers=1, uploader=uploader, api_key="secret")
+
+    async def scenario(app):
+        denied = await request(app, "POST", "/generate-docx", body=BODY, headers=headers)
+        allowed = await request(app, "POST", "/generate-docx", body=BODY, headers={"X-API-KEY": "secret"})
+        return denied, allowed
+
+    denied, allowed = run(app, scenario)
+    assert denied.status == 401
+    assert denied.json() == {"error": "unauthorized"}
+    assert allowed.status == 200
+    assert len(uploader.uploads) == 1
+
+
+def test_overload_is_refused_with_429():
+    uploader = FakeUploader(block=True)
+    app = FormServer(workers=1, uploader=uploader, max_concurrency=1, max_waiting=1)
+
+    async def scenario(app):
+        first = asyncio.ensure_future(request(app, "POST", "/generate-docx", body=BODY))
+        await until(lambda: uploader.started)
+        # the slot is taken; one request may wait, the next is refused
+        waiting = asyncio.ensure_future(request(app, "POST", "/generate-docx", body=BODY))
+        await until(lambda: app._waiting)
+        refused = await request(app, "POST", "/generate-docx", body=BODY)
+        uploader.released = True
+        return await first, await waiting, refused
+
+    first, waiting, refused = run(app, scenario)
+    assert first.status == waiting.status == 200
+    assert refused.status == 429
+    assert refused.headers["retry-after"] == "1"
+    assert len(uploader.uploads) == 2
+
+
+def test_draining_refuses_new_requests_with_503():
+    uploader = FakeUploader(block=True)
+    app = FormServer(workers=1, uploader=uploader)
+
+    async def scenario(app):
+        in_flight = asyncio.ensure_future(request(app, "POST", "/generate-docx", body=BODY))
+        await until(lambda: uploader.started)
+        shutdown = asyncio.ensure_future(app.shutdown())
+        await asyncio.sleep(0)
+
+        refused = await request(app, "POST", "/generate-docx", body=BODY)
+        health = await request(app, "GET", "/healthz")
+        # the request already admitted is drained, not dropped
+        uploader.released = True
+        finished = await in_flight
+        await shutdown
+        return refused, health, finished
+
+    refused, health, finished = run(app, scenario)
+    assert refused.status == 503
+    assert refused.json() == {"error": "shutting down"}
+    assert refused.headers["retry-after"] == "5"
+    assert health.status == 503
+    assert health.json()["status"] == "draining"
+    assert finished.status == 200
+
+
+@pytest.mark.parametrize("wait", [b"nan", b"inf", b"-1", b"soon"])
+def test_job_status_rejects_invalid_wait(jobs, wait):
+    job_id = jobs.submit(FormValues())
+    app = FormServer(workers=1, jobs=jobs)
+
+    async def scenario(app):
+        return await request(app, "GET", f"/jobs/{job_id}", query=b"wait=" + wait)
+
+    response = run(app, scenario)
+    assert response.status == 400
+    assert response.json() == {"error": "invalid wait"}
+
+
+def test_job_status_wait_is_bounded(jobs):
+    job_id = jobs.submit(FormValues())
+    app = FormServer(workers=1, jobs=jobs)
+
+    async def scenario(app):
+        return await asyncio.wait_for(
+            request(app, "GET", f"/jobs/{job_id}", query=b"wait=0.2"), timeout=5
+        )
+
+    response = run(app, scenario)
+    assert response.status == 200
+    assert response.json()["status"] == "queued"
+
+
+def test_post_with_matching_if_none_match_is_412():
+    uploader = FakeUploader()
+    app = FormServer(workers=1, uploader=uploader)
+    etag = f'W/"{RenderCache.key(FormValues(APPLICANT_NAME="Acme"), app.renderer)}-link"'
+
+    async def scenario(app):
+        return await request(app, "POST", "/generate-docx", body=BODY, headers={"If-None-Match": etag})
+
+    response = run(app, scenario)
+    assert response.status == 412
+    assert response.json() == {"error": "precondition failed"}
+    assert uploader.uploads == []
+
+
+def test_etag_depends_on_representation():
+    app = FormServer(workers=1, uploader=FakeUploader())
+
+    async def scenario(app):
+        link = await request(app, "POST", "/generate-docx", body=BODY)
+        docx = await request(app, "POST", "/generate-docx", body=BODY, query=b"download=1")
+        # the link's tag does not validate the DOCX, so it is rendered again
+        again = await request(
+            app, "POST", "/generate-docx", body=BODY, query=b"download=1",
+            headers={"If-None-Match": link.headers["etag"]},
+        )
+        return link, docx, again
+
+    link, docx, again = run(app, scenario)
+    assert link.status == docx.status == again.status == 200
+    assert link.headers["etag"].startswith("W/")
+    assert link.headers["etag"] != docx.headers["etag"]
+    assert again.body == docx.body
+
+
+def test_get_returns_docx_and_304_when_not_modified():
+    app = FormServer(workers=1, uploader=FakeUploader())
+
+    async def scenario(app):
+        first = await request(app, "GET", "/generate-docx", query=b"APPLICANT_NAME=Acme")
+        second = await request(
+            app, "GET", "/generate-docx", query=b"APPLICANT_NAME=Acme",
+            headers={"If-None-Match": f'"other", {first.headers["etag"]}'},
+        )
+        return first, second
+
+    first, second = run(app, scenario)
+    assert first.status == 200
+    assert first.headers["content-type"].endswith("wordprocessingml.document")
+    assert first.body[:2] == b"PK"
+    assert second.status == 304
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.body == b""
+
+
+@pytest.mark.parametrize(
+    "query, download",
+    [(b"", False), (b"download=0", False), (b"download=false", False),
+     (b"download=1", True), (b"download=TRUE", True), (b"download=yes", True)],
+)
+def test_download_parameter_is_parsed(query, download):
+    uploader = FakeUploader()
+    app = FormServer(workers=1, uploader=uploader)
+
+    async def scenario(app):
+        return await request(app, "POST", "/generate-docx", body=BODY, query=query)
+
+    response = run(app, scenario)
+    assert response.status == 200
+    assert (response.body[:2] == b"PK") is download
+    assert len(uploader.uploads) == (0 if download else 1)
+
+
+def test_invalid_download_parameter_is_400():
+    app = FormServer(workers=1, uploader=FakeUploader())
+
+    async def scenario(app):
+        return await request(app, "POST", "/generate-docx", body=BODY, query=b"download=maybe")
+
+    response = run(app, scenario)
+    assert response.status == 400
+    assert response.json() == {"error": "invalid download"}
+
+
+def test_dead_worker_pool_is_shut_down_and_replaced(monkeypatch):
+    shutdowns = []
+    original = ProcessPoolExecutor.shutdown
+
+    def shutdown(pool, *args, **kwargs):
+        shutdowns.append(pool)
+        return original(pool, *args, **kwargs)
+
+    monkeypatch.setattr(ProcessPoolExecutor, "shutdown", shutdown)
+    app = FormServer(workers=1)
+
+    async def scenario(app):
+        first = await request(app, "POST", "/generate-docx", body=BODY)
+        dead = app._pool
+        for pid in list(dead._processes):
+            os.kill(pid, signal.SIGKILL)
+        broken = await request(app, "POST", "/generate-docx", body=BODY)
+        again = await request(app, "POST", "/generate-docx", body=BODY)
+        return first, dead, broken, again
+
+    first, dead, broken, again = run(app, scenario)
+    assert first.status == 200
+    assert broken.status == 503
+    assert broken.headers["retry-after"] == "1"
+    assert shutdowns[0] is dead
+    assert again.status == 200
+    assert again.body == first.body
+
+
+def test_generate_uploads_to_drive_over_http(fake_drive, drive_token):
+    uploader = AsyncGoogleDriveUploader(drive_token, base_url=fake_drive.url)
+    app = FormServer(workers=1, uploader=uploader, drive_folder_id="folder")
+
+    async def scenario(app):
+        return await request(app, "POST", "/generate-docx", body=BODY)
+
+    response = run(app, scenario)
+    assert response.status == 200
+    file_id = response.json()["file_id"]
+    assert fake_drive.public == {file_id}
+    assert fake_drive.calls["upload"] == fake_drive.calls["permission"] == 1
+    content = fake_drive.contents[file_id]
+    assert b'"parents": ["folder"]' in content
+    assert b"PK" in content
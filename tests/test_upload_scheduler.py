@@ -0,0 +1,110 @@
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from docx_meditation_form.core import instrumentation
+from docx_meditation_form.integrations.upload_scheduler import RetryPolicy, resumable_upload
+
+RETRY = RetryPolicy(max_attempts=3, sleep=lambda seconds: None)
+
+
+def _http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"{}")
+
+
+class FakeRequest:
+    """
+    Resumable request whose session is created by the first chunk; the
+    following chunks fail with the statuses in `errors`, then it completes.
+    """
+
+    def __init__(self, errors=(), *, chunks=2):
+        self.errors = list(errors)
+        self.chunks = chunks
+        self.resumable_uri = None
+        self.sent = 0
+
+    def next_chunk(self):
+        if self.resumable_uri is not None and self.errors:
+            raise _http_error(self.errors.pop(0))
+        self.resumable_uri = "https://upload.example/session"
+        self.sent += 1
+        if self.sent < self.chunks:
+            return None, None
+        return None, {"id": "file-1"}
+
+
+def test_expired_session_restarts_with_a_fresh_request():
+    expired = FakeRequest([404])
+    fresh = []
+
+    def restart():
+        fresh.append(FakeRequest())
+        return fresh[-1]
+
+    errors = []
+    response = resumable_upload(
+        expired, retry=RETRY, restart=restart, on_error=lambda exc, kind: errors.append(kind)
+    )
+
+    assert response == {"id": "file-1"}
+    assert len(fresh) == 1
+    assert fresh[0].sent == 2
+    assert errors == ["session_expired"]
+
+
+def test_persistently_expired_session_stops_after_max_attempts():
+    restarts = []
+
+    def restart():
+        restarts.append(FakeRequest([410]))
+        return restarts[-1]
+
+    with pytest.raises(HttpError) as raised:
+        resumable_upload(FakeRequest([410]), retry=RETRY, restart=restart)
+
+    assert raised.value.resp.status == 410
+    assert len(restarts) == RETRY.max_attempts - 1
+
+
+@pytest.mark.parametrize("retry", [RETRY, None])
+def test_expired_session_without_restart_is_raised(retry):
+    with pytest.raises(HttpError) as raised:
+        resumable_upload(FakeRequest([404]), retry=retry)
+    assert raised.value.resp.status == 404
+
+
+def test_not_found_before_a_session_exists_is_raised():
+    class MissingFolder(FakeRequest):
+        def next_chunk(self):
+            raise _http_error(404)
+
+    restarts = []
+    with pytest.raises(HttpError):
+        resumable_upload(MissingFolder(), retry=RETRY, restart=lambda: restarts.append(1))
+    assert restarts == []
+
+
+def test_retryable_chunk_error_stays_on_the_same_session():
+    request = FakeRequest([503])
+    response = resumable_upload(request, retry=RETRY, restart=pytest.fail)
+
+    assert response == {"id": "file-1"}
+    assert request.sent == 2
+
+
+def test_retries_are_one_labelled_counter():
+    registry = instrumentation.HistogramRegistry()
+    instrumentation.enable(registry)
+    try:
+        resumable_upload(FakeRequest([503, 404]), retry=RETRY, restart=FakeRequest)
+    finally:
+        instrumentation.disable(registry)
+
+    text = instrumentation.PrometheusExporter(registry).render()
+    lines = [line for line in text.splitlines() if "drive_retries" in line]
+    assert lines == [
+        "# TYPE docx_form_drive_retries_total counter",
+        'docx_form_drive_retries_total{kind="server_error"} 1',
+        'docx_form_drive_retries_total{kind="session_expired"} 1',
+    ]